@@ -12,6 +12,12 @@ from contextlib import contextmanager
 from typing import Optional, Dict, Any
 
 from datarobot_drum.drum.common import get_drum_logger
+from datarobot_drum.custom_task_interfaces.pickle_buffers import (
+    COMPRESSION_NONE,
+    check_compression,
+    read_buffers,
+    write_buffers,
+)
 from datarobot_drum.custom_task_interfaces.user_secrets import (
     load_secrets,
     patch_outputs_to_scrub_secrets,
@@ -25,6 +31,10 @@ logger = get_drum_logger(__name__)
 
 class Serializable(object):
     default_artifact_filename = "drum_artifact.pkl"
+    default_buffers_filename = "drum_artifact.buffers"
+    # Compression of the large binary state (e.g. numpy arrays) saved next to the pickle:
+    # "none" (memory-mapped when loaded), "lz4" or "zstd". Can be overridden by subclasses.
+    artifact_compression = COMPRESSION_NONE
 
     def save(self, artifact_directory):
         """
@@ -45,24 +55,35 @@ class Serializable(object):
         # For use in easy chaining, e.g. CustomTask().fit().save().load()
         return self
 
-    def save_task(self, artifact_directory, exclude=None):
+    def save_task(self, artifact_directory, exclude=None, compression=None):
         """
         Helper function that abstracts away pickling the CustomTask object. It also can
         automatically set previously serialized variables to None, e.g. when using keras you likely
         want to serialize self.estimator using model.save() or keras.models.save_model() and then
         pass in exclude='estimator'
 
+        The object is pickled with protocol 5: the buffers of objects supporting it (e.g. numpy
+        arrays) are written out-of-band to a second file, which is memory-mapped at load time
+        unless it is compressed.
+
         Parameters
         ----------
         artifact_directory: str
             Path to the directory to save the serialized artifact(s) to.
         exclude: List[str]
             Variables on the CustomTask object we want to exclude from serialization by setting to None
+        compression: str
+            Compression of the out-of-band buffers: "none", "lz4" or "zstd" (requires the lz4 or
+            zstandard package). Defaults to `artifact_compression`.
 
         Returns
         -------
         None
         """
+        compression = compression or self.artifact_compression
+        # fail before the artifact is written
+        check_compression(compression)
+
         # If any custom task variables are excluded in the pickle, temporarily store them here, set them to None, then
         # restore them back onto the class after serialization
         variables_to_restore = {}
@@ -79,13 +100,22 @@ class Serializable(object):
 
                 # Set it to None so it does not get serialized
                 setattr(self, custom_task_variable, None)
-        with open(
-            os.path.join(artifact_directory, Serializable.default_artifact_filename), "wb"
-        ) as fp:
-            pickle.dump(self, fp)
-
-        for custom_task_variable, value in variables_to_restore.items():
-            setattr(self, custom_task_variable, value)
+        buffers = []
+        try:
+            with open(
+                os.path.join(artifact_directory, Serializable.default_artifact_filename), "wb"
+            ) as fp:
+                pickle.dump(self, fp, protocol=5, buffer_callback=buffers.append)
+        finally:
+            for custom_task_variable, value in variables_to_restore.items():
+                setattr(self, custom_task_variable, value)
+
+        buffers_path = os.path.join(artifact_directory, Serializable.default_buffers_filename)
+        if buffers:
+            write_buffers(buffers_path, buffers, compression)
+        elif os.path.exists(buffers_path):
+            # left by a previous save, it would be loaded with the new pickle
+            os.remove(buffers_path)
 
     @classmethod
     def load(cls, artifact_directory):
@@ -122,10 +152,21 @@ class Serializable(object):
         cls
             The deserialized object
         """
+        buffers_path = os.path.join(artifact_directory, Serializable.default_buffers_filename)
+        buffers = read_buffers(buffers_path) if os.path.exists(buffers_path) else None
         with open(
             os.path.join(artifact_directory, Serializable.default_artifact_filename), "rb"
         ) as fp:
-            deserialized_object = pickle.load(fp)
+            try:
+                deserialized_object = pickle.load(fp, buffers=buffers)
+            except pickle.UnpicklingError as e:
+                if buffers is not None or "out-of-band" not in str(e):
+                    raise
+                raise DrumSerializationError(
+                    "The task artifact refers to out-of-band buffers, but {} is missing".format(
+                        buffers_path
+                    )
+                )
 
         if not isinstance(deserialized_object, cls):
             raise DrumSerializationError(
@@ -0,0 +1,139 @@
+#
+#  Copyright 2026 DataRobot, Inc. and its affiliates.
+#
+#  All rights reserved.
+#  This is proprietary source code of DataRobot, Inc. and its affiliates.
+#  Released under the terms of DataRobot Tool and Utility Agreement.
+#
+"""
+Out-of-band buffers of pickle protocol 5 (e.g. the data of numpy arrays), stored next to the
+pickle in a single file. Uncompressed buffers are memory-mapped when they are read, so loading
+large arrays does not copy them; compressed ones are decompressed straight into their buffer.
+
+File layout, integers being little-endian uint64:
+    magic, compression (8 ascii bytes, space padded), number of buffers,
+    (offset, stored size, size) of every buffer, then the buffers, each aligned to 64 bytes.
+"""
+import mmap
+import struct
+
+from datarobot_drum.drum.exceptions import DrumSerializationError
+
+COMPRESSION_NONE = "none"
+COMPRESSION_LZ4 = "lz4"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSIONS = [COMPRESSION_NONE, COMPRESSION_LZ4, COMPRESSION_ZSTD]
+
+_MAGIC = b"DRUMBUF1"
+_HEADER = struct.Struct("<8s8sQ")
+_ENTRY = struct.Struct("<QQQ")
+# numpy and SIMD code prefer aligned data
+_ALIGNMENT = 64
+
+
+def _import_compression_module(compression):
+    package = {COMPRESSION_LZ4: "lz4", COMPRESSION_ZSTD: "zstandard"}[compression]
+    try:
+        if compression == COMPRESSION_LZ4:
+            import lz4.frame as module
+        else:
+            import zstandard as module
+    except ImportError:
+        raise DrumSerializationError(
+            "{} compression of the task artifact requires the {} package: "
+            "pip install {}".format(compression, package, package)
+        )
+    return module
+
+
+def check_compression(compression):
+    """
+    Raise DrumSerializationError if the compression is not supported or its package is not
+    installed. Returns the compression module, None without compression.
+    """
+    if compression not in COMPRESSIONS:
+        raise DrumSerializationError(
+            "Unsupported task artifact compression '{}', use one of: {}".format(
+                compression, ", ".join(COMPRESSIONS)
+            )
+        )
+    if compression == COMPRESSION_NONE:
+        return None
+    return _import_compression_module(compression)
+
+
+def _compress(data, compression, module):
+    if compression == COMPRESSION_LZ4:
+        return module.compress(data)
+    return module.ZstdCompressor().compress(data)
+
+
+def _decompress(data, size, compression, module):
+    if compression == COMPRESSION_LZ4:
+        return module.decompress(data, return_bytearray=True)
+    # decompressed into a writable buffer, as unpickled numpy arrays are writable
+    buffer = bytearray(size)
+    with module.ZstdDecompressor().stream_reader(data) as reader:
+        view = memoryview(buffer)
+        while view:
+            read = reader.readinto(view)
+            if not read:
+                raise DrumSerializationError("The task artifact buffers are truncated")
+            view = view[read:]
+    return buffer
+
+
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_buffers(path, buffers, compression=COMPRESSION_NONE):
+    """Write the `pickle.PickleBuffer`s collected with `buffer_callback` to `path`."""
+    module = check_compression(compression)
+
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    if module is None:
+        stored_buffers = raw_buffers
+    else:
+        stored_buffers = [_compress(raw, compression, module) for raw in raw_buffers]
+
+    entries = []
+    offset = _HEADER.size + _ENTRY.size * len(stored_buffers)
+    for raw, stored in zip(raw_buffers, stored_buffers):
+        offset = _align(offset)
+        entries.append((offset, len(stored), raw.nbytes))
+        offset += len(stored)
+
+    with open(path, "wb") as fp:
+        fp.write(_HEADER.pack(_MAGIC, compression.ljust(8).encode("ascii"), len(entries)))
+        for entry in entries:
+            fp.write(_ENTRY.pack(*entry))
+        for (offset, _, _), stored in zip(entries, stored_buffers):
+            fp.write(b"\0" * (offset - fp.tell()))
+            fp.write(stored)
+
+
+def read_buffers(path):
+    """
+    Read the buffers written by `write_buffers`, to pass to `pickle.load`. Uncompressed buffers
+    are copy-on-write views on a memory map of the file, so they are writable and only the
+    pages actually used are read.
+    """
+    with open(path, "rb") as fp:
+        data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, compression, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise DrumSerializationError("{} is not a task artifact buffers file".format(path))
+    compression = compression.decode("ascii").strip()
+    module = check_compression(compression)
+
+    view = memoryview(data)
+    buffers = []
+    for index in range(count):
+        offset, stored_size, size = _ENTRY.unpack_from(data, _HEADER.size + index * _ENTRY.size)
+        stored = view[offset : offset + stored_size]
+        if module is None:
+            buffers.append(stored)
+        else:
+            buffers.append(_decompress(stored, size, compression, module))
+    return buffers
@@ -8,12 +8,14 @@
 import json
 import logging
 import os
+import re
 import sys
 from dataclasses import dataclass, fields, is_dataclass, asdict
 from enum import Enum, auto
+from functools import lru_cache
 from logging import Filter, LogRecord
 from pathlib import Path
-from typing import Optional, TypeVar, Type, Generic, Dict, Iterable, List, Set, Union, TextIO
+from typing import Optional, TypeVar, Type, Generic, Dict, Iterable, List, Set, Tuple, Union, TextIO
 
 
 def reduce_kwargs(input_dict, target_class):
@@ -301,13 +303,14 @@ class TextStreamSecretsScrubber:
     def __init__(self, secrets: Iterable[AbstractSecret], stream: TextIO):
         self.stream = stream
         self.sensitive_data = get_ordered_sensitive_values(secrets)
+        self._scrubber = ValuesScrubber(self.sensitive_data)
 
     def write(self, text):
-        new_text = scrub_values_from_string(self.sensitive_data, text)
+        new_text = self._scrubber.scrub(text)
         self.stream.write(new_text)
 
     def writelines(self, lines):
-        new_lines = [scrub_values_from_string(self.sensitive_data, text) for text in lines]
+        new_lines = [self._scrubber.scrub(text) for text in lines]
         self.stream.writelines(new_lines)
 
     def __getattr__(self, item):
@@ -323,6 +326,7 @@ class SecretsScrubberFilter(Filter):
     def __init__(self, secrets: Iterable[AbstractSecret]):
         super().__init__()
         self.sensitive_data = get_ordered_sensitive_values(secrets)
+        self._scrubber = ValuesScrubber(self.sensitive_data)
 
     def filter(self, record: LogRecord):
         record.msg = self.transform(record.msg)
@@ -337,7 +341,7 @@ class SecretsScrubberFilter(Filter):
 
     def transform(self, element):
         if isinstance(element, str):
-            return scrub_values_from_string(self.sensitive_data, element)
+            return self._scrubber.scrub(element)
         else:
             return element
 
@@ -372,6 +376,97 @@ def _get_all_values(actual_value: Union[str, dict]) -> Set[str]:
 
 
 def scrub_values_from_string(sensitive_values: List[str], input_str: str) -> str:
-    for value in sensitive_values:
-        input_str = input_str.replace(value, "*****")
-    return input_str
+    return _get_values_scrubber(tuple(sensitive_values)).scrub(input_str)
+
+
+@lru_cache(maxsize=16)
+def _get_values_scrubber(sensitive_values: Tuple[str, ...]) -> "ValuesScrubber":
+    return ValuesScrubber(sensitive_values)
+
+
+class ValuesScrubber:
+    """Replaces sensitive values with a mask, applying them in order as `str.replace` would.
+
+    The values are compiled once into a prefix tree regex, which scrubs a string in a single
+    pass, when it is equivalent to replacing them one by one and cheaper. Otherwise the values
+    are replaced one by one, which is faster for values with distinct prefixes."""
+
+    MASK = "*****"
+
+    def __init__(self, sensitive_values: Iterable[str]):
+        self.sensitive_values = list(sensitive_values)
+        self._pattern = None
+        if _is_single_pass_cheaper(self.sensitive_values) and _is_single_pass_equivalent(
+            self.sensitive_values
+        ):
+            self._pattern = re.compile(_prefix_tree_pattern(self.sensitive_values))
+
+    def scrub(self, input_str: str) -> str:
+        if self._pattern is not None:
+            return self._pattern.sub(self.MASK, input_str)
+        for value in self.sensitive_values:
+            input_str = input_str.replace(value, self.MASK)
+        return input_str
+
+
+def _is_single_pass_equivalent(values: List[str]) -> bool:
+    # Replacing the values one by one and a single pass preferring the longest value at every
+    # position mask the same occurrences, unless occurrences of two values can partially
+    # overlap, a value is replaced before a longer one containing it, or a value can match
+    # a previous mask.
+    unique_values = set(values)
+    if len(unique_values) != len(values) or any(not v or "*" in v for v in values):
+        return False
+    for i, value in enumerate(values):
+        for other in values[i + 1 :]:
+            if value in other:
+                return False
+    for value in values:
+        for other in values:
+            if value is not other and _can_overlap(value, other):
+                return False
+    return True
+
+
+def _can_overlap(value: str, other: str) -> bool:
+    """Whether a proper suffix of `value` is a proper prefix of `other`."""
+    start = value.find(other[0], 1)
+    while start != -1:
+        if len(value) - start < len(other) and other.startswith(value[start:]):
+            return True
+        start = value.find(other[0], start + 1)
+    return False
+
+
+def _is_single_pass_cheaper(values: List[str]) -> bool:
+    # The regex tries every value sharing the first character of a position, while str.replace
+    # scans a string very fast. A single pass only pays off when the values share their first
+    # characters, e.g. generated names or tokens with a common prefix.
+    if not values or not all(values):
+        return False
+    return len(values) >= 2 * len({value[0] for value in values})
+
+
+def _prefix_tree_pattern(values: List[str]) -> str:
+    tree: dict = {}
+    for value in values:
+        node = tree
+        for char in value:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def node_pattern(node: dict) -> str:
+        # chains of single characters are a literal, only branching nodes are recursed into
+        chars = []
+        while len(node) == 1 and "" not in node:
+            ((char, node),) = node.items()
+            chars.append(char)
+        branches = [re.escape(char) + node_pattern(child) for char, child in node.items() if char]
+        if "" in node:
+            # a longer value wins over the value ending here
+            branches.append("")
+        if len(branches) == 1:
+            return re.escape("".join(chars)) + branches[0]
+        return re.escape("".join(chars)) + "(?:" + "|".join(branches) + ")"
+
+    return node_pattern(tree)
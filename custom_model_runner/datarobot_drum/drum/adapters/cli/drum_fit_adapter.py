@@ -11,8 +11,10 @@ from tempfile import mkdtemp
 
 from datarobot_drum.drum.adapters.cli.shared.drum_class_label_adapter import DrumClassLabelAdapter
 from datarobot_drum.drum.adapters.cli.shared.drum_input_file_adapter import DrumInputFileAdapter
-from datarobot_drum.drum.enum import LOGGER_NAME_PREFIX
+from datarobot_drum.drum.enum import LOGGER_NAME_PREFIX, PredictionServerMimetypes
 from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.drum.utils.dataframe import downcast_dataframe, is_sparse_dataframe
+from datarobot_drum.drum.utils.structured_input_read_utils import StructuredInputReadUtils
 
 logger = logging.getLogger(LOGGER_NAME_PREFIX + "." + __name__)
 
@@ -40,6 +42,7 @@ class DrumFitAdapter(DrumInputFileAdapter, DrumClassLabelAdapter):
         default_parameter_values=None,
         output_dir=None,
         num_rows=None,
+        downcast_dtypes=False,
     ):
         """
         Parameters
@@ -73,6 +76,8 @@ class DrumFitAdapter(DrumInputFileAdapter, DrumClassLabelAdapter):
             Optional. Output directory to store the fit artifacts
         num_rows: int or None
             Optional. Number of rows
+        downcast_dtypes: bool
+            Optional. Shrink the dtypes of the training data columns, see `downcast_dataframe`
         """
         DrumInputFileAdapter.__init__(
             self=self,
@@ -97,6 +102,7 @@ class DrumFitAdapter(DrumInputFileAdapter, DrumClassLabelAdapter):
         self.default_parameter_values = default_parameter_values
         self.output_dir = output_dir
         self.num_rows = num_rows
+        self.downcast_dtypes = downcast_dtypes
 
         self.persist_output = self.output_dir is not None
 
@@ -159,12 +165,42 @@ class DrumFitAdapter(DrumInputFileAdapter, DrumClassLabelAdapter):
 
         return self
 
+    @property
+    def _samples_while_reading(self):
+        # Dense CSV files are sampled while they are read, so the whole file is never in memory
+        if self.num_rows in (None, "ALL"):
+            return False
+        mimetype = StructuredInputReadUtils.resolve_mimetype_by_filename(self.input_filename)
+        return mimetype not in (
+            PredictionServerMimetypes.TEXT_MTX,
+            PredictionServerMimetypes.APPLICATION_X_NPZ,
+            PredictionServerMimetypes.APPLICATION_JSON,
+        )
+
+    def _read_input_dataframe(self):
+        if self._samples_while_reading:
+            self.num_rows = int(float(self.num_rows))
+            logger.info("Sampling %s rows while reading %s", self.num_rows, self.input_filename)
+            dataframe = StructuredInputReadUtils.read_csv_file_sample(
+                self.input_filename, self.num_rows, random_state=1
+            )
+        else:
+            dataframe = super(DrumFitAdapter, self)._read_input_dataframe()
+
+        if self.downcast_dtypes and not is_sparse_dataframe(dataframe):
+            dataframe = downcast_dataframe(dataframe, exclude=[self.target_name, self.weights_name])
+        return dataframe
+
     def sample_data_if_necessary(self, data):
-        if self.num_rows == "ALL":
+        if self.num_rows == "ALL" or data is None:
             return data
 
-        assert isinstance(self.num_rows, (int, float))
-        self.num_rows = int(self.num_rows)
+        if self._samples_while_reading:
+            # The input data was sampled when it was read, other data is aligned with it by row
+            sample_index = self.input_dataframe.index
+            return data if data.index.equals(sample_index) else data.loc[sample_index]
+
+        self.num_rows = int(float(self.num_rows))
         if self.num_rows > len(self.input_dataframe):
             raise DrumCommonException(
                 "Requested number of rows greater than data length {} > {}".format(
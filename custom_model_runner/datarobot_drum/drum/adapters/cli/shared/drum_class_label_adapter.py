@@ -38,12 +38,14 @@ def possibly_intuit_order(
         classes = np.unique(y.iloc[:, 0].astype(str))
     else:
         assert target_filename is None
-        df = pd.read_csv(input_filename)
-        if target_name not in df.columns:
+        # Only the header and the target column are read
+        columns = pd.read_csv(input_filename, nrows=0).columns
+        if target_name not in columns:
             error_msg = "The column '%s' does not exist in your dataframe. \nThe columns in your dataframe are these: %s"
-            e = error_msg % (target_name, list(df.columns))
-            logger.error(error_msg, target_name, list(df.columns))
+            e = error_msg % (target_name, list(columns))
+            logger.error(error_msg, target_name, list(columns))
             raise DrumCommonException(e)
+        df = pd.read_csv(input_filename, usecols=[target_name])
         uniq = df[target_name].astype(str).unique()
         classes = set(uniq) - {np.nan}
     if len(classes) >= 2:
@@ -99,12 +99,15 @@ class DrumInputFileAdapter(object):
         """
         if self._input_dataframe is None:
             # Lazy load df
-            self._input_dataframe = StructuredInputReadUtils.read_structured_input_file_as_df(
-                self.input_filename,
-                self.sparse_column_filename,
-            )
+            self._input_dataframe = self._read_input_dataframe()
         return self._input_dataframe
 
+    def _read_input_dataframe(self):
+        return StructuredInputReadUtils.read_structured_input_file_as_df(
+            self.input_filename,
+            self.sparse_column_filename,
+        )
+
     @property
     def X(self) -> pd.DataFrame:
         """
@@ -37,6 +37,7 @@ from datarobot_drum.drum.enum import (
     CUSTOM_FILE_NAME,
     CUSTOM_PY_CLASS_NAME,
     CustomHooks,
+    FitMemoryPhase,
     LOGGER_NAME_PREFIX,
     ModelInfoKeys,
     NEGATIVE_CLASS_LABEL_ARG_KEYWORD,
@@ -45,6 +46,7 @@ from datarobot_drum.drum.enum import (
     PayloadFormat,
     StructuredDtoKeys,
     TargetType,
+    UnstructuredDtoKeys,
     MODERATIONS_HOOK_MODULE,
     MODERATIONS_LIBRARY_PACKAGE,
 )
@@ -55,6 +57,7 @@ from datarobot_drum.drum.exceptions import (
     DrumTransformException,
     DrumSerializationError,
 )
+from datarobot_drum.drum.peak_memory import memory_phase
 from datarobot_drum.drum.utils.dataframe import extract_additional_columns
 from datarobot_drum.drum.utils.structured_input_read_utils import StructuredInputReadUtils
 from datarobot_drum.drum.utils.drum_utils import DrumUtils
@@ -102,6 +105,7 @@ class PythonModelAdapter(AbstractModelAdapter):
         self._model = None
         self._model_dir = model_dir
         self._target_type = target_type
+        self._input_dtypes = None
 
         # New custom task class and instance loaded from custom.py
         self._custom_task_class = None
@@ -462,6 +466,8 @@ class PythonModelAdapter(AbstractModelAdapter):
         formats = SupportedPayloadFormats()
         formats.add(PayloadFormat.CSV)
         formats.add(PayloadFormat.MTX)
+        formats.add(PayloadFormat.JSON)
+        formats.add(PayloadFormat.NPZ)
         return formats
 
     def model_info(self):
@@ -471,6 +477,15 @@ class PythonModelAdapter(AbstractModelAdapter):
             else self._predictor_to_use.name,
         }
 
+    @property
+    def input_dtypes(self):
+        """Column dtype hints used when DRUM parses structured input data."""
+        return self._input_dtypes
+
+    @input_dtypes.setter
+    def input_dtypes(self, value):
+        self._input_dtypes = value
+
     def load_data(self, binary_data, mimetype, try_hook=True, sparse_colnames=None):
         if self._custom_hooks.get(CustomHooks.READ_INPUT_DATA) and try_hook:
             try:
@@ -481,11 +496,26 @@ class PythonModelAdapter(AbstractModelAdapter):
                 )
         else:
             data = StructuredInputReadUtils.read_structured_input_data_as_df(
-                binary_data, mimetype, sparse_colnames
+                binary_data, mimetype, sparse_colnames, dtype=self._input_dtypes
             )
 
         return data
 
+    def _load_input_data(self, kwargs):
+        """
+        Resolve the input frame of a predict/transform request: an already parsed DataFrame
+        is taken out of kwargs and used as is, otherwise the binary payload is read.
+        """
+        data = kwargs.pop(StructuredDtoKeys.DATAFRAME, None)
+        if data is not None:
+            return data
+
+        return self.load_data(
+            binary_data=kwargs.get(StructuredDtoKeys.BINARY_DATA),
+            mimetype=kwargs.get(StructuredDtoKeys.MIMETYPE),
+            sparse_colnames=kwargs.get(StructuredDtoKeys.SPARSE_COLNAMES),
+        )
+
     def preprocess(self, data, model=None):
         """
         Preprocess data and then pass on to predict method.
@@ -567,11 +597,7 @@ class PythonModelAdapter(AbstractModelAdapter):
         pd.DataFrame
         """
         # TODO: this is very similar to predict, could be refactored
-        data = self.load_data(
-            binary_data=kwargs.get(StructuredDtoKeys.BINARY_DATA),
-            mimetype=kwargs.get(StructuredDtoKeys.MIMETYPE),
-            sparse_colnames=kwargs.get(StructuredDtoKeys.SPARSE_COLNAMES),
-        )
+        data = self._load_input_data(kwargs)
 
         target_binary_data = kwargs.get(StructuredDtoKeys.TARGET_BINARY_DATA)
         target_data = None
@@ -601,6 +627,16 @@ class PythonModelAdapter(AbstractModelAdapter):
     def has_read_input_data_hook(self):
         return self._custom_hooks.get(CustomHooks.READ_INPUT_DATA) is not None
 
+    def has_streaming_unstructured_hook(self):
+        """
+        Check if the score_unstructured hook opted in to read the request body incrementally,
+        by declaring a `stream` parameter.
+        """
+        score_unstructured_hook = self._custom_hooks.get(CustomHooks.SCORE_UNSTRUCTURED)
+        if score_unstructured_hook is None:
+            return False
+        return UnstructuredDtoKeys.STREAM in signature(score_unstructured_hook).parameters
+
     def _predict_new_drum(self, data, **kwargs) -> RawPredictResponse:
         try:
             if self._target_type.is_classification():
@@ -723,11 +759,7 @@ class PythonModelAdapter(AbstractModelAdapter):
         -------
         RawPredictResponse
         """
-        data = self.load_data(
-            binary_data=kwargs.get(StructuredDtoKeys.BINARY_DATA),
-            mimetype=kwargs.get(StructuredDtoKeys.MIMETYPE),
-            sparse_colnames=kwargs.get(StructuredDtoKeys.SPARSE_COLNAMES),
-        )
+        data = self._load_input_data(kwargs)
 
         data = self.preprocess(data, model)
 
@@ -779,12 +811,19 @@ class PythonModelAdapter(AbstractModelAdapter):
                 completion_create_params, model, chat_fn, association_id, **kwargs
             )
 
-        chat_fn_params = signature(chat_fn).parameters
-        if len(chat_fn_params) > 2:
+        if self.chat_hook_accepts_kwargs():
             return chat_fn(completion_create_params, model, **kwargs)
         else:
             return chat_fn(completion_create_params, model)
 
+    def chat_hook_accepts_kwargs(self):
+        """Whether the chat hook takes the extra arguments of a request, e.g. its headers."""
+        chat_fn = self._custom_hooks.get(CustomHooks.CHAT)
+        return chat_fn is not None and len(signature(chat_fn).parameters) > 2
+
+    def has_moderation_pipeline(self):
+        return self._mod_pipeline is not None
+
     def get_supported_llm_models(self, model):
         """
         Return list of LLM models supported by this custom model.
@@ -859,15 +898,16 @@ class PythonModelAdapter(AbstractModelAdapter):
                             parameters=parameters,
                         )
 
-                    try:
-                        self._custom_task_class_instance.save(self._model_dir)
-                    except DrumSerializationError:
-                        raise
-                    except Exception:
-                        raise DrumSerializationError(
-                            "An error occurred when saving your custom task. "
-                            "Ensure all variables stored on self are pickle-able or excluded when saving"
-                        )
+                    with memory_phase(FitMemoryPhase.SERIALIZE):
+                        try:
+                            self._custom_task_class_instance.save(self._model_dir)
+                        except DrumSerializationError:
+                            raise
+                        except Exception:
+                            raise DrumSerializationError(
+                                "An error occurred when saving your custom task. "
+                                "Ensure all variables stored on self are pickle-able or excluded when saving"
+                            )
                 except AttributeError:
                     raise DrumCommonException(
                         "There appears to be an issue with your fit method OR it is missing entirely. "
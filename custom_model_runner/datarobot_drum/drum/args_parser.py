@@ -19,6 +19,7 @@ from datarobot_drum.drum.enum import (
     TargetType,
     GPU_PREDICTORS,
 )
+from datarobot_drum.drum.peak_memory import parse_memory_size
 from datarobot_drum.drum.push import PUSH_HELP_TEXT
 
 
@@ -200,6 +201,32 @@ class CMRunnerArgsRegistry(object):
                 "option to turn this off",
             )
 
+    @staticmethod
+    def _reg_arg_fit_predict_verification(*parsers):
+        def type_callback(arg):
+            ret_val = int(arg)
+            if ret_val <= 0:
+                raise argparse.ArgumentTypeError("must be > 0")
+            return ret_val
+
+        for parser in parsers:
+            parser.add_argument(
+                ArgumentsOptions.PREDICT_IN_SUBPROCESS,
+                required=False,
+                default=False,
+                action="store_true",
+                help="Verify the fit model with a separate prediction server, as for models in "
+                "other languages. By default Python models are loaded and verified in the drum "
+                "process, on the already read training data",
+            )
+            parser.add_argument(
+                ArgumentsOptions.PREDICT_SAMPLE_ROWS,
+                type=type_callback,
+                default=None,
+                help="Verify the fit model on a random sample of this many training data rows "
+                "(default: all rows). Only used when the model is verified in the drum process",
+            )
+
     @staticmethod
     def _reg_arg_pos_neg_labels(*parsers):
         def are_both_labels_present(arg):
@@ -453,6 +480,109 @@ class CMRunnerArgsRegistry(object):
                 ArgumentsOptions.TIMEOUT, type=int, default=600, help="Test case timeout"
             )
 
+    @staticmethod
+    def _reg_arg_load_generation(*parsers):
+        def positive_int(arg):
+            ret_val = int(arg)
+            if ret_val <= 0:
+                raise argparse.ArgumentTypeError("must be > 0")
+            return ret_val
+
+        def non_negative_int(arg):
+            ret_val = int(arg)
+            if ret_val < 0:
+                raise argparse.ArgumentTypeError("must be >= 0")
+            return ret_val
+
+        def positive_float(arg):
+            ret_val = float(arg)
+            if ret_val <= 0:
+                raise argparse.ArgumentTypeError("must be > 0")
+            return ret_val
+
+        for parser in parsers:
+            parser.add_argument(
+                "--concurrency",
+                type=positive_int,
+                default=1,
+                help="Number of concurrent clients sending requests",
+            )
+            parser.add_argument(
+                "--rate",
+                type=positive_float,
+                default=None,
+                help="Send requests at a constant rate (requests per second) instead of each "
+                "client waiting for its previous response. Latency is then measured from the "
+                "scheduled send time",
+            )
+            parser.add_argument(
+                "--warmup",
+                type=non_negative_int,
+                default=0,
+                help="Number of requests sent before each test case, excluded from the results",
+            )
+
+    @staticmethod
+    def _reg_arg_json_output(*parsers):
+        for parser in parsers:
+            parser.add_argument(
+                "--json-output",
+                default=None,
+                help="Save the results as JSON to the given file",
+            )
+
+    @staticmethod
+    def _reg_arg_baseline(*parsers):
+        def positive_int(arg):
+            ret_val = int(arg)
+            if ret_val <= 0:
+                raise argparse.ArgumentTypeError("must be > 0")
+            return ret_val
+
+        for parser in parsers:
+            parser.add_argument(
+                "--baseline",
+                default=None,
+                help="Performance baseline file. If it does not exist, the results are saved to "
+                "it, otherwise they are compared with it and the test fails on a regression",
+            )
+            parser.add_argument(
+                "--update-baseline",
+                action="store_true",
+                default=False,
+                help="Overwrite the --baseline file with the results instead of comparing them",
+            )
+            parser.add_argument(
+                "--baseline-tolerance",
+                type=float,
+                default=10.0,
+                help="Regression tolerance in percent of the baseline median (default: 10)",
+            )
+            parser.add_argument(
+                "--trials",
+                type=positive_int,
+                default=1,
+                help="Number of times every test case is run. Baselines are compared using the "
+                "median and the confidence interval of the trials",
+            )
+
+    @staticmethod
+    def _reg_arg_validation_workers(*parsers):
+        def type_callback(arg):
+            ret_val = int(arg)
+            if ret_val <= 0:
+                raise argparse.ArgumentTypeError("must be > 0")
+            return ret_val
+
+        for parser in parsers:
+            parser.add_argument(
+                ArgumentsOptions.VALIDATION_WORKERS,
+                type=type_callback,
+                default=1,
+                help="Number of worker processes scoring the null value imputation datasets, "
+                "each loading the model once (default: 1, in the drum process)",
+            )
+
     @staticmethod
     def _reg_arg_in_server(*parsers):
         for parser in parsers:
@@ -495,8 +625,52 @@ class CMRunnerArgsRegistry(object):
             parser.add_argument(
                 ArgumentsOptions.NUM_ROWS,
                 default="ALL",
-                help="Number of rows to use for testing the fit functionality. "
-                "Set to ALL to use all rows. Default is 100",
+                help="Number of rows to use for testing the fit functionality, sampled at random. "
+                "CSV files are sampled while they are read, so only the sample is held in memory. "
+                "Set to ALL to use all rows. Default is ALL",
+            )
+
+    @staticmethod
+    def _reg_arg_downcast_dtypes(*parsers):
+        for parser in parsers:
+            parser.add_argument(
+                ArgumentsOptions.DOWNCAST_DTYPES,
+                required=False,
+                default=False,
+                action="store_true",
+                help="Shrink the training data columns before fit, where it does not change their "
+                "values: integers to int32, floats to float32 and low cardinality strings to "
+                "category. The target and weights columns are kept as they are",
+            )
+
+    @staticmethod
+    def _reg_arg_fit_memory(*parsers):
+        def type_callback(arg):
+            try:
+                ret_val = parse_memory_size(arg)
+            except ValueError as e:
+                raise argparse.ArgumentTypeError(str(e))
+            if ret_val <= 0:
+                raise argparse.ArgumentTypeError("must be > 0")
+            return ret_val
+
+        for parser in parsers:
+            parser.add_argument(
+                ArgumentsOptions.MAX_MEMORY,
+                type=type_callback,
+                default=None,
+                help="Fail when a phase of the fit (loading the data, fitting, serializing the "
+                "model or verifying its predictions) uses more memory than this. The peak memory "
+                "of the container is used when available, otherwise the one of drum and its child "
+                "processes. b,k,m,g suffixes are supported",
+            )
+            parser.add_argument(
+                ArgumentsOptions.TRACE_MEMORY,
+                required=False,
+                default=False,
+                action="store_true",
+                help="Trace Python allocations with tracemalloc, to report the lines of code "
+                "which allocated the most memory in every fit phase. Slows the fit down",
             )
 
     @staticmethod
@@ -735,6 +909,17 @@ class CMRunnerArgsRegistry(object):
         sizes, from the smallest request containing only 1 row of data, up to the largest
         request containing up to 50MB of data.
 
+        Requests are sent by --concurrency clients, each sending its next request once the
+        previous one is answered, or at a constant --rate. The first --warmup requests of each
+        request size are not measured. With --json-output, the results, including the server
+        CPU usage and RSS, are also saved as JSON.
+
+        With --baseline, the throughput, p50/p99 latencies and memory usage of every request
+        size are saved to a baseline file, and later runs are compared with it: the test fails
+        when a metric is worse than the baseline by more than --baseline-tolerance percent.
+        Use --trials to run every request size several times, the comparison then uses the
+        median and the confidence interval of the trials.
+
         At the end of the test, a summary of the test will be displayed. For each request size,
         the following fields will be shown:
 
@@ -743,7 +928,10 @@ class CMRunnerArgsRegistry(object):
          iters: number of times this request size was sent
          min: minimum time measured for this request size (in seconds)
          avg: average time of the this request size (in seconds)
+         p50/p90/p99/p99.9: latency percentiles of this request size (in seconds)
          max: maximum time measured for this request size (in seconds)
+         req/s: throughput, requests answered per second
+         total: wall time of this request size (in seconds)
          used: amount of memory used by drum at the end of this request size (MB)
          container limit: if tests run in docker container, memory limit for it (MB)
          total physical: total amount of physical memory avail on the current machine (MB)
@@ -785,7 +973,8 @@ class CMRunnerArgsRegistry(object):
         List of checks:
 
         * null values imputation: each feature of the provided dataset is set to missing
-          and fed to the model.
+          and fed to the model. The model is loaded once and scores every dataset in the
+          drum process, or in --validation-workers processes.
 
 
         Example:
@@ -964,7 +1153,10 @@ class CMRunnerArgsRegistry(object):
         CMRunnerArgsRegistry._reg_arg_target_feature_and_filename(fit_parser)
         CMRunnerArgsRegistry._reg_arg_weights(fit_parser)
         CMRunnerArgsRegistry._reg_arg_skip_predict(fit_parser)
+        CMRunnerArgsRegistry._reg_arg_fit_predict_verification(fit_parser)
         CMRunnerArgsRegistry._reg_arg_num_rows(fit_parser)
+        CMRunnerArgsRegistry._reg_arg_downcast_dtypes(fit_parser)
+        CMRunnerArgsRegistry._reg_arg_fit_memory(fit_parser)
         CMRunnerArgsRegistry._reg_arg_sparse_colfile(fit_parser, score_parser)
         CMRunnerArgsRegistry._reg_arg_parameter_file(fit_parser)
 
@@ -972,6 +1164,9 @@ class CMRunnerArgsRegistry(object):
         CMRunnerArgsRegistry._reg_arg_iterations(perf_test_parser)
         CMRunnerArgsRegistry._reg_arg_timeout(perf_test_parser)
         CMRunnerArgsRegistry._reg_arg_in_server(perf_test_parser)
+        CMRunnerArgsRegistry._reg_arg_load_generation(perf_test_parser)
+        CMRunnerArgsRegistry._reg_arg_json_output(perf_test_parser)
+        CMRunnerArgsRegistry._reg_arg_baseline(perf_test_parser)
         CMRunnerArgsRegistry._reg_arg_url(perf_test_parser)
 
         CMRunnerArgsRegistry._reg_arg_address(server_parser)
@@ -1026,6 +1221,8 @@ class CMRunnerArgsRegistry(object):
             score_parser, server_parser, validation_parser
         )
 
+        CMRunnerArgsRegistry._reg_arg_validation_workers(validation_parser)
+
         return parser
 
     @staticmethod
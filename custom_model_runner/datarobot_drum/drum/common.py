@@ -5,6 +5,7 @@ This is proprietary source code of DataRobot, Inc. and its affiliates.
 Released under the terms of DataRobot Tool and Utility Agreement.
 """
 
+import codecs
 import json
 import logging
 import os
@@ -23,6 +24,7 @@ from datarobot_drum.drum.enum import (
     PayloadFormat,
 )
 from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.runtime_parameters.runtime_parameters import RuntimeParameters
 from opentelemetry import trace, context, metrics
 from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
@@ -116,6 +118,8 @@ class SupportedPayloadFormats:
             PredictionServerMimetypes.TEXT_CSV: PayloadFormat.CSV,
             PredictionServerMimetypes.TEXT_PLAIN: PayloadFormat.CSV,
             PredictionServerMimetypes.TEXT_MTX: PayloadFormat.MTX,
+            PredictionServerMimetypes.APPLICATION_JSON: PayloadFormat.JSON,
+            PredictionServerMimetypes.APPLICATION_X_NPZ: PayloadFormat.NPZ,
         }
 
     def add(self, payload_format, format_version=None):
@@ -390,56 +394,121 @@ def extract_chat_response_attributes(response):
     return attributes
 
 
-def reconstruct_chat_response_from_sse(chunks):
-    """Reconstruct a chat completion response dict from collected SSE event chunks."""
-    model = None
-    choices_content = {}  # index -> accumulated content
-    choices_role = {}  # index -> role
-    choices_finish_reason = {}  # index -> finish_reason
+def _get_max_captured_content_size():
+    """
+    Maximum number of characters of streamed chat content captured per choice for the span
+    attributes: the `DRUM_OTEL_MAX_CAPTURED_CONTENT_SIZE` runtime parameter, else the OTEL
+    attribute value length limit, as the SDK truncates longer values anyway. None if unlimited.
+    """
+    if RuntimeParameters.has("DRUM_OTEL_MAX_CAPTURED_CONTENT_SIZE"):
+        value = RuntimeParameters.get("DRUM_OTEL_MAX_CAPTURED_CONTENT_SIZE")
+    else:
+        value = os.environ.get(
+            "OTEL_SPAN_ATTRIBUTE_VALUE_LENGTH_LIMIT",
+            os.environ.get("OTEL_ATTRIBUTE_VALUE_LENGTH_LIMIT"),
+        )
+    if value is None:
+        return None
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        get_drum_logger(__name__).warning(
+            "Invalid maximum captured chat content size: %s, content is not limited", value
+        )
+        return None
 
-    for chunk in chunks:
+
+class ChatStreamAccumulator(object):
+    """Rebuilds a chat completion response from the SSE chunks of a streamed one, as they pass.
+
+    Every chunk is parsed once, lines split across chunks included, and the content deltas of
+    every choice are appended to a list which is only joined by `response`. With
+    `max_content_size`, at most that many characters of content are kept per choice.
+    """
+
+    def __init__(self, max_content_size=None):
+        self.max_content_size = max_content_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""  # line not terminated yet
+        self._model = None
+        self._content = {}  # index -> content deltas
+        self._content_size = {}  # index -> number of characters kept
+        self._role = {}  # index -> role
+        self._finish_reason = {}  # index -> finish_reason
+
+    def feed(self, chunk):
         if isinstance(chunk, bytes):
-            chunk = chunk.decode("utf-8")
-        for line in chunk.splitlines():
-            line = line.strip()
-            if not line.startswith("data:"):
-                continue
-            data = line[5:].strip()
-            if data == "[DONE]":
-                continue
-            try:
-                parsed = json.loads(data)
-            except (json.JSONDecodeError, ValueError):
-                continue
-            if model is None:
-                model = parsed.get("model")
-            for choice in parsed.get("choices", []):
-                idx = choice.get("index", 0)
-                delta = choice.get("delta", {})
-                role = delta.get("role")
-                if role:
-                    choices_role[idx] = role
-                content = delta.get("content")
-                if content:
-                    choices_content[idx] = choices_content.get(idx, "") + content
-                finish_reason = choice.get("finish_reason")
-                if finish_reason:
-                    choices_finish_reason[idx] = finish_reason
-
-    all_indices = sorted(
-        set(list(choices_content) + list(choices_role) + list(choices_finish_reason))
-    )
-    choices = [
-        {
-            "message": {
-                "role": choices_role.get(idx),
-                "content": choices_content.get(idx),
-            },
-            "finish_reason": choices_finish_reason.get(idx),
-        }
-        for idx in all_indices
-    ]
-    return {"model": model, "choices": choices}
+            chunk = self._decoder.decode(chunk)
+        if not chunk:
+            return
+        lines = (self._pending + chunk).splitlines()
+        self._pending = "" if chunk[-1] in "\r\n" else lines.pop()
+        for line in lines:
+            self._feed_line(line)
+
+    def _feed_line(self, line):
+        line = line.strip()
+        if not line.startswith("data:"):
+            return
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            parsed = json.loads(data)
+        except ValueError:
+            return
+        if not isinstance(parsed, dict):
+            return
+        if self._model is None:
+            self._model = parsed.get("model")
+        for choice in parsed.get("choices") or []:
+            idx = choice.get("index", 0)
+            delta = choice.get("delta") or {}
+            role = delta.get("role")
+            if role:
+                self._role[idx] = role
+            content = delta.get("content")
+            if content:
+                self._append_content(idx, content)
+            finish_reason = choice.get("finish_reason")
+            if finish_reason:
+                self._finish_reason[idx] = finish_reason
+
+    def _append_content(self, idx, content):
+        size = self._content_size.get(idx, 0)
+        if self.max_content_size is not None:
+            content = content[: max(0, self.max_content_size - size)]
+        self._content_size[idx] = size + len(content)
+        if content:
+            self._content.setdefault(idx, []).append(content)
+
+    def response(self):
+        """The chat completion response dict of the chunks fed so far."""
+        self._pending += self._decoder.decode(b"", final=True)
+        if self._pending:
+            self._feed_line(self._pending)
+            self._pending = ""
+
+        all_indices = sorted(set(self._content_size) | set(self._role) | set(self._finish_reason))
+        choices = [
+            {
+                "message": {
+                    "role": self._role.get(idx),
+                    "content": "".join(self._content[idx]) if idx in self._content else None,
+                },
+                "finish_reason": self._finish_reason.get(idx),
+            }
+            for idx in all_indices
+        ]
+        return {"model": self._model, "choices": choices}
+
+
+def reconstruct_chat_response_from_sse(chunks, max_content_size=None):
+    """Reconstruct a chat completion response dict from collected SSE event chunks."""
+    accumulator = ChatStreamAccumulator(max_content_size)
+    for chunk in chunks:
+        accumulator.feed(chunk)
+    return accumulator.response()
 
 
 def iter_stream_with_span(tracer, parent_span, iterable):
@@ -447,23 +516,31 @@ def iter_stream_with_span(tracer, parent_span, iterable):
 
     The child span uses the request span as parent so stream lifecycle and
     response attributes are recorded separately from the initial request work.
+    Chunks are parsed as they pass, so the response is not held in memory.
     Attributes are set in a finally block so they are always recorded regardless
     of how the generator terminates (normal exhaustion, error, or GeneratorExit
     on client disconnect).
     """
+    logger = get_drum_logger(__name__)
     parent_context = trace.set_span_in_context(parent_span)
     with tracer.start_as_current_span(
         "drum.chat.completions.stream", context=parent_context
     ) as stream_span:
-        chunks = []
+        accumulator = ChatStreamAccumulator(_get_max_captured_content_size())
         try:
             for chunk in iterable:
-                chunks.append(chunk)
+                if accumulator is not None:
+                    try:
+                        accumulator.feed(chunk)
+                    except Exception:
+                        logger.exception("Error parsing chat response chunk for span attributes")
+                        accumulator = None
                 yield chunk
         finally:
-            try:
-                reconstructed = reconstruct_chat_response_from_sse(chunks)
-                stream_span.set_attributes(extract_chat_response_attributes(reconstructed))
-            except Exception:
-                logger = get_drum_logger(__name__)
-                logger.exception(f"Error reconstructing chat response for span attributes")
+            if accumulator is not None:
+                try:
+                    stream_span.set_attributes(
+                        extract_chat_response_attributes(accumulator.response())
+                    )
+                except Exception:
+                    logger.exception("Error reconstructing chat response for span attributes")
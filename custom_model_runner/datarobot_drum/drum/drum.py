@@ -38,6 +38,7 @@ from datarobot_drum.drum.model_metadata import (
 
 from datarobot_drum.drum.description import version as drum_version
 from datarobot_drum.drum.enum import CUSTOM_FILE_NAME
+from datarobot_drum.drum.enum import FitMemoryPhase
 from datarobot_drum.drum.enum import LOG_LEVELS
 from datarobot_drum.drum.enum import LOGGER_NAME_PREFIX
 from datarobot_drum.drum.enum import ArgumentOptionsEnvVars
@@ -54,6 +55,10 @@ from datarobot_drum.drum.enum import TemplateType
 from datarobot_drum.drum.exceptions import DrumCommonException
 from datarobot_drum.drum.exceptions import DrumPredException
 from datarobot_drum.drum.adapters.model_adapters.python_model_adapter import PythonModelAdapter
+from datarobot_drum.drum.language_predictors.python_predictor.python_predictor import (
+    PythonPredictor,
+)
+from datarobot_drum.drum.peak_memory import PeakMemoryTracker
 from datarobot_drum.drum.perf_testing import CMRunTests
 from datarobot_drum.drum.push import drum_push
 from datarobot_drum.drum.push import setup_validation_options
@@ -584,43 +589,51 @@ class CMRunner:
         DrumSchemaValidationException
             Raised when model metadata validation fails.
         """
-        cli_adapter = DrumFitAdapter(
-            custom_task_folder_path=self.options.code_dir,
-            input_filename=self.options.input,
-            target_type=self.target_type,
-            target_name=self.options.target,
-            target_filename=self.options.target_csv,
-            weights_name=self.options.row_weights,
-            weights_filename=self.options.row_weights_csv,
-            sparse_column_filename=self.options.sparse_column_file,
-            positive_class_label=self.options.positive_class_label,
-            negative_class_label=self.options.negative_class_label,
-            class_labels=self.options.class_labels,
-            parameters_file=self.options.parameter_file,
-            default_parameter_values=self.options.default_parameter_values,
-            output_dir=self.options.output,
-            num_rows=self.options.num_rows,
-        ).validate()
-
-        # Validate schema target type and input data
-        self.schema_validator.validate_type_schema(cli_adapter.target_type)
-        self.schema_validator.validate_inputs(cli_adapter.X)
+        memory_tracker = PeakMemoryTracker(
+            max_memory=getattr(self.options, "max_memory", None),
+            trace_allocations=getattr(self.options, "trace_memory", False),
+        )
+        try:
+            self._run_fit_phases(memory_tracker)
+        finally:
+            memory_tracker.close()
+
+    def _run_fit_phases(self, memory_tracker: PeakMemoryTracker):
+        with memory_tracker.phase(FitMemoryPhase.LOAD_DATA):
+            cli_adapter = DrumFitAdapter(
+                custom_task_folder_path=self.options.code_dir,
+                input_filename=self.options.input,
+                target_type=self.target_type,
+                target_name=self.options.target,
+                target_filename=self.options.target_csv,
+                weights_name=self.options.row_weights,
+                weights_filename=self.options.row_weights_csv,
+                sparse_column_filename=self.options.sparse_column_file,
+                positive_class_label=self.options.positive_class_label,
+                negative_class_label=self.options.negative_class_label,
+                class_labels=self.options.class_labels,
+                parameters_file=self.options.parameter_file,
+                default_parameter_values=self.options.default_parameter_values,
+                output_dir=self.options.output,
+                num_rows=self.options.num_rows,
+                downcast_dtypes=self.options.downcast_dtypes,
+            ).validate()
+
+            # Validate schema target type and input data
+            self.schema_validator.validate_type_schema(cli_adapter.target_type)
+            self.schema_validator.validate_inputs(cli_adapter.X)
 
         fit_function = self._get_fit_function(cli_adapter=cli_adapter)
 
         print("Starting Fit")
-        from memory_profiler import memory_usage
-
-        fit_mem_usage = memory_usage(
-            fit_function,
-            interval=1,
-            max_usage=True,
-            max_iterations=1,
-        )
+        with memory_tracker.phase(FitMemoryPhase.FIT):
+            fit_function()
         print("Fit successful")
 
+        fit_mem_usage = memory_tracker.peak_mbytes(*FitMemoryPhase.FIT_PHASES)
         if self.options.verbose:
             print("Maximum fit memory usage: {}MB".format(int(fit_mem_usage)))
+            print(memory_tracker.format_report())
 
         if cli_adapter.persist_output or not self.options.skip_predict:
             create_custom_inference_model_folder(
@@ -635,16 +648,16 @@ class CMRunner:
             self.options.class_labels = cli_adapter.class_labels
 
             print("Starting Prediction")
-            mem_usage = memory_usage(
-                self.run_test_predict,
-                interval=1,
-                max_usage=True,
-                max_iterations=1,
-            )
+            with memory_tracker.phase(FitMemoryPhase.PREDICT):
+                if self._can_run_test_predict_in_process():
+                    self.run_test_predict_in_process(cli_adapter.X)
+                else:
+                    self.run_test_predict()
+            mem_usage = memory_tracker.peak_mbytes(FitMemoryPhase.PREDICT)
             if self.options.verbose:
                 print("Maximum server memory usage: {}MB".format(int(mem_usage)))
             if self.options.enable_fit_metadata:
-                self._generate_runtime_report_file(fit_mem_usage, mem_usage)
+                self._generate_runtime_report_file(memory_tracker, cli_adapter.output_dir)
             pred_str = " and predictions can be made on the fit model! \n "
             print("Prediction successful for fit validation")
         else:
@@ -725,6 +738,56 @@ class CMRunner:
         except DrumPredException as e:
             self.logger.warning(e)
 
+    def _can_run_test_predict_in_process(self):
+        # Transform models are verified with their target data, which only the server path sends
+        return (
+            not self.options.predict_in_subprocess
+            and self.target_type != TargetType.TRANSFORM
+            and self._check_artifacts_and_get_run_language() == RunLanguage.PYTHON
+        )
+
+    def run_test_predict_in_process(self, X):
+        """
+        Run after fit has completed, instead of `run_test_predict`, for Python models. The fit
+        model is loaded once in this process and the prediction checks are made on the already
+        read training data `X`, or on a sample of it if `--predict-sample-rows` is given.
+
+        The `custom` module imported by fit is evicted, so the hooks are loaded from the fit model
+        directory. Other modules it imported stay cached, so unlike with `run_test_predict` the
+        artifact is not guaranteed to be loaded by a fresh interpreter.
+
+        Raises
+        ------
+        DrumSerializationError
+            Raised when the fit model can not be loaded.
+        DrumSchemaValidationException
+            Raised when model metadata validation fails.
+        """
+        sys.modules.pop(CUSTOM_FILE_NAME, None)
+        predictor = PythonPredictor()
+        predictor.configure(
+            {
+                "__custom_model_path__": self.options.output,
+                "target_type": self.target_type.value,
+                "positiveClassLabel": self.options.positive_class_label,
+                "negativeClassLabel": self.options.negative_class_label,
+                "classLabels": self.options.class_labels,
+                "user_secrets_mount_path": getattr(self.options, "user_secrets_mount_path", None),
+                "user_secrets_prefix": getattr(self.options, "user_secrets_prefix", None),
+            }
+        )
+
+        sample_rows = self.options.predict_sample_rows
+        if sample_rows is not None and sample_rows < len(X):
+            X = X.sample(n=sample_rows, random_state=42)
+
+        try:
+            CMRunTests(
+                self.options, self.target_type, self.schema_validator
+            ).check_prediction_side_effects_in_process(predictor, X)
+        except DrumPredException as e:
+            self.logger.warning(e)
+
     def _generate_template(self):
         CMTemplateGenerator(
             template_type=TemplateType.MODEL,
@@ -1217,22 +1280,24 @@ class CMRunner:
         secondary_tag_part = _remove_invalid_prefixes_and_suffixes(os.path.basename(context_path))
         return f"{primary_tag_part}/{secondary_tag_part}".lower()
 
-    def _generate_runtime_report_file(self, fit_mem_usage: float, pred_mem_usage: float) -> None:
+    def _generate_runtime_report_file(
+        self, memory_tracker: PeakMemoryTracker, output_dir: str
+    ) -> None:
         """
         Saves information related to running a fit pipeline.  All data is reported in Mb
 
         Parameters:
-            fit_mem_usage: Memory footprint of running the fit job
-            pred_mem_usage: Memory footprint of running the check for prediction side effects
+            memory_tracker: Peak memory of the fit phases and of the check for prediction side effects
+            output_dir: Directory of the fit model, where the report is saved
         """
-        print(self.options.input, self.options)
         report_information = {
-            "fit_memory_usage": fit_mem_usage,
-            "prediction_memory_usage": pred_mem_usage,
+            "fit_memory_usage": memory_tracker.peak_mbytes(*FitMemoryPhase.FIT_PHASES),
+            "prediction_memory_usage": memory_tracker.peak_mbytes(FitMemoryPhase.PREDICT),
+            "memory_source": memory_tracker.source,
+            "memory_phases": memory_tracker.report(),
             "input_dataframe_size": self.input_df.memory_usage(deep=True).sum() / 1e6,
         }
-        # in run_predict the code dir is set to the output and output is set to /dev/null
-        output_path = Path(self.options.code_dir) / FIT_METADATA_FILENAME
+        output_path = Path(output_dir) / FIT_METADATA_FILENAME
         json.dump(report_information, open(output_path, "w"))
 
 
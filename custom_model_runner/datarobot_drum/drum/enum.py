@@ -138,6 +138,7 @@ class UnstructuredDtoKeys:
     HEADERS = "headers"
     MIMETYPE = "mimetype"
     CHARSET = "charset"
+    STREAM = "stream"
 
 
 class StructuredDtoKeys:
@@ -147,11 +148,13 @@ class StructuredDtoKeys:
     TARGET_MIMETYPE = "target_mimetype"
     SPARSE_COLNAMES = "sparse_colnames"
     PARAMETERS = "parameters"
+    DATAFRAME = "dataframe"
 
 
 class PredictionServerMimetypes:
     APPLICATION_JSON = "application/json"
     APPLICATION_OCTET_STREAM = "application/octet-stream"
+    APPLICATION_X_NPZ = "application/x-npz"
     TEXT_PLAIN = "text/plain"
     TEXT_MTX = "text/mtx"
     TEXT_CSV = "text/csv"
@@ -161,6 +164,8 @@ class PredictionServerMimetypes:
 class InputFormatExtension:
     MTX = ".mtx"
     CSV = ".csv"
+    JSON = ".json"
+    NPZ = ".npz"
 
 
 class ModelInfoKeys:
@@ -180,6 +185,8 @@ class ModelInfoKeys:
 
 InputFormatToMimetype = {
     InputFormatExtension.MTX: PredictionServerMimetypes.TEXT_MTX,
+    InputFormatExtension.JSON: PredictionServerMimetypes.APPLICATION_JSON,
+    InputFormatExtension.NPZ: PredictionServerMimetypes.APPLICATION_X_NPZ,
 }
 
 
@@ -244,11 +251,16 @@ class ArgumentsOptions:
     WEIGHTS_CSV = "--row-weights-csv"
     WEIGHTS = "--row-weights"
     SKIP_PREDICT = "--skip-predict"
+    PREDICT_IN_SUBPROCESS = "--predict-in-subprocess"
+    PREDICT_SAMPLE_ROWS = "--predict-sample-rows"
     TIMEOUT = "--timeout"
     PRODUCTION = "--production"
     LOGGING_LEVEL = "--logging-level"
     LANGUAGE = "--language"
     NUM_ROWS = "--num-rows"
+    DOWNCAST_DTYPES = "--downcast-dtypes"
+    MAX_MEMORY = "--max-memory"
+    TRACE_MEMORY = "--trace-memory"
     MONITOR = "--monitor"
     MONITOR_EMBEDDED = "--monitor-embedded"
     DEPLOYMENT_ID = "--deployment-id"
@@ -282,6 +294,7 @@ class ArgumentsOptions:
     USER_SECRETS_MOUNT_PATH = "--user-secrets-mount-path"
     USER_SECRETS_PREFIX = "--user-secrets-prefix"
     LAZY_LOADING_FILE = "--lazy-loading-file"
+    VALIDATION_WORKERS = "--validation-workers"
 
     DRUM_COMMAND = "drum"
     MAIN_COMMAND = DRUM_COMMAND if not DEBUG else f"./custom_model_runner/bin/{DRUM_COMMAND}"
@@ -417,6 +430,25 @@ class EnvVarNames:
 class PayloadFormat:
     CSV = "csv"
     MTX = "mtx"
+    JSON = "json"
+    NPZ = "npz"
+
+
+class CsvParserEngine:
+    C = "c"
+    PYARROW = "pyarrow"
+    PYTHON = "python"
+
+    ALL = [C, PYARROW, PYTHON]
+
+
+class FitMemoryPhase:
+    LOAD_DATA = "load data"
+    FIT = "fit"
+    SERIALIZE = "serialize"
+    PREDICT = "predict"
+
+    FIT_PHASES = [LOAD_DATA, FIT, SERIALIZE]
 
 
 class ExitCodes(Enum):
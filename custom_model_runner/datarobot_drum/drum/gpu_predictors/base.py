@@ -4,6 +4,7 @@ All rights reserved.
 This is proprietary source code of DataRobot, Inc. and its affiliates.
 Released under the terms of DataRobot Tool and Utility Agreement.
 """
+import contextvars
 import csv
 import inspect
 import io
@@ -14,10 +15,11 @@ import signal
 import sys
 import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from pathlib import Path
 from subprocess import Popen
-from threading import Event, Thread
+from threading import Event, Lock, Thread
 
 import numpy as np
 import requests
@@ -41,6 +43,7 @@ from datarobot_drum.drum.enum import (
 )
 from datarobot_drum.drum.exceptions import DrumCommonException
 from datarobot_drum.drum.gpu_predictors import MLOpsStatusReporter
+from datarobot_drum.drum.gpu_predictors.health_poller import BackendHealthPoller
 from datarobot_drum.drum.language_predictors.base_language_predictor import (
     BaseLanguagePredictor,
 )
@@ -88,6 +91,9 @@ class BaseOpenAiGpuPredictor(BaseLanguagePredictor):
     DEFAULT_MODEL_NAME = "datarobot-deployed-llm"
     MAX_RESTARTS = 10
     DEFAULT_HEALTH_ROUTE = "/"
+    DEFAULT_MAX_CONCURRENT_COMPLETIONS = 16
+    DEFAULT_HEALTH_CHECK_INTERVAL = 5
+    DEFAULT_HEALTH_CHECK_MAX_STALENESS = 30
 
     def __init__(self):
         super().__init__()
@@ -116,6 +122,15 @@ class BaseOpenAiGpuPredictor(BaseLanguagePredictor):
         self.max_tokens = int(self.get_optional_parameter("max_tokens", 0)) or None
         self.num_choices_per_completion = int(self.get_optional_parameter("n", 0)) or None
         self.temperature = self.get_optional_parameter("temperature") or None
+        # OpenAI compatible servers batch concurrent requests, so prompt rows are sent concurrently
+        self.max_concurrent_completions = max(
+            1,
+            int(
+                self.get_optional_parameter(
+                    "max_concurrent_completions", self.DEFAULT_MAX_CONCURRENT_COMPLETIONS
+                )
+            ),
+        )
 
         # used to load custom model hooks
         self.python_model_adapter: PythonModelAdapter = None
@@ -128,6 +143,21 @@ class BaseOpenAiGpuPredictor(BaseLanguagePredictor):
         )
         self._max_watchdog_backoff = self.get_optional_parameter("max_watchdog_backoff_sec", 300)
 
+        # Probes are answered from the backend health polled in the background, so that frequent
+        # probes do not load a saturated server and time out. An interval of 0 disables polling.
+        self._health_check_interval = float(
+            self.get_optional_parameter(
+                "health_check_interval_sec", self.DEFAULT_HEALTH_CHECK_INTERVAL
+            )
+        )
+        self._health_check_max_staleness = float(
+            self.get_optional_parameter(
+                "health_check_max_staleness_sec", self.DEFAULT_HEALTH_CHECK_MAX_STALENESS
+            )
+        )
+        self._health_poller = None
+        self._health_poller_lock = Lock()
+
         if not _HAS_OPENAI:
             raise DrumCommonException("OpenAI Python SDK is not installed")
 
@@ -342,7 +372,6 @@ class BaseOpenAiGpuPredictor(BaseLanguagePredictor):
             data = data.decode("utf8")
 
         reader = csv.DictReader(io.StringIO(data))
-        results = []
 
         def user_prompt(row):
             return {
@@ -351,11 +380,12 @@ class BaseOpenAiGpuPredictor(BaseLanguagePredictor):
             }
 
         # each prompt row sent as a separate completion request
-        for i, row in enumerate(reader):
-            self.logger.debug("Row %d: %s", i, row)
-            messages = [user_prompt(row)]
-            completions = self._create_completions(messages, i)
-            results.extend(completions)
+        rows_messages = [[user_prompt(row)] for row in reader]
+        results = [
+            completion
+            for completions in self._create_rows_completions(rows_messages)
+            for completion in completions
+        ]
 
         # TODO DRUM has a restriction for text generation targets to return only a single column
         # column_names = ["row_id", "choice_id", "completions"]
@@ -370,6 +400,41 @@ class BaseOpenAiGpuPredictor(BaseLanguagePredictor):
             expected_column_names = [self.user_prompt_column]
             raise DrumCommonException(f"Model expects column names '{expected_column_names}'")
 
+    def _create_rows_completions(self, rows_messages):
+        """
+        Completions of every row, in the order of the rows. Up to `max_concurrent_completions`
+        requests are in flight at once. A failed row gets None completions and does not stop the
+        other ones, unless every row failed.
+        """
+
+        def create_completions(row_id, messages):
+            self.logger.debug("Row %d: %s", row_id, messages)
+            try:
+                return self._create_completions(messages, row_id)
+            except Exception as e:
+                return e
+
+        num_workers = min(self.max_concurrent_completions, len(rows_messages))
+        if num_workers <= 1:
+            results = [create_completions(i, m) for i, m in enumerate(rows_messages)]
+        else:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                # every request runs in a copy of the context, so the tracing spans are kept
+                futures = [
+                    executor.submit(contextvars.copy_context().run, create_completions, i, m)
+                    for i, m in enumerate(rows_messages)
+                ]
+                results = [future.result() for future in futures]
+
+        errors = [(i, result) for i, result in enumerate(results) if isinstance(result, Exception)]
+        if errors and len(errors) == len(results):
+            raise errors[0][1]
+        for row_id, error in errors:
+            self.logger.error("Completion of row %d failed: %s", row_id, error)
+
+        num_choices = self.num_choices_per_completion or 1
+        return [[None] * num_choices if isinstance(r, Exception) else r for r in results]
+
     def _create_completions(self, messages, row_id=0):
         from openai import BadRequestError
 
@@ -419,6 +484,28 @@ class BaseOpenAiGpuPredictor(BaseLanguagePredictor):
         ):
             return {"message": f"{self.NAME} has crashed."}, HTTP_513_DRUM_PIPELINE_ERROR
 
+        if self._health_check_interval <= 0:
+            return self._check_server_health()
+        return self._get_health_poller().health()
+
+    def _get_health_poller(self):
+        # started by the first probe, the first check is made synchronously to answer it
+        with self._health_poller_lock:
+            if self._health_poller is None:
+                poller = BackendHealthPoller(
+                    self._check_server_health,
+                    self.NAME,
+                    interval=self._health_check_interval,
+                    max_staleness=max(
+                        self._health_check_max_staleness, self._health_check_interval
+                    ),
+                )
+                poller.poll()
+                poller.start()
+                self._health_poller = poller
+        return self._health_poller
+
+    def _check_server_health(self):
         try:
             health_url = f"http://{self.openai_host}:{self.openai_port}{self.health_route}"
             response = requests.get(health_url, timeout=5)
@@ -456,6 +543,8 @@ class BaseOpenAiGpuPredictor(BaseLanguagePredictor):
 
     def terminate(self):
         self._is_shutting_down.set()
+        if self._health_poller is not None:
+            self._health_poller.stop()
         self._openai_server_ready_sentinel.unlink(missing_ok=True)
         if not self.openai_process or not self.openai_process.process:
             self.logger.info("OpenAI server is not running, skipping shutdown...")
@@ -0,0 +1,108 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import logging
+import threading
+import time
+
+from opentelemetry import metrics
+from requests import codes as http_codes
+
+from datarobot_drum.drum.enum import LOGGER_NAME_PREFIX
+
+logger = logging.getLogger(LOGGER_NAME_PREFIX + "." + __name__)
+
+
+class BackendHealthPoller(object):
+    """
+    Checks the health of an inference backend in a background thread every `interval` seconds,
+    so health probes are answered from the last result instead of calling the backend.
+
+    A result older than `max_staleness` seconds, e.g. because the checks hang, is not trusted:
+    the backend is reported unavailable until a check completes again.
+
+    Transitions between healthy and unhealthy are logged and counted by the
+    `drum.backend_health.transitions` OTEL counter, and the current state is reported by the
+    `drum.backend_health.healthy` gauge (1 when healthy).
+    """
+
+    def __init__(self, check, name, interval, max_staleness, meter=None):
+        self._check = check
+        self.name = name
+        self.interval = interval
+        self.max_staleness = max_staleness
+        # (message, status, monotonic time of the check), replaced at once to be read lock-free
+        self._state = None
+        self._healthy = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        meter = meter or metrics.get_meter(__name__)
+        self._transitions = meter.create_counter(
+            "drum.backend_health.transitions",
+            description="Transitions of the inference backend between healthy and unhealthy",
+        )
+        meter.create_observable_gauge(
+            "drum.backend_health.healthy",
+            callbacks=[self._observe_health],
+            description="1 if the last inference backend health check succeeded, else 0",
+        )
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="{} Health Poller".format(self.name)
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        if self._state is None:
+            self.poll()
+        while not self._stop_event.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """Check the backend health once and cache the result."""
+        try:
+            message, status = self._check()
+        except Exception as e:
+            logger.warning("%s health check failed", self.name, exc_info=True)
+            message = {"message": "{} health check failed: {}".format(self.name, e)}
+            status = http_codes.SERVICE_UNAVAILABLE
+        self._state = (message, status, time.monotonic())
+
+        healthy = status == http_codes.OK
+        if healthy != self._healthy:
+            logger.info(
+                "%s is %s (status %s)", self.name, "healthy" if healthy else "unhealthy", status
+            )
+            self._transitions.add(1, {"backend": self.name, "healthy": healthy})
+            self._healthy = healthy
+
+    def health(self):
+        """The last health check result as (message, status code)."""
+        state = self._state
+        if state is None:
+            return {
+                "message": "Waiting for the first {} health check.".format(self.name)
+            }, http_codes.SERVICE_UNAVAILABLE
+
+        message, status, checked_at = state
+        age = time.monotonic() - checked_at
+        if age > self.max_staleness:
+            return {
+                "message": "{} health is unknown, it was last checked {:.0f}s ago.".format(
+                    self.name, age
+                )
+            }, http_codes.SERVICE_UNAVAILABLE
+        return message, status
+
+    def _observe_health(self, options):
+        if self._healthy is None:
+            return []
+        return [metrics.Observation(int(self._healthy), {"backend": self.name})]
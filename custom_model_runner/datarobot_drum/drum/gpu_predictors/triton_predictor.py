@@ -10,6 +10,7 @@ import logging
 
 import requests
 from requests import Timeout
+from requests.adapters import HTTPAdapter
 
 from datarobot_drum.drum.adapters.model_adapters.python_model_adapter import (
     RawPredictResponse,
@@ -18,17 +19,26 @@ from datarobot_drum.drum.common import SupportedPayloadFormats
 from datarobot_drum.drum.enum import (
     LOGGER_NAME_PREFIX,
     PayloadFormat,
+    PredictionServerMimetypes,
     TritonInferenceServerBackends,
     UnstructuredDtoKeys,
 )
 from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.drum.gpu_predictors.triton_tensors import (
+    INFERENCE_HEADER,
+    decode_infer_response,
+    encode_infer_request,
+    tensors_from_npz,
+    tensors_to_npz,
+)
 from datarobot_drum.drum.gpu_predictors.utils import read_model_config
 from datarobot_drum.drum.language_predictors.base_language_predictor import (
     BaseLanguagePredictor,
 )
 
 RUNNING_LANG_MSG = "Running environment: Triton Inference Server."
-INFERENCE_HEADER = "Inference-Header-Content-Length"
+# kept alive connections to the Triton server, one per concurrently served request
+CONNECTION_POOL_SIZE = 32
 
 
 class TritonPredictor(BaseLanguagePredictor):
@@ -39,6 +49,7 @@ class TritonPredictor(BaseLanguagePredictor):
         self.triton_http_port = None
         self.triton_grpc_port = None
         self.model_config = None
+        self._session = None
 
     def configure(self, params):
         super(TritonPredictor, self).configure(params)
@@ -53,6 +64,11 @@ class TritonPredictor(BaseLanguagePredictor):
                 f"Unsupported model platform type: {self.model_config.platform or self.model_config.backend}"
             )
 
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CONNECTION_POOL_SIZE)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
     def is_supported_triton_server_backend(self) -> bool:
         if not self.model_config:
             return False
@@ -87,7 +103,45 @@ class TritonPredictor(BaseLanguagePredictor):
             # to Triton still may succeed
             return  # do nothing
 
+    @property
+    def _infer_url(self):
+        return (
+            f"{self.triton_host}:{self.triton_http_port}/v2/models/{self.model_config.name}/infer"
+        )
+
+    def infer(self, inputs, outputs=None):
+        """
+        Run an inference on `inputs`, a dict of tensor name to numpy array, and return the
+        `outputs` tensors (all the outputs of the model by default) as a dict of numpy arrays.
+        Tensors are sent and received with the binary tensor data extension, without JSON encoding.
+        """
+        body, header_length = encode_infer_request(inputs, outputs)
+        resp = self._session.post(
+            self._infer_url,
+            data=body,
+            headers={
+                INFERENCE_HEADER: str(header_length),
+                "Content-Type": PredictionServerMimetypes.APPLICATION_OCTET_STREAM,
+            },
+        )
+        header_length = resp.headers.get(INFERENCE_HEADER)
+        if not resp.ok and header_length is None:
+            raise DrumCommonException(
+                "Triton inference failed with status {}: {}".format(resp.status_code, resp.text)
+            )
+        return decode_infer_response(
+            resp.content, None if header_length is None else int(header_length)
+        )
+
     def predict_unstructured(self, data, **kwargs):
+        mimetype = kwargs.get(UnstructuredDtoKeys.MIMETYPE)
+        if mimetype == PredictionServerMimetypes.APPLICATION_X_NPZ:
+            # tensors sent as NPZ arrays are forwarded as binary tensors, and so are the outputs
+            outputs = self.infer(tensors_from_npz(data))
+            return tensors_to_npz(outputs), {
+                UnstructuredDtoKeys.MIMETYPE: PredictionServerMimetypes.APPLICATION_X_NPZ
+            }
+
         headers = kwargs.get(UnstructuredDtoKeys.HEADERS, {})
 
         # Predictions API does not forward the headers,
@@ -99,12 +153,14 @@ class TritonPredictor(BaseLanguagePredictor):
                 headers.update({INFERENCE_HEADER: str(inference_header_size)})
 
         self.logger.debug(headers)
-        model_name = self.model_config.name
-        resp = requests.post(
-            f"{self.triton_host}:{self.triton_http_port}/v2/models/{model_name}/infer",
-            data=data,
-            headers=headers,
-        )
+        resp = self._session.post(self._infer_url, data=data, headers=headers)
+        if INFERENCE_HEADER in resp.headers:
+            # binary output tensors must not be decoded as text, and the client needs the
+            # inference header size to split them from the JSON header
+            return resp.content, {
+                UnstructuredDtoKeys.MIMETYPE: PredictionServerMimetypes.APPLICATION_OCTET_STREAM,
+                UnstructuredDtoKeys.HEADERS: {INFERENCE_HEADER: resp.headers[INFERENCE_HEADER]},
+            }
         return resp.text, None
 
     def liveness_probe(self):
@@ -118,7 +174,7 @@ class TritonPredictor(BaseLanguagePredictor):
         #   if we can detect some other terminal error relating to loading the model provided.
         try:
             triton_health_url = f"{self.triton_host}:{self.triton_http_port}/v2/health/ready"
-            response = requests.get(triton_health_url, timeout=5)
+            response = (self._session or requests).get(triton_health_url, timeout=5)
             return {"message": response.text}, response.status_code
         except Timeout:
             return {"message": "Timeout waiting for Triton health route to respond."}, 503
@@ -0,0 +1,172 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import io
+import json
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from datarobot_drum.drum.exceptions import DrumCommonException
+
+# Binary tensor data extension of the KServe v2 protocol, see
+# https://docs.nvidia.com/deeplearning/triton-inference-server/user-guide/docs/protocol/extension_binary_data.html
+INFERENCE_HEADER = "Inference-Header-Content-Length"
+
+_NUMPY_DTYPES = OrderedDict(
+    [
+        ("BOOL", np.bool_),
+        ("INT8", np.int8),
+        ("INT16", np.int16),
+        ("INT32", np.int32),
+        ("INT64", np.int64),
+        ("UINT8", np.uint8),
+        ("UINT16", np.uint16),
+        ("UINT32", np.uint32),
+        ("UINT64", np.uint64),
+        ("FP16", np.float16),
+        ("FP32", np.float32),
+        ("FP64", np.float64),
+    ]
+)
+_TRITON_DTYPES = {np.dtype(dtype): name for name, dtype in _NUMPY_DTYPES.items()}
+_BYTES_LENGTH = struct.Struct("<I")
+
+
+def _triton_dtype(array):
+    if array.dtype.kind in "OSU":
+        return "BYTES"
+    try:
+        return _TRITON_DTYPES[array.dtype.newbyteorder("=")]
+    except KeyError:
+        raise DrumCommonException(
+            "Unsupported tensor dtype {}, use one of: {}".format(
+                array.dtype, ", ".join(list(_NUMPY_DTYPES) + ["BYTES"])
+            )
+        )
+
+
+def _serialize_bytes(array):
+    # every element is its length (little-endian uint32) followed by its bytes
+    parts = []
+    for element in array.ravel(order="C"):
+        if isinstance(element, str):
+            element = element.encode("utf-8")
+        element = bytes(element)
+        parts.append(_BYTES_LENGTH.pack(len(element)))
+        parts.append(element)
+    return b"".join(parts)
+
+
+def _deserialize_bytes(data, shape):
+    elements = []
+    offset = 0
+    while offset < len(data):
+        (length,) = _BYTES_LENGTH.unpack_from(data, offset)
+        offset += _BYTES_LENGTH.size
+        elements.append(bytes(data[offset : offset + length]))
+        offset += length
+    return np.array(elements, dtype=np.object_).reshape(shape)
+
+
+def encode_infer_request(inputs, output_names=None):
+    """
+    Build a binary tensor inference request for `inputs`, a dict of tensor name to numpy array.
+    Numeric tensors are sent as their raw little-endian buffers, string/bytes tensors as BYTES.
+    The listed outputs, all outputs of the model when None, are requested as binary data.
+
+    Returns the request body and the length of its JSON header.
+    """
+    header_inputs = []
+    buffers = []
+    for name, array in inputs.items():
+        array = np.asarray(array)
+        datatype = _triton_dtype(array)
+        if datatype == "BYTES":
+            buffer = _serialize_bytes(array)
+        else:
+            array = np.ascontiguousarray(array.astype(array.dtype.newbyteorder("<"), copy=False))
+            buffer = memoryview(array).cast("B")
+        header_inputs.append(
+            {
+                "name": name,
+                "shape": list(array.shape),
+                "datatype": datatype,
+                "parameters": {"binary_data_size": len(buffer)},
+            }
+        )
+        buffers.append(buffer)
+
+    header = {"inputs": header_inputs}
+    if output_names is None:
+        header["parameters"] = {"binary_data_output": True}
+    else:
+        header["outputs"] = [
+            {"name": name, "parameters": {"binary_data": True}} for name in output_names
+        ]
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return b"".join([header] + buffers), len(header)
+
+
+def decode_infer_response(body, header_length=None):
+    """
+    Decode the outputs of an inference response, binary or JSON, into an ordered dict of tensor
+    name to numpy array. Binary outputs are views on `body`, they are not copied.
+    """
+    body = memoryview(body)
+    if header_length is None:
+        header_length = len(body)
+    header = json.loads(body[:header_length].tobytes())
+    if "error" in header:
+        raise DrumCommonException("Triton inference failed: {}".format(header["error"]))
+
+    outputs = OrderedDict()
+    offset = header_length
+    for output in header.get("outputs", []):
+        shape = output["shape"]
+        datatype = output["datatype"]
+        size = (output.get("parameters") or {}).get("binary_data_size")
+        if size is None:
+            data = output["data"]
+            outputs[output["name"]] = (
+                np.array([d.encode("utf-8") for d in data], dtype=np.object_).reshape(shape)
+                if datatype == "BYTES"
+                else np.array(data, dtype=_NUMPY_DTYPES[datatype]).reshape(shape)
+            )
+            continue
+        data = body[offset : offset + size]
+        offset += size
+        if datatype == "BYTES":
+            outputs[output["name"]] = _deserialize_bytes(data, shape)
+        else:
+            dtype = np.dtype(_NUMPY_DTYPES[datatype]).newbyteorder("<")
+            outputs[output["name"]] = np.frombuffer(data, dtype=dtype).reshape(shape)
+    return outputs
+
+
+def tensors_from_npz(data):
+    """Read the tensors of an NPZ payload, keeping the order of its arrays."""
+    try:
+        with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+            return OrderedDict((name, npz[name]) for name in npz.files)
+    except Exception as e:
+        raise DrumCommonException("Can't read the NPZ tensors payload: {}".format(e))
+
+
+def tensors_to_npz(tensors):
+    """Write tensors as an uncompressed NPZ payload. BYTES tensors are stored as numpy strings."""
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        **{
+            name: np.asarray(array.tolist(), dtype=np.bytes_)
+            if array.dtype == np.object_
+            else array
+            for name, array in tensors.items()
+        }
+    )
+    return buffer.getvalue()
@@ -1,6 +1,9 @@
+import json
 import logging
 import os
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from subprocess import CalledProcessError
 
@@ -104,14 +107,39 @@ class NGCRegistryClient:
 
 
 class S3Client:
-    def __init__(self, s3_url, credential):
+    """
+    Downloads a model store from S3. Objects are downloaded concurrently by `max_workers` threads,
+    large objects in multipart chunks by `max_concurrency_per_file` threads each.
+
+    The downloaded objects are recorded in a manifest in the destination directory, with their
+    ETag and size, so the objects already downloaded are skipped, e.g. when a pod is restarted
+    on the same node.
+    """
+
+    MANIFEST_FILE = ".s3_download_manifest.json"
+    DEFAULT_MAX_WORKERS = 16
+    DEFAULT_MAX_CONCURRENCY_PER_FILE = 4
+    MULTIPART_CHUNK_SIZE = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        s3_url,
+        credential,
+        max_workers=DEFAULT_MAX_WORKERS,
+        max_concurrency_per_file=DEFAULT_MAX_CONCURRENCY_PER_FILE,
+    ):
         import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
 
         from .aws_helper import AwsHelper
 
         parsed_url = AwsHelper.s3_url_parse(s3_url)
         self.bucket_name = parsed_url[0]
         self.prefix = parsed_url[1]
+        self.max_workers = max_workers
+        # key -> {"size": ..., "etag": ...} of the objects found by list_objects()
+        self.objects = {}
 
         self.s3_client = boto3.client(
             "s3",
@@ -120,6 +148,13 @@ class S3Client:
             aws_session_token=credential["awsSessionToken"]
             if "awsSessionToken" in credential
             else None,
+            # every download thread needs its own connection
+            config=Config(max_pool_connections=max_workers * max_concurrency_per_file),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=self.MULTIPART_CHUNK_SIZE,
+            max_concurrency=max_concurrency_per_file,
         )
 
     def list_objects(self):
@@ -140,6 +175,7 @@ class S3Client:
                 k = i.get("Key")
                 if k[-1] != "/":
                     keys.append(k)
+                    self.objects[k] = {"size": i.get("Size"), "etag": i.get("ETag")}
                 else:
                     dirs.append(k)
             next_token = results.get("NextContinuationToken")
@@ -151,8 +187,60 @@ class S3Client:
             dest_pathname = os.path.join(destination_dir, str(d).replace(self.prefix, ""))
             if not os.path.exists(os.path.dirname(dest_pathname)):
                 os.makedirs(os.path.dirname(dest_pathname))
+
+        manifest = self._read_manifest(destination_dir)
+        manifest_lock = threading.Lock()
+        downloads = []
         for k in keys:
             dest_pathname = os.path.join(destination_dir, str(k).replace(self.prefix, ""))
-            if not os.path.exists(os.path.dirname(dest_pathname)):
-                os.makedirs(os.path.dirname(dest_pathname))
-            self.s3_client.download_file(self.bucket_name, k, dest_pathname)
+            if self._is_downloaded(k, dest_pathname, manifest):
+                logger.debug("Skipping %s, it is already downloaded", k)
+                continue
+            os.makedirs(os.path.dirname(dest_pathname), exist_ok=True)
+            downloads.append((k, dest_pathname))
+
+        logger.info(
+            "Downloading %d objects from s3://%s/%s, %d are already downloaded",
+            len(downloads),
+            self.bucket_name,
+            self.prefix,
+            len(keys) - len(downloads),
+        )
+
+        def download(key, dest_pathname):
+            self.s3_client.download_file(
+                self.bucket_name, key, dest_pathname, Config=self.transfer_config
+            )
+            if key in self.objects:
+                with manifest_lock:
+                    manifest[key] = self.objects[key]
+                    self._write_manifest(destination_dir, manifest)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(download, *d) for d in downloads]
+            for future in as_completed(futures):
+                future.result()
+
+    def _is_downloaded(self, key, dest_pathname, manifest):
+        remote = self.objects.get(key)
+        if remote is None or manifest.get(key) != remote:
+            return False
+        try:
+            return os.path.getsize(dest_pathname) == remote["size"]
+        except OSError:
+            return False
+
+    @classmethod
+    def _read_manifest(cls, destination_dir):
+        try:
+            with open(os.path.join(destination_dir, cls.MANIFEST_FILE), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _write_manifest(cls, destination_dir, manifest):
+        manifest_path = os.path.join(destination_dir, cls.MANIFEST_FILE)
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
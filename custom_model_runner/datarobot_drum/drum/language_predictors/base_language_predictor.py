@@ -25,13 +25,21 @@ from datarobot_drum.drum.model_metadata import read_model_metadata_yaml
 from datarobot_drum.drum.enum import (
     LOGGER_NAME_PREFIX,
     ModelInfoKeys,
+    ModelMetadataKeys,
+    PredictionServerMimetypes,
     StructuredDtoKeys,
     TargetType,
+    UnstructuredDtoKeys,
 )
 from datarobot_drum.drum.typeschema_validation import SchemaValidator
 from datarobot_drum.drum.utils.structured_input_read_utils import StructuredInputReadUtils
 from datarobot_drum.drum.data_marshalling import marshal_predictions
+from datarobot_drum.drum.root_predictors.chat_cache import ChatCompletionCache
 from datarobot_drum.drum.root_predictors.chat_helpers import is_streaming_response
+from datarobot_drum.drum.root_predictors.unstructured_helpers import (
+    _resolve_incoming_unstructured_data,
+    _resolve_incoming_unstructured_mimetype,
+)
 
 import datarobot as dr
 from datarobot_mlops.common.connected_exception import DRMLOpsConnectedException
@@ -105,8 +113,10 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
         self._params = None
         self._mlops = None
         self._schema_validator = None
+        self._input_dtypes = None
         self._prompt_column_name = DEFAULT_PROMPT_COLUMN_NAME
         self._deployment = None
+        self._chat_cache = None
 
         self._tracking_settings = {
             "target_drift": {"enabled": True},
@@ -129,6 +139,9 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
 
         self._code_dir = params["__custom_model_path__"]
         self._params = params
+        self._chat_cache = ChatCompletionCache.from_runtime_parameters(
+            namespace=params.get("model_id")
+        )
 
         if to_bool(params.get("allow_dr_api_access")):
             logger.info("Initializing DataRobot Python client.")
@@ -142,6 +155,9 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
         model_metadata = read_model_metadata_yaml(self._code_dir)
         if model_metadata:
             self._schema_validator = SchemaValidator(model_metadata.get("typeSchema", {}))
+            self._input_dtypes = model_metadata.get(ModelMetadataKeys.INFERENCE_MODEL, {}).get(
+                "columnDtypes"
+            )
 
     @staticmethod
     def _dr_api_url(endpoint):
@@ -236,10 +252,13 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
                 num_predictions=len(predictions), execution_time_ms=predict_time_ms
             )
 
-            df = StructuredInputReadUtils.read_structured_input_data_as_df(
-                kwargs.get(StructuredDtoKeys.BINARY_DATA),
-                kwargs.get(StructuredDtoKeys.MIMETYPE),
-            )
+            df = kwargs.get(StructuredDtoKeys.DATAFRAME)
+            if df is None:
+                df = StructuredInputReadUtils.read_structured_input_data_as_df(
+                    kwargs.get(StructuredDtoKeys.BINARY_DATA),
+                    kwargs.get(StructuredDtoKeys.MIMETYPE),
+                    dtype=self._input_dtypes,
+                )
             # mlops.report_predictions_data expect the prediction data in the following format:
             # Regression: [10, 12, 13]
             # Classification: [[0.5, 0.5], [0.7, 03]]
@@ -273,6 +292,25 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
         self.monitor(kwargs, predictions_df, execution_time_ms)
         return PredictResponse(predictions_df, raw_predict_response.extra_model_output)
 
+    def predict_dataframe(
+        self, df: pd.DataFrame, with_extra_model_output: bool = True
+    ) -> pd.DataFrame:
+        """
+        Predict on an in-memory DataFrame and return the predictions (joined with any extra
+        model output, unless `with_extra_model_output` is False) as a DataFrame. Predictors
+        that can consume a DataFrame directly skip the CSV serialize/parse round trip; the
+        others receive it as a CSV payload.
+        """
+        response = self.predict(**self._dataframe_to_kwargs(df))
+        return response.combined_dataframe if with_extra_model_output else response.predictions
+
+    def _dataframe_to_kwargs(self, df: pd.DataFrame) -> dict:
+        """Build the predict/transform kwargs for an in-memory DataFrame."""
+        return {
+            StructuredDtoKeys.BINARY_DATA: df.to_csv(index=False).encode("utf-8"),
+            StructuredDtoKeys.MIMETYPE: PredictionServerMimetypes.TEXT_CSV,
+        }
+
     @abstractmethod
     def _predict(self, **kwargs) -> RawPredictResponse:
         """Predict on input_filename or binary_data"""
@@ -285,8 +323,20 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
         )
         try:
             association_id = association_id or str(uuid4_fast())
-            response = self._chat(completion_create_params, association_id, **kwargs)
-            response = self._validate_chat_response(response)
+
+            def create_completion():
+                response = self._chat(completion_create_params, association_id, **kwargs)
+                return self._validate_chat_response(response)
+
+            if self._chat_cache is None:
+                response = create_completion()
+            else:
+                response = self._chat_cache.chat(
+                    completion_create_params,
+                    create_completion,
+                    headers=kwargs.get("headers"),
+                    cacheable=self._is_chat_cacheable(),
+                )
         except Exception as e:
             self._mlops_report_error(start_time)
             raise e
@@ -320,6 +370,14 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
 
             return generator()
 
+    def _is_chat_cacheable(self):
+        """Whether the completion of a chat request only depends on the chat cache key."""
+        return True
+
+    def get_chat_cache_stats(self):
+        """Hit and miss counts of the chat completion cache, None if it is disabled."""
+        return None if self._chat_cache is None else self._chat_cache.stats()
+
     def get_supported_llm_models(self):
         return self._get_supported_llm_models()
 
@@ -441,6 +499,13 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
             self._schema_validator.validate_outputs(output_X)
         return output
 
+    def transform_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform an in-memory DataFrame and return the transformed features as a DataFrame.
+        See `predict_dataframe` for how the input is handed over to the predictor.
+        """
+        return self.transform(**self._dataframe_to_kwargs(df))[0]
+
     @abstractmethod
     def _transform(self, **kwargs):
         """Predict on input_filename or binary_data"""
@@ -451,6 +516,39 @@ class BaseLanguagePredictor(DrumClassLabelAdapter, ABC):
         """Check if read_input_data hook defined in predictor"""
         pass
 
+    def supports_memory_mapped_input(self):
+        """
+        Check if structured payloads can be handed over as a read-only memory map of a spooled
+        upload instead of bytes, which requires them to be parsed by DRUM.
+        """
+        return False
+
+    def supports_streaming_unstructured_input(self):
+        """
+        Check if the unstructured hook reads the request body incrementally from a `stream`
+        keyword argument instead of receiving it as `data`.
+        """
+        return False
+
+    def predict_unstructured_stream(self, stream, mimetype=None, charset=None, **kwargs):
+        """
+        Score an unstructured request whose body is read from the binary file-like `stream`.
+        Models which support streaming input get the stream as is, with `data` set to None.
+        For the others the stream is read and decoded as for a regular request.
+        """
+        if self.supports_streaming_unstructured_input():
+            data = None
+            mimetype, charset = _resolve_incoming_unstructured_mimetype(mimetype, charset)
+            kwargs[UnstructuredDtoKeys.STREAM] = stream
+        else:
+            data, mimetype, charset = _resolve_incoming_unstructured_data(
+                stream.read(), mimetype, charset
+            )
+        kwargs[UnstructuredDtoKeys.MIMETYPE] = mimetype
+        if charset is not None:
+            kwargs[UnstructuredDtoKeys.CHARSET] = charset
+        return self.predict_unstructured(data, **kwargs)
+
     def model_info(self):
         model_info = {
             ModelInfoKeys.TARGET_TYPE: self.target_type.value,
@@ -23,6 +23,7 @@ from datarobot_drum.drum.enum import (
     CLASS_LABELS_ARG_KEYWORD,
     TARGET_TYPE_ARG_KEYWORD,
     CustomHooks,
+    StructuredDtoKeys,
     TargetType,
 )
 from datarobot_drum.drum.exceptions import (
@@ -52,6 +53,7 @@ class PythonPredictor(BaseLanguagePredictor):
         self._model_adapter.load_custom_hooks()
 
         super(PythonPredictor, self).configure(params)
+        self._model_adapter.input_dtypes = self._input_dtypes
 
         try:
             self._model = self._model_adapter.load_model_from_artifact(
@@ -83,6 +85,19 @@ class PythonPredictor(BaseLanguagePredictor):
     def has_read_input_data_hook(self):
         return self._model_adapter.has_read_input_data_hook()
 
+    def supports_memory_mapped_input(self):
+        return not self.has_read_input_data_hook()
+
+    def supports_streaming_unstructured_input(self):
+        return self._model_adapter.has_streaming_unstructured_hook()
+
+    def _dataframe_to_kwargs(self, df):
+        # A 'read_input_data' hook expects the raw payload, so only hand over the frame as is
+        # when the data would be read by DRUM anyway.
+        if self.has_read_input_data_hook():
+            return super(PythonPredictor, self)._dataframe_to_kwargs(df)
+        return {StructuredDtoKeys.DATAFRAME: df}
+
     def _predict(self, **kwargs) -> RawPredictResponse:
         kwargs[TARGET_TYPE_ARG_KEYWORD] = self.target_type
         if self.positive_class_label is not None and self.negative_class_label is not None:
@@ -117,6 +132,16 @@ class PythonPredictor(BaseLanguagePredictor):
             completion_create_params, self._model, association_id, **kwargs
         )
 
+    def _is_chat_cacheable(self):
+        # Moderation guards have to run on every request. A chat hook accepting kwargs receives
+        # the request headers, and may answer callers differently, unless those headers are part
+        # of the cache key.
+        if self._model_adapter.has_moderation_pipeline():
+            return False
+        return not self._model_adapter.chat_hook_accepts_kwargs() or bool(
+            self._chat_cache.key_headers
+        )
+
     def _get_supported_llm_models(self):
         return self._model_adapter.get_supported_llm_models(self._model)
 
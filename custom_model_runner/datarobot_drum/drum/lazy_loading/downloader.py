@@ -0,0 +1,342 @@
+#
+#  Copyright 2026 DataRobot, Inc. and its affiliates.
+#
+#  All rights reserved.
+#  This is proprietary source code of DataRobot, Inc. and its affiliates.
+#  Released under the terms of DataRobot Tool and Utility Agreement.
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from pydantic import BaseModel
+
+from datarobot_drum.runtime_parameters.runtime_parameters import RuntimeParameters
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_PART_SIZE_MB = 64
+MAX_PART_ATTEMPTS = 3
+PROGRESS_LOG_INTERVAL_SEC = 10
+
+PARTIAL_FILE_SUFFIX = ".part"
+CHUNK_SIZE = 1024 * 1024
+MB = 1024 * 1024
+
+
+class RemoteObject(BaseModel):
+    size: int
+    etag: str
+
+
+class DownloadState(BaseModel):
+    """The record of a file download, stored next to the file to resume or skip it."""
+
+    remote_path: str
+    etag: str
+    size: int
+    part_size: int
+    completed_parts: List[int] = []
+    complete: bool = False
+
+    def matches(self, remote_path: str, remote_object: RemoteObject) -> bool:
+        return (self.remote_path, self.etag, self.size) == (
+            remote_path,
+            remote_object.etag,
+            remote_object.size,
+        )
+
+
+class S3RemoteFiles:
+    """Reads the objects of an S3 repository, through the client of its `datarobot_storage`."""
+
+    def __init__(self, storage):
+        self._storage = storage
+
+    def head(self, remote_path: str) -> RemoteObject:
+        response = self._storage.client.head_object(
+            Bucket=self._storage.bucket_name, Key=self._storage.get_key_name(remote_path)
+        )
+        return RemoteObject(size=response["ContentLength"], etag=response["ETag"])
+
+    def download_range(
+        self, remote_path: str, etag: str, offset: int, size: int, local_path: str
+    ) -> None:
+        """Write `size` bytes of the object version `etag`, from `offset`, at the same offset."""
+        response = self._storage.client.get_object(
+            Bucket=self._storage.bucket_name,
+            Key=self._storage.get_key_name(remote_path),
+            Range=f"bytes={offset}-{offset + size - 1}",
+            # fails instead of mixing parts of different versions if the object was replaced
+            IfMatch=etag,
+        )
+        with open(local_path, "r+b") as f:
+            f.seek(offset)
+            for chunk in response["Body"].iter_chunks(CHUNK_SIZE):
+                f.write(chunk)
+
+
+def _state_path(local_path: str) -> str:
+    directory, name = os.path.split(local_path)
+    return os.path.join(directory, f".{name}.lazy-loading.json")
+
+
+def _read_state(local_path: str) -> Optional[DownloadState]:
+    try:
+        with open(_state_path(local_path), "r") as f:
+            return DownloadState.model_validate_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(local_path: str, state: DownloadState) -> None:
+    state_path = _state_path(local_path)
+    with open(state_path + ".tmp", "w") as f:
+        f.write(state.model_dump_json())
+    os.replace(state_path + ".tmp", state_path)
+
+
+def _file_size(path: str) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _md5_matches(local_path: str, etag: str) -> bool:
+    # The ETag of an object uploaded in a single part is the MD5 of its content. The ETag of a
+    # multipart upload depends on its part size, so such a file can't be verified.
+    etag = etag.strip('"')
+    if "-" in etag:
+        return False
+    md5 = hashlib.md5()
+    with open(local_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            md5.update(chunk)
+    return md5.hexdigest() == etag
+
+
+class DownloadProgress:
+    def __init__(self, total_files: int):
+        self.total_files = total_files
+        self.completed_files = 0
+        self.skipped_files = 0
+        self.total_bytes = 0
+        self.downloaded_bytes = 0
+        self.started_at = time.monotonic()
+        self._logged_at = self.started_at
+
+    @property
+    def throughput_mb(self) -> float:
+        return self.downloaded_bytes / MB / max(time.monotonic() - self.started_at, 1e-6)
+
+    def add_bytes(self, nbytes: int) -> None:
+        self.downloaded_bytes += nbytes
+        now = time.monotonic()
+        if now - self._logged_at >= PROGRESS_LOG_INTERVAL_SEC:
+            self._logged_at = now
+            logger.info(
+                "Lazy loading progress: %d/%d files, %.1f/%.1f MB, %.1f MB/s",
+                self.completed_files,
+                self.total_files,
+                self.downloaded_bytes / MB,
+                self.total_bytes / MB,
+                self.throughput_mb,
+            )
+
+
+class LazyLoadingDownloader:
+    """
+    Downloads files concurrently, splitting the large ones in ranges of `part_size` bytes, while
+    at most `max_concurrency` requests run at once.
+
+    A file is first written to `<local_path>.part`, and the completed parts are recorded next to
+    it, so an interrupted download resumes where it stopped. Completed files are recorded with the
+    ETag and size of their object, and skipped by the next downloads while they still match it.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        part_size: int = DEFAULT_PART_SIZE_MB * MB,
+    ):
+        self.max_concurrency = max_concurrency
+        self.part_size = part_size
+        self.progress = None
+        self._semaphore = None
+        self._executor = None
+
+    @classmethod
+    def from_runtime_parameters(cls):
+        """
+        The downloader configured by the `DRUM_LAZY_LOADING_MAX_CONCURRENCY` and
+        `DRUM_LAZY_LOADING_PART_SIZE_MB` runtime parameters.
+        """
+        return cls(
+            max_concurrency=RuntimeParameters.get_positive_int(
+                "DRUM_LAZY_LOADING_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY
+            ),
+            part_size=RuntimeParameters.get_positive_int(
+                "DRUM_LAZY_LOADING_PART_SIZE_MB", DEFAULT_PART_SIZE_MB
+            )
+            * MB,
+        )
+
+    async def download_all(self, files: List[Tuple[object, str, str]]) -> DownloadProgress:
+        """Download the (remote files, remote path, local path) entries of `files`."""
+        self.progress = DownloadProgress(len(files))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="lazy-loading"
+        ) as self._executor:
+            await asyncio.gather(
+                *[
+                    self._download_file(remote_files, remote_path, local_path)
+                    for remote_files, remote_path, local_path in files
+                ]
+            )
+        progress = self.progress
+        logger.info(
+            "Lazy loading downloaded %.1f MB in %.1fs (%.1f MB/s), %d of %d files were cached",
+            progress.downloaded_bytes / MB,
+            time.monotonic() - progress.started_at,
+            progress.throughput_mb,
+            progress.skipped_files,
+            progress.total_files,
+        )
+        return progress
+
+    async def _run(self, func, *args):
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _download_file(self, remote_files, remote_path: str, local_path: str) -> None:
+        remote_object = await self._run(remote_files.head, remote_path)
+        self.progress.total_bytes += remote_object.size
+
+        if await self._run(self._is_cached, remote_path, local_path, remote_object):
+            logger.info(
+                "File is already downloaded, skipping it",
+                extra={"remote_path": remote_path, "local_path": local_path},
+            )
+            self.progress.skipped_files += 1
+            self.progress.completed_files += 1
+            return
+
+        started_at = time.monotonic()
+        partial_path = local_path + PARTIAL_FILE_SUFFIX
+        state = self._prepare_partial_file(remote_path, local_path, remote_object)
+        pending_parts = [
+            part
+            for part in range(-(-remote_object.size // self.part_size))
+            if part not in state.completed_parts
+        ]
+        if state.completed_parts:
+            logger.info(
+                "Resuming download, %d of %d parts are already downloaded",
+                len(state.completed_parts),
+                len(state.completed_parts) + len(pending_parts),
+                extra={"remote_path": remote_path, "local_path": local_path},
+            )
+
+        async def download_part(part):
+            offset = part * self.part_size
+            size = min(self.part_size, remote_object.size - offset)
+            await self._download_part(
+                remote_files, remote_path, remote_object, offset, size, partial_path
+            )
+            state.completed_parts.append(part)
+            _write_state(local_path, state)
+            self.progress.add_bytes(size)
+
+        await asyncio.gather(*[download_part(part) for part in pending_parts])
+
+        os.replace(partial_path, local_path)
+        state.complete = True
+        state.completed_parts = []
+        _write_state(local_path, state)
+        self.progress.completed_files += 1
+        duration = time.monotonic() - started_at
+        logger.info(
+            "Downloaded %.1f MB in %.1fs (%.1f MB/s)",
+            remote_object.size / MB,
+            duration,
+            remote_object.size / MB / max(duration, 1e-6),
+            extra={"remote_path": remote_path, "local_path": local_path},
+        )
+
+    async def _download_part(self, remote_files, remote_path, remote_object, offset, size, path):
+        for attempt in range(1, MAX_PART_ATTEMPTS + 1):
+            try:
+                await self._run(
+                    remote_files.download_range, remote_path, remote_object.etag, offset, size, path
+                )
+                return
+            except Exception:
+                if attempt == MAX_PART_ATTEMPTS:
+                    raise
+                logger.warning(
+                    "Failed to download bytes %d-%d, retrying (attempt %d of %d)",
+                    offset,
+                    offset + size - 1,
+                    attempt,
+                    MAX_PART_ATTEMPTS,
+                    extra={"remote_path": remote_path},
+                    exc_info=True,
+                )
+                await asyncio.sleep(2**attempt)
+
+    @staticmethod
+    def _is_cached(remote_path: str, local_path: str, remote_object: RemoteObject) -> bool:
+        if _file_size(local_path) != remote_object.size:
+            return False
+        state = _read_state(local_path)
+        if state is not None and state.complete:
+            return state.matches(remote_path, remote_object)
+        # not downloaded by the lazy loading, e.g. baked in the image, verify its content
+        if not _md5_matches(local_path, remote_object.etag):
+            return False
+        _write_state(
+            local_path,
+            DownloadState(
+                remote_path=remote_path,
+                etag=remote_object.etag,
+                size=remote_object.size,
+                part_size=0,
+                complete=True,
+            ),
+        )
+        return True
+
+    def _prepare_partial_file(
+        self, remote_path: str, local_path: str, remote_object: RemoteObject
+    ) -> DownloadState:
+        partial_path = local_path + PARTIAL_FILE_SUFFIX
+        state = _read_state(local_path)
+        if (
+            state is not None
+            and not state.complete
+            and state.part_size == self.part_size
+            and state.matches(remote_path, remote_object)
+            and _file_size(partial_path) == remote_object.size
+        ):
+            return state
+
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+        with open(partial_path, "wb") as f:
+            f.truncate(remote_object.size)
+        state = DownloadState(
+            remote_path=remote_path,
+            etag=remote_object.etag,
+            size=remote_object.size,
+            part_size=self.part_size,
+        )
+        _write_state(local_path, state)
+        return state
@@ -16,6 +16,8 @@ import yaml
 
 from datarobot_drum.drum.lazy_loading.constants import BackendType
 from datarobot_drum.drum.lazy_loading.constants import LazyLoadingEnvVars
+from datarobot_drum.drum.lazy_loading.downloader import LazyLoadingDownloader
+from datarobot_drum.drum.lazy_loading.downloader import S3RemoteFiles
 from datarobot_drum.drum.lazy_loading.schema import LazyLoadingCommandLineFileContent
 from datarobot_drum.drum.lazy_loading.schema import LazyLoadingData
 from datarobot_drum.drum.lazy_loading.schema import LazyLoadingRepository
@@ -67,31 +69,29 @@ class LazyLoadingHandler:
         logger.info("Lazy loading files have been downloaded")
 
     async def _download_in_parallel(self):
-        repo_backend_storages = {}
+        repo_remote_files = {}
         for repository in self._lazy_loading_data.repositories:
-            storage = self._get_backend_storage(repository)
-            repo_backend_storages[repository.repository_id] = storage
+            remote_files = self._get_remote_files(repository)
+            repo_remote_files[repository.repository_id] = remote_files
 
-        tasks = []  # List to hold the coroutine tasks
+        files = []
         for file in self._lazy_loading_data.files:
-            storage = repo_backend_storages[file.repository_id]
             logger.info(
                 "Add downloading task for remote path", extra={"remote_path": file.remote_path}
             )
-            download_file_coroutine = storage.get(file.remote_path, file.local_path)
-            tasks.append(download_file_coroutine)
-        await asyncio.gather(*tasks)
+            files.append((repo_remote_files[file.repository_id], file.remote_path, file.local_path))
+        await LazyLoadingDownloader.from_runtime_parameters().download_all(files)
 
-    def _get_backend_storage(self, repository: LazyLoadingRepository):
+    def _get_remote_files(self, repository: LazyLoadingRepository):
         credential = self._credentials[repository.credential_id]
         if credential.credential_type == BackendType.S3:
             storage_config = self.build_s3_config(
                 repository, self._credentials[repository.credential_id]
             )
-            from datarobot_storage import get_async_storage
+            from datarobot_storage import get_storage
             from datarobot_storage.enums import FileStorageBackend
 
-            return get_async_storage(FileStorageBackend.S3, storage_config)
+            return S3RemoteFiles(get_storage(FileStorageBackend.S3, storage_config))
         else:
             raise NotImplementedError(f"Unsupported backend type: {credential.credential_type}")
 
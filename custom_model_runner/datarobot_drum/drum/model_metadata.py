@@ -17,6 +17,7 @@ from pydantic import create_model
 from strictyaml import (
     load,
     Map,
+    MapPattern,
     Str,
     Optional,
     Bool,
@@ -409,6 +410,7 @@ MODEL_CONFIG_SCHEMA = Map(
                 Optional("classLabels"): Seq(Str()),
                 Optional("classLabelsFile"): Str(),
                 Optional("predictionThreshold"): Int(),
+                Optional("columnDtypes"): MapPattern(Str(), Str()),
             }
         ),
         Optional(ModelMetadataKeys.TRAINING_MODEL): Map({Optional("trainOnProject"): Str()}),
@@ -0,0 +1,296 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import collections
+import contextlib
+import os
+import re
+import resource
+import sys
+import tracemalloc
+from collections import OrderedDict
+
+from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.drum.resource_monitor import ByteConv
+from datarobot_drum.drum.resource_monitor import ResourceMonitor
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+PROC_SELF_CGROUP = "/proc/self/cgroup"
+TOP_ALLOCATION_SITES = 5
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+PhaseMemory = collections.namedtuple(
+    "PhaseMemory", "peak_bytes exact traced_peak_bytes top_allocations"
+)
+
+# tracker whose phase is running, so code deeper in the stack can open its own phases
+_active_tracker = None
+
+
+def parse_memory_size(value):
+    """Parse a size such as 512m or 4GB into bytes. b, k, m, g and t suffixes are supported."""
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)b?\s*$", str(value).lower())
+    if match is None:
+        raise ValueError("Invalid memory size: {}".format(value))
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+class _CgroupPeak(object):
+    """High-water mark of the memory charged to a cgroup, i.e. to all processes of the container."""
+
+    def __init__(self, name, path, reset_value):
+        self.name = name
+        self._path = path
+        self._reset_value = reset_value
+        self._fd = None
+
+    def reset(self):
+        # cgroup v2 resets the peak seen through the written file descriptor (Linux 6.12+),
+        # cgroup v1 resets it for every reader and needs write access to the file.
+        try:
+            if self._fd is None:
+                self._fd = os.open(self._path, os.O_RDWR)
+            os.write(self._fd, self._reset_value)
+            return True
+        except OSError:
+            return False
+
+    def read(self):
+        if self._fd is not None:
+            return int(os.pread(self._fd, 64, 0))
+        with open(self._path) as f:
+            return int(f.read())
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class _RusagePeak(object):
+    """Peak resident set size of this process plus the largest one of its finished children."""
+
+    name = "rusage"
+
+    def reset(self):
+        return False
+
+    def read(self):
+        # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+        unit = 1 if sys.platform == "darwin" else 1024
+        return unit * (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        )
+
+    def close(self):
+        pass
+
+
+def _cgroup_peak_source(cgroup_root=CGROUP_ROOT, proc_cgroup=PROC_SELF_CGROUP):
+    # Outside of a container, the cgroup is the one of the whole machine or of the user session,
+    # shared with unrelated processes.
+    if not ResourceMonitor._run_inside_docker():
+        return None
+
+    try:
+        with open(proc_cgroup) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    v1_path = v2_path = None
+    for line in lines:
+        hierarchy, controllers, path = line.split(":", 2)
+        if hierarchy == "0" and not controllers:
+            v2_path = path
+        elif "memory" in controllers.split(","):
+            v1_path = path
+
+    if v1_path is not None:
+        name, mount, path, filename, reset_value = (
+            "cgroup v1",
+            os.path.join(cgroup_root, "memory"),
+            v1_path,
+            "memory.max_usage_in_bytes",
+            b"0",
+        )
+    elif v2_path is not None:
+        name, mount, path, filename, reset_value = (
+            "cgroup v2",
+            cgroup_root,
+            v2_path,
+            "memory.peak",
+            b"reset\n",
+        )
+    else:
+        return None
+
+    # the container cgroup is usually mounted at the root, whatever its path on the host is
+    candidates = []
+    if path != "/":
+        candidates.append(os.path.join(mount, path.lstrip("/")))
+    candidates.append(mount)
+    for directory in candidates:
+        if os.path.exists(os.path.join(directory, filename)):
+            return _CgroupPeak(name, os.path.join(directory, filename), reset_value)
+    return None
+
+
+class _RunningPhase(object):
+    def __init__(self, name):
+        self.name = name
+        self.peak = 0
+        self.exact = True
+        self.traced_peak = None
+
+
+class PeakMemoryTracker(object):
+    """
+    Peak memory of the phases of a run, e.g. loading the data, fitting and serializing a model.
+
+    The peak is read from the cgroup of the container (memory.peak with cgroup v2,
+    memory.max_usage_in_bytes with cgroup v1), which also accounts for child processes and
+    native allocations. Without a cgroup, the peak RSS of this process and its children is used.
+    When the peak cannot be reset between phases, a phase reports the peak of the whole run
+    until its end, and is marked as not exact.
+
+    With `trace_allocations`, Python allocations are also traced with tracemalloc, to report
+    the lines of code that allocated the most memory in every phase. Tracing slows the run down.
+
+    Phases can be nested: the outer phase is paused while the inner one runs.
+    When `max_memory` (bytes) is set, a phase which used more fails with DrumCommonException.
+    """
+
+    def __init__(self, max_memory=None, trace_allocations=False):
+        self.max_memory = max_memory
+        self.trace_allocations = trace_allocations
+        self.phases = OrderedDict()
+        self._source = _cgroup_peak_source() or _RusagePeak()
+        # running phases, innermost last
+        self._running = []
+
+    @property
+    def source(self):
+        return self._source.name
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        global _active_tracker
+
+        if self._running:
+            self._pause(self._running[-1])
+        elif self.trace_allocations:
+            tracemalloc.start()
+        running = _RunningPhase(name)
+        self._running.append(running)
+        self._resume(running)
+        start_snapshot = tracemalloc.take_snapshot() if self.trace_allocations else None
+        previous_tracker, _active_tracker = _active_tracker, self
+        try:
+            yield
+            self._pause(running)
+            top_allocations = None
+            if self.trace_allocations:
+                top_allocations = [
+                    str(stat)
+                    for stat in tracemalloc.take_snapshot().compare_to(start_snapshot, "lineno")[
+                        :TOP_ALLOCATION_SITES
+                    ]
+                ]
+            self.phases[name] = PhaseMemory(
+                running.peak, running.exact, running.traced_peak, top_allocations
+            )
+        finally:
+            _active_tracker = previous_tracker
+            self._running.pop()
+            if self._running:
+                self._resume(self._running[-1])
+            elif self.trace_allocations:
+                tracemalloc.stop()
+        self._check_max_memory(name)
+
+    def _resume(self, running):
+        running.exact = self._source.reset() and running.exact
+        # tracemalloc.reset_peak is only available with Python 3.9+
+        if self.trace_allocations and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def _pause(self, running):
+        running.peak = max(running.peak, self._source.read())
+        if self.trace_allocations:
+            running.traced_peak = max(running.traced_peak or 0, tracemalloc.get_traced_memory()[1])
+
+    def _check_max_memory(self, name):
+        peak = self.phases[name].peak_bytes
+        if self.max_memory is None or peak <= self.max_memory:
+            return
+        raise DrumCommonException(
+            "The '{}' phase used {:.0f}MB of memory ({}), which is more than the {:.0f}MB "
+            "allowed by --max-memory. Fit on fewer rows (--num-rows), shrink the data "
+            "(--downcast-dtypes) or raise the limit.".format(
+                name,
+                ByteConv.from_bytes(peak).mbytes,
+                self.source,
+                ByteConv.from_bytes(self.max_memory).mbytes,
+            )
+        )
+
+    def peak_mbytes(self, *names):
+        """Highest peak of the given recorded phases in MB, None if none of them was recorded."""
+        peaks = [self.phases[name].peak_bytes for name in names if name in self.phases]
+        return ByteConv.from_bytes(max(peaks)).mbytes if peaks else None
+
+    def report(self):
+        return OrderedDict(
+            (
+                name,
+                OrderedDict(
+                    [
+                        ("peak_mb", ByteConv.from_bytes(phase.peak_bytes).mbytes),
+                        ("exact", phase.exact),
+                        (
+                            "traced_peak_mb",
+                            None
+                            if phase.traced_peak_bytes is None
+                            else ByteConv.from_bytes(phase.traced_peak_bytes).mbytes,
+                        ),
+                        ("top_allocations", phase.top_allocations),
+                    ]
+                ),
+            )
+            for name, phase in self.phases.items()
+        )
+
+    def format_report(self):
+        lines = ["Peak memory usage ({}):".format(self.source)]
+        for name, phase in self.phases.items():
+            line = "  {}: {}MB{}".format(
+                name,
+                int(ByteConv.from_bytes(phase.peak_bytes).mbytes),
+                "" if phase.exact else " (peak of the run so far)",
+            )
+            if phase.traced_peak_bytes is not None:
+                line += ", {}MB traced".format(
+                    int(ByteConv.from_bytes(phase.traced_peak_bytes).mbytes)
+                )
+            lines.append(line)
+            lines.extend("    {}".format(site) for site in phase.top_allocations or [])
+        return "\n".join(lines)
+
+    def close(self):
+        self._source.close()
+
+
+def memory_phase(name):
+    """
+    Context manager measuring a phase with the tracker of the running phase, if there is one.
+    Lets code deeper in the stack (e.g. model serialization) report its own phase.
+    """
+    if _active_tracker is None:
+        return contextlib.nullcontext()
+    return _active_tracker.phase(name)
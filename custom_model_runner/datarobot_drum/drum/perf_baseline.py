@@ -0,0 +1,132 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import json
+from collections import OrderedDict
+
+import numpy as np
+from texttable import Texttable
+
+BASELINE_FORMAT_VERSION = 1
+BOOTSTRAP_RESAMPLES = 1000
+CONFIDENCE_LEVEL = 95
+
+# metric name -> whether higher values are better
+BASELINE_METRICS = OrderedDict(
+    [("throughput", True), ("p50", False), ("p99", False), ("memory_mb", False)]
+)
+
+
+def _memory_mb(res):
+    if res.server_rss_mb is not None:
+        return res.server_rss_mb
+    server_stats = json.loads(res.server_stats) if res.server_stats else {}
+    mem_info = server_stats.get("mem_info", {})
+    return mem_info.get("drum_rss", mem_info.get("container_used"))
+
+
+def _trial_metrics(res):
+    latency = res.histogram.to_dict()
+    return {
+        "throughput": res.throughput,
+        "p50": latency["p50"],
+        "p99": latency["p99"],
+        "memory_mb": _memory_mb(res),
+    }
+
+
+def summarize_trials(values):
+    """
+    Median of the trials and a bootstrap confidence interval of the median. A single trial
+    gives an empty interval, so only the tolerance applies to it.
+    """
+    values = np.asarray(values, dtype=float)
+    median = float(np.median(values))
+    if len(values) < 2:
+        return {"median": median, "ci": [median, median], "trials": values.tolist()}
+
+    # fixed seed, so the same trials always give the same interval
+    resamples = np.random.RandomState(0).choice(values, (BOOTSTRAP_RESAMPLES, len(values)))
+    tail = (100 - CONFIDENCE_LEVEL) / 2.0
+    low, high = np.percentile(np.median(resamples, axis=1), [tail, 100 - tail])
+    return {"median": median, "ci": [float(low), float(high)], "trials": values.tolist()}
+
+
+def make_baseline(results):
+    """Summarize the metrics of successful test case results, grouped by test case name."""
+    trials = OrderedDict()
+    for res in results:
+        if not res.prediction_ok:
+            continue
+        for metric, value in _trial_metrics(res).items():
+            if value is not None:
+                trials.setdefault(res.name, OrderedDict()).setdefault(metric, []).append(value)
+
+    return {
+        "version": BASELINE_FORMAT_VERSION,
+        "test_cases": OrderedDict(
+            (name, OrderedDict((metric, summarize_trials(values)) for metric, values in m.items()))
+            for name, m in trials.items()
+        ),
+    }
+
+
+def compare_to_baseline(baseline, current, tolerance):
+    """
+    Compare two baselines made by `make_baseline`. A metric regresses when its median is worse
+    than the baseline one by more than `tolerance` (a fraction) and the confidence intervals
+    of both runs do not overlap, so trial to trial noise is not reported.
+
+    Returns the comparison rows: (test case, metric, baseline, current, change, regressed).
+    """
+    rows = []
+    for name, metrics in current["test_cases"].items():
+        baseline_metrics = baseline["test_cases"].get(name, {})
+        for metric, higher_is_better in BASELINE_METRICS.items():
+            if metric not in metrics or metric not in baseline_metrics:
+                continue
+            base, cur = baseline_metrics[metric], metrics[metric]
+            if base["median"] == 0:
+                continue
+            change = (cur["median"] - base["median"]) / base["median"]
+            if higher_is_better:
+                regressed = -change > tolerance and cur["ci"][1] < base["ci"][0]
+            else:
+                regressed = change > tolerance and cur["ci"][0] > base["ci"][1]
+            rows.append((name, metric, base["median"], cur["median"], change, regressed))
+    return rows
+
+
+def format_comparison(rows):
+    table = Texttable()
+    table.set_deco(Texttable.HEADER)
+    table.set_cols_dtype(["t", "t", "a", "a", "t", "t"])
+    table.set_cols_align(["l", "l", "r", "r", "r", "l"])
+    table.add_rows(
+        [["size", "metric", "baseline", "current", "change", "status"]]
+        + [
+            [
+                name,
+                metric,
+                base,
+                cur,
+                "{:+.1f}%".format(change * 100),
+                "REGRESSION" if bad else "ok",
+            ]
+            for name, metric, base, cur, change, bad in rows
+        ]
+    )
+    return table.draw()
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(baseline, path):
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
@@ -6,8 +6,12 @@ Released under the terms of DataRobot Tool and Utility Agreement.
 """
 import collections
 import json
+import multiprocessing
 import os
 import select
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from multiprocessing.util import Finalize
 
 import psutil
 import pandas as pd
@@ -25,13 +29,14 @@ from texttable import Texttable
 from tempfile import mkdtemp, mkstemp
 
 from datarobot_drum.drum.utils.structured_input_read_utils import StructuredInputReadUtils
-from datarobot_drum.profiler.stats_collector import StatsCollector, StatsOperation
+from datarobot_drum.profiler.latency_histogram import LatencyHistogram
 from datarobot_drum.drum.exceptions import (
     DrumCommonException,
     DrumPerfTestTimeout,
     DrumPredException,
     DrumSchemaValidationException,
 )
+from datarobot_drum.drum.utils.dataframe import is_sparse_dataframe
 from datarobot_drum.drum.utils.drum_utils import DrumUtils
 
 from datarobot_drum.drum.enum import (
@@ -43,6 +48,13 @@ from datarobot_drum.drum.enum import (
     TargetType,
     InputFormatExtension,
 )
+from datarobot_drum.drum.perf_baseline import (
+    compare_to_baseline,
+    format_comparison,
+    load_baseline,
+    make_baseline,
+    save_baseline,
+)
 from datarobot_drum.drum.root_predictors.drum_server_utils import DrumServerRun
 from datarobot_drum.drum.root_predictors.transform_helpers import (
     read_csv_payload,
@@ -101,15 +113,94 @@ def _kill_drum_perf_test_server_process(pid, verbose=False):
 PerfTestCase = collections.namedtuple("PerfTestCase", "name samples iterations")
 
 
+def _load_score_predictor(score_args):
+    """Load the model in this process, as `drum score` with the given arguments would."""
+    # imported here, as drum.py imports this module
+    from datarobot_drum.drum.drum import CMRunner
+    from datarobot_drum.drum.root_predictors.generic_predictor import GenericPredictorComponent
+    from datarobot_drum.drum.runtime import DrumRuntime
+    from datarobot_drum.drum.utils.setup import setup_options
+
+    runtime = DrumRuntime()
+    runtime.options = setup_options(score_args)
+    return GenericPredictorComponent(CMRunner(runtime).get_predictor_params())
+
+
+def _score_with_null_column(predictor, target_type, df, column_name):
+    """
+    Score the data with one column set to missing.
+    Returns the error message if scoring failed, None otherwise.
+    """
+    df_tmp = df.copy()
+    # NaN, as reading the column back from a CSV file would give
+    df_tmp[column_name] = np.nan
+    try:
+        if target_type == TargetType.TRANSFORM:
+            predictor.transform_dataframe(df_tmp)
+        else:
+            predictor.predict_dataframe(df_tmp)
+    except Exception as e:
+        return "{}: {}".format(type(e).__name__, e)
+    return None
+
+
+# state of a null value imputation check worker process: the model is loaded once per worker
+_null_value_check_worker = {}
+
+
+def _init_null_value_check_worker(score_args, target_type, df):
+    component = _load_score_predictor(score_args)
+    # terminate the predictor (e.g. the MLOps spool and threads) when the worker exits
+    Finalize(None, component.terminate, exitpriority=10)
+    _null_value_check_worker.update(component=component, target_type=target_type, df=df)
+
+
+def _run_null_value_check_in_worker(column_name):
+    return _score_with_null_column(
+        _null_value_check_worker["component"].predictor,
+        _null_value_check_worker["target_type"],
+        _null_value_check_worker["df"],
+        column_name,
+    )
+
+
 class TestCaseResults:
-    def __init__(self, name, iterations, samples, stats_obj):
+    def __init__(self, name, iterations, samples, histogram):
         self.name = name
         self.iterations = iterations
         self.samples = samples
-        self.stats_obj = stats_obj
+        self.histogram = histogram
+        self.trial = None
         self.prediction_ok = False
         self.prediction_error = None
         self.server_stats = None
+        self.elapsed = None
+        self.server_cpu_percent = None
+        self.server_rss_mb = None
+
+    @property
+    def throughput(self):
+        if not self.elapsed or not self.histogram.count:
+            return None
+        return self.histogram.count / self.elapsed
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trial": self.trial,
+            "samples": self.samples,
+            "iterations": self.iterations,
+            "ok": self.prediction_ok,
+            "error": self.prediction_error,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "latency": self.histogram.to_dict(),
+            "server": {
+                "cpu_percent": self.server_cpu_percent,
+                "rss_mb": self.server_rss_mb,
+                "stats": json.loads(self.server_stats) if self.server_stats else None,
+            },
+        }
 
 
 class PerfTestResultsFormatter:
@@ -127,9 +218,22 @@ class PerfTestResultsFormatter:
     def _init_table(self):
         self._table = Texttable()
         self._table.set_deco(Texttable.HEADER)
-        header_names = ["size", "samples", "iters", "min", "avg", "max", "total (s)"]
-        header_types = ["t", "i", "i", "f", "f", "f", "f"]
-        col_allign = ["l", "r", "r", "r", "r", "r", "r"]
+        header_names = [
+            "size",
+            "samples",
+            "iters",
+            "min",
+            "avg",
+            "p50",
+            "p90",
+            "p99",
+            "p99.9",
+            "max",
+            "req/s",
+            "total (s)",
+        ]
+        header_types = ["t", "i", "i"] + ["f"] * 9
+        col_allign = ["l"] + ["r"] * 11
 
         if self._show_mem:
             if self._in_docker:
@@ -204,15 +308,17 @@ class PerfTestResultsFormatter:
         self._init_table()
 
         for res in self._results:
-            row = [res.name, res.samples, res.iterations]
+            name = res.name if res.trial is None else "{} #{}".format(res.name, res.trial)
+            row = [name, res.samples, res.iterations]
 
             server_stats = None
             if res.prediction_ok:
-                d = res.stats_obj.dict_report(CMRunTests.REPORT_NAME)
-                row.extend([d["min"], d["avg"], d["max"], d["total"]])
+                d = res.histogram.to_dict()
+                row.extend([d["min"], d["mean"], d["p50"], d["p90"], d["p99"], d["p99.9"]])
+                row.extend([d["max"], res.throughput, res.elapsed])
                 server_stats = json.loads(res.server_stats) if res.server_stats else None
             else:
-                row.extend(self._same_value_list(CMRunTests.TEST_CASE_FAIL_VALUE, 4))
+                row.extend(self._same_value_list(CMRunTests.TEST_CASE_FAIL_VALUE, 9))
 
             if self._show_mem:
                 self._add_mem_info(row, server_stats)
@@ -228,7 +334,6 @@ class PerfTestResultsFormatter:
 
 
 class CMRunTests:
-    REPORT_NAME = "Request time (s)"
     NA_VALUE = "NA"
     TEST_CASE_FAIL_VALUE = "Fail"
 
@@ -249,9 +354,11 @@ class CMRunTests:
         self._server_port = DrumUtils.find_free_port()
         self._url_server_address = "http://{}:{}".format(self._server_addr, self._server_port)
         self._predict_endpoint = "/predict/"
-        self._stats_endpoint = "/stats/"
+        # the memory is read right after each test case, not from the last background sample
+        self._stats_endpoint = "/stats/?refresh=1"
         self._timeout = 60
         self._server_process = None
+        self._thread_local = threading.local()
 
         self._df_for_test = None
         self._test_cases_to_run = None
@@ -411,7 +518,70 @@ class CMRunTests:
         _kill_drum_perf_test_server_process(self._server_process.pid)
         os.system("tput init")
 
-    def _run_test_case(self, tc, results):
+    def _post_prediction(self, url, files, intended_start=None):
+        # one session per load generator thread, so connections are kept alive between requests
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = self._thread_local.session = requests.Session()
+
+        if intended_start is not None:
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        # At a constant rate the latency is measured from the time the request was scheduled,
+        # so the time it waited for a free client is not hidden (coordinated omission).
+        start = time.perf_counter() if intended_start is None else intended_start
+        response = session.post(url, files=files)
+        return time.perf_counter() - start, response
+
+    def _check_prediction_response(self, response, expected_nrows, tc_results):
+        if response.ok:
+            tc_results.prediction_ok = True
+        else:
+            tc_results.prediction_ok = False
+            tc_results.prediction_error = response.text
+            if self._verbose:
+                print("Failed sending prediction request to server: {}".format(response.text))
+            return False
+
+        actual_num_predictions = len(json.loads(response.text)["predictions"])
+        if actual_num_predictions != expected_nrows:
+            print(
+                "Failed, number of predictions in response: {} is not as expected: {}".format(
+                    actual_num_predictions, expected_nrows
+                )
+            )
+            # TODO: do not throw exception here.. all should be in the tc_results.
+            assert actual_num_predictions == expected_nrows
+        return True
+
+    def _server_processes(self):
+        # In docker mode the local process is the docker client, not the server
+        if self.options.docker or self._server_process is None:
+            return []
+        try:
+            proc = psutil.Process(self._server_process.pid)
+            return [proc] + proc.children(recursive=True)
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            return []
+
+    def _server_resource_usage(self):
+        """CPU time (s) and RSS (MB) of the server process tree, None if it can't be measured."""
+        processes = self._server_processes()
+        if not processes:
+            return None, None
+        cpu_time = 0.0
+        rss = 0
+        for proc in processes:
+            try:
+                cpu_times = proc.cpu_times()
+                cpu_time += cpu_times.user + cpu_times.system
+                rss += proc.memory_info().rss
+            except (psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue
+        return cpu_time, rss / 1048576
+
+    def _run_test_case(self, tc, results, trial=None):
         print(
             "Running test case: {} - {} samples, {} iterations".format(
                 tc.name, tc.samples, tc.iterations
@@ -419,49 +589,60 @@ class CMRunTests:
         )
         samples = tc.samples
         name = tc.name if tc.name is not None else "Test case"
-        sc = StatsCollector()
-        sc.register_report(CMRunTests.REPORT_NAME, "end", StatsOperation.SUB, "start")
         tc_results = TestCaseResults(
-            name=name, iterations=tc.iterations, samples=samples, stats_obj=sc
+            name=name, iterations=tc.iterations, samples=samples, histogram=LatencyHistogram()
         )
+        tc_results.trial = trial
         results.append(tc_results)
 
         test_df = _get_samples_df(self._df_for_test, samples)
         test_df_nrows = test_df.shape[0]
         df_csv = test_df.to_csv(index=False)
-
-        bar = Bar("Processing", max=tc.iterations)
-        for i in range(tc.iterations):
-            sc.enable()
-            sc.mark("start")
-
-            # TODO: add try catch so no failures..
-            response = requests.post(
-                self._url_server_address + self._predict_endpoint, files={"X": df_csv}
-            )
-
-            sc.mark("end")
-            if response.ok:
-                tc_results.prediction_ok = True
-            else:
-                tc_results.prediction_ok = False
-                tc_results.prediction_error = response.text
-                if self._verbose:
-                    print("Failed sending prediction request to server: {}".format(response.text))
-                return
-
-            actual_num_predictions = len(json.loads(response.text)["predictions"])
-            if actual_num_predictions != test_df_nrows:
-                print(
-                    "Failed, number of predictions in response: {} is not as expected: {}".format(
-                        actual_num_predictions, test_df_nrows
-                    )
+        url = self._url_server_address + self._predict_endpoint
+        files = {"X": df_csv}
+        rate = self.options.rate
+
+        # Closed loop: each of the `concurrency` clients sends its next request when the previous
+        # one is answered. Open loop (--rate): requests are scheduled at a constant rate.
+        executor = ThreadPoolExecutor(max_workers=self.options.concurrency)
+        futures = []
+        try:
+            warmup = [
+                executor.submit(self._post_prediction, url, files)
+                for _ in range(self.options.warmup)
+            ]
+            for future in warmup:
+                _, response = future.result()
+                if not self._check_prediction_response(response, test_df_nrows, tc_results):
+                    return
+
+            cpu_time_start, _ = self._server_resource_usage()
+            start = time.perf_counter()
+            futures = [
+                executor.submit(
+                    self._post_prediction, url, files, None if rate is None else start + i / rate
+                )
+                for i in range(tc.iterations)
+            ]
+            bar = Bar("Processing", max=tc.iterations)
+            for future in as_completed(futures):
+                latency, response = future.result()
+                if not self._check_prediction_response(response, test_df_nrows, tc_results):
+                    return
+                tc_results.histogram.record(latency)
+                bar.next()
+            bar.finish()
+            tc_results.elapsed = time.perf_counter() - start
+
+            cpu_time_end, tc_results.server_rss_mb = self._server_resource_usage()
+            if cpu_time_start is not None and cpu_time_end is not None:
+                tc_results.server_cpu_percent = (
+                    100 * (cpu_time_end - cpu_time_start) / tc_results.elapsed
                 )
-                # TODO: do not throw exception here.. all should be in the tc_results.
-                assert actual_num_predictions == test_df_nrows
-            sc.disable()
-            bar.next()
-        bar.finish()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
 
         # TODO: even if prediction request fail we should try and get server stats
         response = requests.get(self._url_server_address + self._stats_endpoint)
@@ -471,15 +652,21 @@ class CMRunTests:
 
     def _run_all_test_cases(self):
         results = []
-        for tc in self._test_cases_to_run:
-            print("Running test case with timeout: {}".format(self.options.timeout))
-            signal.alarm(self.options.timeout)
-            try:
-                self._run_test_case(tc, results)
-            except DrumPerfTestTimeout:
-                print("... timed out ({}s)".format(self.options.timeout))
-            except Exception as e:
-                print("\ntest case failed with a message: {}".format(e))
+        trials = self.options.trials
+        # Every trial runs all the test cases, so a slow period of the machine does not skew
+        # the results of a single request size.
+        for trial in range(1, trials + 1):
+            if trials > 1:
+                print("Trial {}/{}".format(trial, trials))
+            for tc in self._test_cases_to_run:
+                print("Running test case with timeout: {}".format(self.options.timeout))
+                signal.alarm(self.options.timeout)
+                try:
+                    self._run_test_case(tc, results, trial if trials > 1 else None)
+                except DrumPerfTestTimeout:
+                    print("... timed out ({}s)".format(self.options.timeout))
+                except Exception as e:
+                    print("\ntest case failed with a message: {}".format(e))
         return results
 
     def _init_signals(self):
@@ -504,6 +691,9 @@ class CMRunTests:
         print("Model:      {}".format(self.options.code_dir))
         print("Data:       {}".format(self._input_csv))
         print("# Features: {}".format(len(self._input_df.columns)))
+        print("Clients:    {}".format(self.options.concurrency))
+        if self.options.rate is not None:
+            print("Rate:       {} requests/s".format(self.options.rate))
         sys.stdout.flush()
 
     def performance_test(self):
@@ -530,8 +720,54 @@ class CMRunTests:
         ).get_tbl_str()
 
         print("\n" + str_report)
+
+        if self.options.json_output:
+            with open(self.options.json_output, "w") as f:
+                json.dump(self._make_json_report(results), f, indent=2)
+            print("JSON report saved to: {}".format(self.options.json_output))
+
+        if self.options.baseline:
+            self._check_baseline(results)
         return
 
+    def _check_baseline(self, results):
+        """
+        Save the results as the baseline when there is none yet (or with --update-baseline),
+        otherwise compare them with it and fail if the performance regressed.
+        """
+        path = self.options.baseline
+        current = make_baseline(results)
+        if self.options.update_baseline or not os.path.exists(path):
+            save_baseline(current, path)
+            print("Baseline saved to: {}".format(path))
+            return
+
+        baseline = load_baseline(path)
+        rows = compare_to_baseline(baseline, current, self.options.baseline_tolerance / 100.0)
+        print("\nComparison with baseline: {}\n{}".format(path, format_comparison(rows)))
+
+        failed = [name for name in baseline["test_cases"] if name not in current["test_cases"]]
+        regressed = ["{} {}".format(name, metric) for name, metric, *_, bad in rows if bad]
+        if failed or regressed:
+            error_message = "Performance regressed from the baseline {} (tolerance {}%): {}".format(
+                path,
+                self.options.baseline_tolerance,
+                ", ".join(regressed + ["{} failed".format(name) for name in failed]),
+            )
+            print(error_message)
+            raise DrumCommonException(error_message)
+
+    def _make_json_report(self, results):
+        return {
+            "model": self.options.code_dir,
+            "input": self._input_csv,
+            "concurrency": self.options.concurrency,
+            "rate": self.options.rate,
+            "warmup": self.options.warmup,
+            "trials": self.options.trials,
+            "test_cases": [res.to_dict() for res in results],
+        }
+
     def _basic_batch_prediction_check(self):
         test_name = "Basic batch prediction"
         test_passed = True
@@ -572,25 +808,40 @@ class CMRunTests:
         df = pd.read_csv(self._input_csv)
         column_names = list(df.iloc[[0]])
 
+        def _dataset_path(i):
+            return os.path.join(null_datasets_dir, "null_value_imputation_column{}".format(i))
+
         results = {}
-        for i, column_name in enumerate(column_names):
-            output_filename = os.path.join(null_datasets_dir, "output{}".format(i))
-            tmp_dataset_file_path = os.path.join(
-                null_datasets_dir, "null_value_imputation_column{}".format(i)
-            )
-            df_tmp = df.copy()
-            df_tmp[column_name] = None
-            df_tmp.to_csv(tmp_dataset_file_path, index=False)
-            DrumUtils.replace_cmd_argument_value(
-                cmd_list, ArgumentsOptions.INPUT, tmp_dataset_file_path
-            )
-            DrumUtils.replace_cmd_argument_value(cmd_list, ArgumentsOptions.OUTPUT, output_filename)
+        if self.options.docker or self.target_type == TargetType.UNSTRUCTURED:
+            # The model can only be loaded in its container, or scored by `drum score` on a file
+            for i, column_name in enumerate(column_names):
+                output_filename = os.path.join(null_datasets_dir, "output{}".format(i))
+                tmp_dataset_file_path = _dataset_path(i)
+                df_tmp = df.copy()
+                df_tmp[column_name] = None
+                df_tmp.to_csv(tmp_dataset_file_path, index=False)
+                DrumUtils.replace_cmd_argument_value(
+                    cmd_list, ArgumentsOptions.INPUT, tmp_dataset_file_path
+                )
+                DrumUtils.replace_cmd_argument_value(
+                    cmd_list, ArgumentsOptions.OUTPUT, output_filename
+                )
 
-            p = subprocess.Popen(cmd_list, env=os.environ)
-            retcode = p.wait()
-            if retcode != 0:
-                test_passed = False
-                results[column_name] = ValidationTestResult(tmp_dataset_file_path, retcode, "")
+                p = subprocess.Popen(cmd_list, env=os.environ)
+                retcode = p.wait()
+                if retcode != 0:
+                    test_passed = False
+                    results[column_name] = ValidationTestResult(tmp_dataset_file_path, retcode, "")
+        else:
+            messages = self._run_null_value_checks_in_process(cmd_list[1:], df, column_names)
+            for i, column_name in enumerate(column_names):
+                if messages[i] is not None:
+                    test_passed = False
+                    # the dataset is only saved for failed features, to reproduce the failure
+                    df_tmp = df.copy()
+                    df_tmp[column_name] = None
+                    df_tmp.to_csv(_dataset_path(i), index=False)
+                    results[column_name] = ValidationTestResult(_dataset_path(i), 1, messages[i])
 
         # process results
         if test_passed:
@@ -628,11 +879,46 @@ class CMRunTests:
 
         return test_name, test_passed, failure_message
 
+    def _run_null_value_checks_in_process(self, score_args, df, column_names):
+        """
+        Score every null value imputation variant of the data with the model loaded once,
+        instead of a `drum score` run per feature. With several --validation-workers, the
+        variants are scored by a pool of forked processes, each loading the model once.
+        Returns the error message of every variant, None for the variants scored successfully.
+        """
+        workers = min(self.options.validation_workers, len(column_names))
+        if workers > 1:
+            # The pool is forked before any model is loaded, so the model's own threads and
+            # connections (e.g. the JVM gateway) are never shared between processes.
+            pool = multiprocessing.get_context("fork").Pool(
+                workers,
+                initializer=_init_null_value_check_worker,
+                initargs=(score_args, self.target_type, df),
+            )
+            try:
+                return pool.map(_run_null_value_check_in_worker, column_names)
+            finally:
+                # The workers exit on their own, instead of being killed by terminate(), so
+                # their finalizers terminate the predictors.
+                pool.close()
+                pool.join()
+
+        component = _load_score_predictor(score_args)
+        try:
+            return [
+                _score_with_null_column(component.predictor, self.target_type, df, column_name)
+                for column_name in column_names
+            ]
+        finally:
+            component.terminate()
+
     def validation_test(self):
         # TODO: create infrastructure to easily add more checks
 
         cmd_list = sys.argv
         cmd_list[1] = ArgumentsOptions.SCORE
+        # validation only options, unknown to `drum score`
+        DrumUtils.delete_cmd_argument(cmd_list, ArgumentsOptions.VALIDATION_WORKERS)
 
         if ArgumentsOptions.OUTPUT not in cmd_list:
             cmd_list.extend(
@@ -783,6 +1069,27 @@ class CMRunTests:
                 preds_full_subset, preds_sample, data_subset, is_sparse=is_sparse
             )
 
+    def check_prediction_side_effects_in_process(self, predictor, df):
+        """
+        Run the checks of `check_prediction_side_effects` on a predictor loaded in this process,
+        with the already parsed input data, instead of a prediction server reading the input
+        file again.
+        """
+        df = df.reset_index(drop=True)
+        samplesize = min(len(df), 1000, max(int(len(df) * 0.1), 10))
+        data_subset = df.sample(n=samplesize, random_state=42)
+
+        preds_full = predictor.predict_dataframe(df, with_extra_model_output=False)
+        preds_sample = predictor.predict_dataframe(data_subset, with_extra_model_output=False)
+
+        preds_full_subset = preds_full.iloc[data_subset.index]
+
+        self._schema_validator.validate_outputs(preds_sample)
+
+        self.compare_predictions(
+            preds_full_subset, preds_sample, data_subset, is_sparse=is_sparse_dataframe(df)
+        )
+
     @staticmethod
     def compare_predictions(
         preds_full_subset: pd.DataFrame,
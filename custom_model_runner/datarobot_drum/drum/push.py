@@ -182,7 +182,12 @@ def _setup_training_validation(config, options):
     options.row_weights = None
     options.row_weights_csv = None
     options.num_rows = "ALL"
+    options.downcast_dtypes = False
+    options.max_memory = None
+    options.trace_memory = False
     options.skip_predict = False
+    options.predict_in_subprocess = False
+    options.predict_sample_rows = None
     options.sparse_column_file = None
     options.parameter_file = None
 
@@ -4,24 +4,151 @@ All rights reserved.
 This is proprietary source code of DataRobot, Inc. and its affiliates.
 Released under the terms of DataRobot Tool and Utility Agreement.
 """
+import collections
+import logging
 import os
+import threading
+import time
+
 import psutil
 
 from datarobot_drum.drum.enum import ArgumentsOptions
-import collections
+from datarobot_drum.drum.enum import LOGGER_NAME_PREFIX
+from datarobot_drum.runtime_parameters.runtime_parameters import RuntimeParameters
+
+logger = logging.getLogger(LOGGER_NAME_PREFIX + "." + __name__)
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+DEFAULT_SAMPLING_INTERVAL_SEC = 5
+DEFAULT_SAMPLES = 12
 
 MemoryInfo = collections.namedtuple(
     "MemoryInfo",
     "total avail free drum_rss container_limit container_max_used container_used",
 )
 
+ResourceSample = collections.namedtuple("ResourceSample", "cpu_percent memory_mb memory_pressure")
+
+
+def _read_file(path):
+    with open(path) as f:
+        return f.read()
+
+
+class _CgroupV2(object):
+    """Resource usage of all the processes of the container, with cgroup v2."""
+
+    name = "v2"
+
+    def __init__(self, path):
+        self._path = path
+
+    def _read(self, filename):
+        return _read_file(os.path.join(self._path, filename))
+
+    def memory(self):
+        """(limit, max used, used) bytes, the limit is None when the memory is not limited."""
+        limit = self._read("memory.max").strip()
+        try:
+            max_used = int(self._read("memory.peak"))
+        except OSError:
+            # memory.peak is available since Linux 5.19
+            max_used = None
+        used = int(self._read("memory.current"))
+        return None if limit == "max" else int(limit), max_used, used
+
+    def cpu_usage_sec(self):
+        for line in self._read("cpu.stat").splitlines():
+            key, value = line.split()
+            if key == "usage_usec":
+                return int(value) / 1e6
+        return None
+
+    def memory_pressure(self):
+        """Share of the last 10 seconds, in percent, some processes were stalled on memory."""
+        try:
+            content = self._read("memory.pressure")
+        except OSError:
+            # the pressure stall information can be disabled in the kernel
+            return None
+        for line in content.splitlines():
+            kind, *fields = line.split()
+            if kind == "some":
+                return float(dict(field.split("=") for field in fields)["avg10"])
+        return None
+
+
+class _CgroupV1(object):
+    """Resource usage of all the processes of the container, with cgroup v1."""
+
+    name = "v1"
+
+    def __init__(self, memory_path, cpuacct_path):
+        self._memory_path = memory_path
+        self._cpuacct_path = cpuacct_path
+
+    def memory(self):
+        """(limit, max used, used) bytes."""
+        return tuple(
+            int(_read_file(os.path.join(self._memory_path, filename)))
+            for filename in (
+                "memory.limit_in_bytes",
+                "memory.max_usage_in_bytes",
+                "memory.usage_in_bytes",
+            )
+        )
+
+    def cpu_usage_sec(self):
+        if self._cpuacct_path is None:
+            return None
+        return int(_read_file(os.path.join(self._cpuacct_path, "cpuacct.usage"))) / 1e9
+
+    def memory_pressure(self):
+        return None
+
+
+def _container_cgroup(cgroup_root=CGROUP_ROOT):
+    """The cgroup of the container, which is mounted at the root of the cgroup file system."""
+    if os.path.exists(os.path.join(cgroup_root, "memory.current")):
+        return _CgroupV2(cgroup_root)
+
+    memory_path = os.path.join(cgroup_root, "memory")
+    if os.path.exists(os.path.join(memory_path, "memory.usage_in_bytes")):
+        cpuacct_path = os.path.join(cgroup_root, "cpuacct")
+        if not os.path.exists(os.path.join(cpuacct_path, "cpuacct.usage")):
+            cpuacct_path = None
+        return _CgroupV1(memory_path, cpuacct_path)
+    return None
+
+
+def _summary(values):
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    return {"min": min(values), "avg": sum(values) / len(values), "max": max(values)}
+
 
 class ResourceMonitor:
+    """
+    Memory and CPU usage of the container (with cgroup v1 or v2) or, outside of a container,
+    of the DRUM processes.
+
+    The usage is sampled every `interval` seconds by a background thread, started by the first
+    `collect_resources_info` call, which keeps the last `samples` ones. `collect_resources_info`
+    reports the last sample with the min/avg/max CPU, memory and memory pressure of the kept ones,
+    without reading the usage itself unless a fresh sample is requested.
+    """
+
     TOTAL_MEMORY_LABEL = "Total"
     AVAILABLE_MEMORY_LABEL = "Available"
     FREE_MEMORY_LABEL = "Free"
 
-    def __init__(self, monitor_current_process=False):
+    def __init__(
+        self,
+        monitor_current_process=False,
+        interval=DEFAULT_SAMPLING_INTERVAL_SEC,
+        samples=DEFAULT_SAMPLES,
+    ):
         """"""
         self._is_drum_process = monitor_current_process
         self._current_proc = psutil.Process()
@@ -32,6 +159,36 @@ class ResourceMonitor:
         # save DRUM child processes, because consequent cpu_percent() calls has to be made on the same object.
         self._children_procs = {}
 
+        self._cgroup = _container_cgroup() if self._run_inside_docker() else None
+        # (monotonic time, container CPU usage seconds) of the last sample
+        self._cpu_usage = None
+
+        self.interval = interval
+        self._samples = collections.deque(maxlen=samples)
+        # (memory info, drum info) of the last sample
+        self._last_sample = None
+        self._lock = threading.Lock()
+        # the background thread and a request asking for a fresh sample may sample concurrently
+        self._sampling_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_runtime_parameters(cls, monitor_current_process=False):
+        """
+        The monitor sampling every `DRUM_RESOURCE_MONITOR_INTERVAL_SEC` seconds and keeping the
+        last `DRUM_RESOURCE_MONITOR_SAMPLES` samples.
+        """
+        return cls(
+            monitor_current_process=monitor_current_process,
+            interval=RuntimeParameters.get_positive_int(
+                "DRUM_RESOURCE_MONITOR_INTERVAL_SEC", DEFAULT_SAMPLING_INTERVAL_SEC
+            ),
+            samples=RuntimeParameters.get_positive_int(
+                "DRUM_RESOURCE_MONITOR_SAMPLES", DEFAULT_SAMPLES
+            ),
+        )
+
     @staticmethod
     def _run_inside_docker():
         """
@@ -42,30 +199,6 @@ class ResourceMonitor:
         else:
             return False
 
-    def _collect_memory_info_in_docker(self):
-        """
-        In the case we are running inside a docker container then memory collection is
-        simpler. We look directly on the files inside the /sys/fs/cgroup/memory directory
-        and collect the usage/total for all the processes inside the container.
-        Returns
-        -------
-        A dictionary with: {total_mb, usage_mb, max_usage_mb}
-        """
-
-        mem_sysfs_path = "/sys/fs/cgroup/memory/"
-        total_bytes = int(open(os.path.join(mem_sysfs_path, "memory.limit_in_bytes")).read())
-        total_mb = ByteConv.from_bytes(total_bytes).mbytes
-
-        usage_bytes = int(open(os.path.join(mem_sysfs_path, "memory.usage_in_bytes")).read())
-        usage_mb = ByteConv.from_bytes(usage_bytes).mbytes
-
-        max_usage_bytes = int(
-            open(os.path.join(mem_sysfs_path, "memory.max_usage_in_bytes")).read()
-        )
-        max_usage_mb = ByteConv.from_bytes(max_usage_bytes).mbytes
-
-        return {"total_mb": total_mb, "usage_mb": usage_mb, "max_usage_mb": max_usage_mb}
-
     def collect_drum_info(self):
         def get_proc_data(p):
             return {
@@ -108,18 +241,20 @@ class ResourceMonitor:
 
         return drum_info
 
-    def collect_resources_info(self):
-        drum_info = self.collect_drum_info()
+    def _collect_memory_info(self, drum_info):
         virtual_mem = psutil.virtual_memory()
         total_physical_mem_mb = ByteConv.from_bytes(virtual_mem.total).mbytes
 
-        if self._run_inside_docker():
-            # RAPTOR-10675: this doesn't work for containers that use cgroups v2, as memory files layout have changed
-            container_mem_info = self._collect_memory_info_in_docker()
-            container_limit_mb = container_mem_info["total_mb"]
-            container_max_usage_mb = container_mem_info["max_usage_mb"]
-            container_usage_mb = container_mem_info["usage_mb"]
-            available_mem_mb = container_limit_mb - container_mem_info["usage_mb"]
+        if self._cgroup is not None:
+            limit_bytes, max_usage_bytes, usage_bytes = self._cgroup.memory()
+            container_limit_mb = ByteConv.from_bytes(
+                virtual_mem.total if limit_bytes is None else limit_bytes
+            ).mbytes
+            container_max_usage_mb = (
+                None if max_usage_bytes is None else ByteConv.from_bytes(max_usage_bytes).mbytes
+            )
+            container_usage_mb = ByteConv.from_bytes(usage_bytes).mbytes
+            available_mem_mb = container_limit_mb - container_usage_mb
             free_mem_mb = available_mem_mb
         else:
             available_mem_mb = ByteConv.from_bytes(virtual_mem.available).mbytes
@@ -128,17 +263,96 @@ class ResourceMonitor:
             container_max_usage_mb = None
             container_usage_mb = None
 
-        mem_info = MemoryInfo(
+        return MemoryInfo(
             total=total_physical_mem_mb,
             avail=available_mem_mb,
             free=free_mem_mb,
-            drum_rss=sum(info["mem"] for info in drum_info) if self._drum_proc else None,
+            drum_rss=sum(info["mem"] for info in drum_info) if drum_info else None,
             container_limit=container_limit_mb,
             container_max_used=container_max_usage_mb,
             container_used=container_usage_mb,
         )
 
-        return {"mem_info": mem_info._asdict(), "drum_info": drum_info if self._drum_proc else None}
+    def _container_cpu_percent(self):
+        usage_sec = self._cgroup.cpu_usage_sec()
+        if usage_sec is None:
+            return None
+        now = time.monotonic()
+        previous, self._cpu_usage = self._cpu_usage, (now, usage_sec)
+        if previous is None or now <= previous[0]:
+            return None
+        return 100 * (usage_sec - previous[1]) / (now - previous[0])
+
+    def sample(self):
+        """Collect the resource usage once, and keep it as the last sample."""
+        with self._sampling_lock:
+            # psutil measures the CPU usage of a process since the previous call, so the
+            # first sample has none
+            first_sample = self._last_sample is None
+            drum_info = self.collect_drum_info()
+            mem_info = self._collect_memory_info(drum_info)
+            if self._cgroup is not None:
+                resource_sample = ResourceSample(
+                    cpu_percent=self._container_cpu_percent(),
+                    memory_mb=mem_info.container_used,
+                    memory_pressure=self._cgroup.memory_pressure(),
+                )
+            else:
+                resource_sample = ResourceSample(
+                    cpu_percent=(
+                        sum(info["cpu_percent"] for info in drum_info)
+                        if drum_info and not first_sample
+                        else None
+                    ),
+                    memory_mb=mem_info.drum_rss,
+                    memory_pressure=None,
+                )
+            with self._lock:
+                self._last_sample = (mem_info, drum_info)
+                self._samples.append(resource_sample)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Resource Monitor")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                logger.warning("Failed to collect the resource usage", exc_info=True)
+
+    def collect_resources_info(self, refresh=False):
+        """
+        The last sample, up to `interval` seconds old, and the summary of the recent ones. With
+        `refresh`, the usage is sampled first, e.g. to read the memory right after a workload.
+        """
+        if refresh or self._thread is None or not self._thread.is_alive():
+            self.sample()
+        if self._thread is None:
+            self.start()
+
+        with self._lock:
+            mem_info, drum_info = self._last_sample
+            samples = list(self._samples)
+
+        return {
+            "mem_info": mem_info._asdict(),
+            "drum_info": drum_info,
+            "recent": {
+                "cgroup": self._cgroup.name if self._cgroup is not None else None,
+                "interval_sec": self.interval,
+                "samples": len(samples),
+                "cpu_percent": _summary(s.cpu_percent for s in samples),
+                "memory_mb": _summary(s.memory_mb for s in samples),
+                "memory_pressure": _summary(s.memory_pressure for s in samples),
+            },
+        }
 
 
 class ByteConv(object):
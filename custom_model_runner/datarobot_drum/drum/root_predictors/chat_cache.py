@@ -0,0 +1,371 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from datarobot_drum.drum.enum import LOGGER_NAME_PREFIX
+from datarobot_drum.drum.enum import MODERATIONS_EXTRA_BODY_ASSOCIATION_ID_KEY
+from datarobot_drum.runtime_parameters.runtime_parameters import RuntimeParameters
+
+logger = logging.getLogger(LOGGER_NAME_PREFIX + "." + __name__)
+
+DEFAULT_CHAT_CACHE_TTL_SECONDS = 3600
+
+# parameters which do not change the generated completion
+_IGNORED_PARAMS = {"stream", "stream_options", MODERATIONS_EXTRA_BODY_ASSOCIATION_ID_KEY}
+# streamed fields which can not be replayed from a cached completion
+_UNREPLAYABLE_DELTA_FIELDS = ("audio", "function_call", "refusal", "tool_calls")
+
+
+def is_deterministic_request(completion_create_params):
+    """Only greedy decoding (temperature 0) always generates the same completion."""
+    temperature = completion_create_params.get("temperature")
+    return (
+        isinstance(temperature, (int, float))
+        and not isinstance(temperature, bool)
+        and temperature == 0
+    )
+
+
+def _is_replayable_completion(completion):
+    """Whether a cached completion can be replayed as a stream of content chunks."""
+    for choice in completion["choices"]:
+        message = choice.get("message") or {}
+        if choice.get("logprobs") or any(message.get(f) for f in _UNREPLAYABLE_DELTA_FIELDS):
+            return False
+    return True
+
+
+class _StreamedCompletion(object):
+    """Rebuild a completion from its streamed chunks, if it only streamed content."""
+
+    def __init__(self):
+        from openai.types.chat import ChatCompletionChunk
+
+        self._chunk_type = ChatCompletionChunk
+        self._first_chunk = None
+        self._roles = {}
+        self._contents = {}
+        self._finish_reasons = {}
+        self._usage = None
+        self.replayable = True
+
+    def feed(self, chunk):
+        if type(chunk) is not self._chunk_type or chunk.model_extra:
+            # custom chunk classes may carry fields a replay would lose
+            self.replayable = False
+        if not self.replayable:
+            return
+        if self._first_chunk is None:
+            self._first_chunk = chunk
+        if chunk.usage is not None:
+            self._usage = chunk.usage.to_dict()
+        for choice in chunk.choices:
+            delta = choice.delta
+            if choice.logprobs or any(getattr(delta, f) for f in _UNREPLAYABLE_DELTA_FIELDS):
+                self.replayable = False
+                return
+            if delta.role:
+                self._roles[choice.index] = delta.role
+            if delta.content:
+                self._contents.setdefault(choice.index, []).append(delta.content)
+            if choice.finish_reason:
+                self._finish_reasons[choice.index] = choice.finish_reason
+
+    def completion(self):
+        """The completion as a dict, None if the stream can not be cached."""
+        if not self.replayable or self._first_chunk is None or not self._finish_reasons:
+            return None
+        indexes = sorted(set(self._roles) | set(self._contents) | set(self._finish_reasons))
+        if set(indexes) != set(self._finish_reasons):
+            # an unfinished choice
+            return None
+        return {
+            "id": self._first_chunk.id,
+            "object": "chat.completion",
+            "created": self._first_chunk.created,
+            "model": self._first_chunk.model,
+            "choices": [
+                {
+                    "index": index,
+                    "finish_reason": self._finish_reasons[index],
+                    "message": {
+                        "role": self._roles.get(index, "assistant"),
+                        "content": "".join(self._contents.get(index, [])),
+                    },
+                }
+                for index in indexes
+            ],
+            "usage": self._usage,
+        }
+
+
+def _replay_chunks(completion, include_usage):
+    """Synthetic chunks streaming a cached completion: its content, then its finish reasons."""
+    from openai.types.chat import ChatCompletionChunk
+
+    def chunk(choices, usage=None):
+        return ChatCompletionChunk.model_validate(
+            {
+                "id": completion["id"],
+                "object": "chat.completion.chunk",
+                "created": completion["created"],
+                "model": completion["model"],
+                "choices": choices,
+                "usage": usage,
+            }
+        )
+
+    for choice in completion["choices"]:
+        message = choice.get("message") or {}
+        yield chunk(
+            [
+                {
+                    "index": choice["index"],
+                    "delta": {"role": message.get("role"), "content": message.get("content")},
+                    "finish_reason": None,
+                }
+            ]
+        )
+    yield chunk(
+        [
+            {"index": choice["index"], "delta": {}, "finish_reason": choice["finish_reason"]}
+            for choice in completion["choices"]
+        ]
+    )
+    if include_usage and completion.get("usage"):
+        yield chunk([], usage=completion["usage"])
+
+
+class ChatCompletionCache(object):
+    """
+    LRU cache of the completions of deterministic chat requests, keyed by a hash of the
+    canonical JSON of the request parameters (without `stream` and the association ID).
+
+    Entries expire `ttl` seconds after they were stored. With `cache_dir`, every entry is also
+    written to a file of that directory, so the cache survives restarts and is shared by the
+    workers of the server; evicted and expired entries are removed from the directory.
+
+    Streamed completions are cached when they only stream content, and cached completions are
+    replayed to streaming requests as synthetic chunks.
+
+    Only the request parameters and the `key_headers` request headers are part of the key, so a
+    completion which depends on anything else of the request, e.g. on the caller identity read by
+    a chat hook from the other headers, must not go through the cache (see `cacheable`).
+    """
+
+    def __init__(
+        self,
+        max_entries,
+        ttl=DEFAULT_CHAT_CACHE_TTL_SECONDS,
+        cache_dir=None,
+        namespace=None,
+        key_headers=(),
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.key_headers = tuple(sorted({name.lower() for name in key_headers}))
+        self._namespace = namespace
+        # key -> (expiration time, completion dict)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_cache_dir()
+
+    @classmethod
+    def from_runtime_parameters(cls, namespace=None):
+        """
+        The cache configured by the `DRUM_CHAT_CACHE_MAX_ENTRIES`, `DRUM_CHAT_CACHE_TTL_SECONDS`,
+        `DRUM_CHAT_CACHE_DIR` and `DRUM_CHAT_CACHE_KEY_HEADERS` (comma separated header names)
+        runtime parameters, None if the cache is disabled (default).
+        """
+        max_entries = RuntimeParameters.get_positive_int("DRUM_CHAT_CACHE_MAX_ENTRIES")
+        if max_entries is None:
+            return None
+        return cls(
+            max_entries,
+            ttl=RuntimeParameters.get_positive_int(
+                "DRUM_CHAT_CACHE_TTL_SECONDS", DEFAULT_CHAT_CACHE_TTL_SECONDS
+            ),
+            cache_dir=(
+                RuntimeParameters.get("DRUM_CHAT_CACHE_DIR")
+                if RuntimeParameters.has("DRUM_CHAT_CACHE_DIR")
+                else None
+            ),
+            namespace=namespace,
+            key_headers=(
+                [
+                    name.strip()
+                    for name in RuntimeParameters.get("DRUM_CHAT_CACHE_KEY_HEADERS").split(",")
+                    if name.strip()
+                ]
+                if RuntimeParameters.has("DRUM_CHAT_CACHE_KEY_HEADERS")
+                else ()
+            ),
+        )
+
+    def key(self, completion_create_params, headers=None):
+        """Cache key of a request, None if its completion must not be cached."""
+        if not is_deterministic_request(completion_create_params):
+            return None
+        params = {k: v for k, v in completion_create_params.items() if k not in _IGNORED_PARAMS}
+        key_headers = []
+        if self.key_headers:
+            headers = {name.lower(): value for name, value in (headers or {}).items()}
+            key_headers = [(name, headers.get(name)) for name in self.key_headers]
+        try:
+            canonical = json.dumps(
+                [self._namespace, params, key_headers],
+                sort_keys=True,
+                separators=(",", ":"),
+                allow_nan=False,
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def chat(self, completion_create_params, create_completion, headers=None, cacheable=True):
+        """
+        Return the cached completion of the request, or the one of `create_completion()`,
+        caching it. Streaming requests get a stream in both cases.
+
+        `headers` are the request headers, only `key_headers` of them are part of the key.
+        When `cacheable` is False, e.g. because the completion depends on more than the key,
+        the request is bypassed.
+        """
+        stream = bool(completion_create_params.get("stream"))
+        key = self.key(completion_create_params, headers) if cacheable else None
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return create_completion()
+
+        completion = self._get(key, stream)
+        if completion is not None:
+            if not stream:
+                from openai.types.chat import ChatCompletion
+
+                return ChatCompletion.model_validate(completion)
+            stream_options = completion_create_params.get("stream_options") or {}
+            return _replay_chunks(completion, stream_options.get("include_usage"))
+
+        response = create_completion()
+        if getattr(response, "object", None) == "chat.completion":
+            if hasattr(response, "to_dict"):
+                self._put(key, response.to_dict())
+            return response
+        return self._store_stream(key, response)
+
+    def _store_stream(self, key, response):
+        streamed = _StreamedCompletion()
+        for chunk in response:
+            streamed.feed(chunk)
+            yield chunk
+        completion = streamed.completion()
+        if completion is not None:
+            self._put(key, completion)
+
+    def _get(self, key, stream):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._read_entry(key)
+                if entry is not None:
+                    self._entries[key] = entry
+                    self._evict()
+            if entry is not None and entry[0] <= now:
+                self._remove(key)
+                entry = None
+            if entry is None or (stream and not _is_replayable_completion(entry[1])):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, key, completion):
+        entry = (time.time() + self.ttl, completion)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._write_entry(key, entry)
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        if self.cache_dir is not None:
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def _read_entry(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._entry_path(key)) as f:
+                data = json.load(f)
+            return data["expires_at"], data["completion"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_entry(self, key, entry):
+        if self.cache_dir is None:
+            return
+        # written to a temporary file and renamed, so other workers never read a partial entry
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"expires_at": entry[0], "completion": entry[1]}, f)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            logger.warning("Failed to write the chat cache entry %s", key, exc_info=True)
+
+    def _load_cache_dir(self):
+        """Load the most recent unexpired entries of the cache directory, removing the others."""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            key = name[: -len(".json")]
+            entry = self._read_entry(key)
+            if entry is None or entry[0] <= now:
+                self._remove(key)
+            else:
+                entries.append((entry[0], key, entry))
+        for _, key, entry in sorted(entries):
+            self._entries[key] = entry
+        self._evict()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "entries": len(self._entries),
+            }
@@ -18,6 +18,19 @@ with drum_inline_predictor(target_type=TargetType.AGENTIC_WORKFLOW.value, custom
     result = predictor.chat(payload)
     print(result)
 
+Structured models can be scored on an in-memory DataFrame, without a CSV round trip:
+
+with drum_inline_predictor(target_type=TargetType.REGRESSION.value, custom_model_dir=code_dir,
+                           target_name='target') as predictor:
+    predictions_df = predictor.predict_dataframe(df)
+
+Unstructured models can be scored on a file-like body, which is read incrementally by hooks declaring
+a `stream` parameter:
+
+with drum_inline_predictor(target_type=TargetType.UNSTRUCTURED.value, custom_model_dir=code_dir,
+                           target_name='target') as predictor, open("input.wav", "rb") as f:
+    data, kwargs = predictor.predict_unstructured_stream(f, mimetype="audio/wav")
+
 """
 
 import contextlib
@@ -13,9 +13,6 @@ from datarobot_drum.drum.enum import RunLanguage
 from datarobot_drum.drum.enum import TargetType
 from datarobot_drum.drum.enum import UnstructuredDtoKeys
 from datarobot_drum.drum.exceptions import DrumCommonException
-from datarobot_drum.drum.root_predictors.unstructured_helpers import (
-    _resolve_incoming_unstructured_data,
-)
 from datarobot_drum.drum.root_predictors.unstructured_helpers import (
     _resolve_outgoing_unstructured_data,
 )
@@ -120,23 +117,13 @@ class GenericPredictorComponent:
         mimetype, charset = get_mimetype_charset_from_content_type_header(
             self._params.get("content_type")
         )
-
-        with open(input_filename, "rb") as f:
-            data_binary = f.read()
-
-        data_binary_or_text, mimetype, charset = _resolve_incoming_unstructured_data(
-            data_binary,
-            mimetype,
-            charset,
-        )
-        kwargs_params[UnstructuredDtoKeys.MIMETYPE] = mimetype
-        if charset is not None:
-            kwargs_params[UnstructuredDtoKeys.CHARSET] = charset
         kwargs_params[UnstructuredDtoKeys.QUERY] = query_params
 
-        ret_data, ret_kwargs = self._predictor.predict_unstructured(
-            data_binary_or_text, **kwargs_params
-        )
+        # models with a streaming hook read the input file incrementally
+        with open(input_filename, "rb") as f:
+            ret_data, ret_kwargs = self._predictor.predict_unstructured_stream(
+                f, mimetype=mimetype, charset=charset, **kwargs_params
+            )
         _, _, response_charset = _resolve_outgoing_unstructured_data(ret_data, ret_kwargs)
 
         # only for screen printout convenience we take pred data directly from unstructured_response
@@ -5,11 +5,15 @@ This is proprietary source code of DataRobot, Inc. and its affiliates.
 Released under the terms of DataRobot Tool and Utility Agreement.
 """
 import logging
+import uuid
 
-from flask import request, Response, stream_with_context
+from flask import after_this_request, request, Response, stream_with_context
 from requests_toolbelt import MultipartEncoder
 
+from datarobot_drum import RuntimeParameters
+from datarobot_drum.drum.common import to_bool
 from datarobot_drum.drum.enum import (
+    PayloadFormat,
     PredictionServerMimetypes,
     PRED_COLUMN,
     SPARSE_COLNAMES,
@@ -24,6 +28,13 @@ from datarobot_drum.drum.server import (
     HTTP_404_NOT_FOUND,
     HTTP_422_UNPROCESSABLE_ENTITY,
 )
+from datarobot_drum.drum.utils.json_utils import numpy_array_to_json_str
+from datarobot_drum.drum.utils.spooled_payload import (
+    get_request_spool_threshold,
+    spool_file_storage,
+    spool_to_memory_map,
+    stream_size,
+)
 from datarobot_drum.drum.utils.structured_input_read_utils import StructuredInputReadUtils
 from datarobot_drum.drum.root_predictors.chat_helpers import is_streaming_response
 from datarobot_drum.drum.root_predictors.deployment_config_helpers import (
@@ -31,8 +42,12 @@ from datarobot_drum.drum.root_predictors.deployment_config_helpers import (
 )
 from datarobot_drum.drum.root_predictors.transform_helpers import (
     is_sparse,
+    iter_csv_payload,
+    iter_mtx_payload,
+    iter_multipart_payload,
     make_csv_payload,
     make_mtx_payload,
+    make_npz_payload,
 )
 from datarobot_drum.drum.root_predictors.unstructured_helpers import (
     _resolve_incoming_unstructured_data,
@@ -59,12 +74,39 @@ class PredictMixin:
         return get_mimetype_charset_from_content_type_header(header)
 
     @staticmethod
-    def _fetch_data_from_request(file_key, logger=None):
+    def _close_after_request(payload):
+        @after_this_request
+        def close_payload(response):
+            try:
+                payload.close()
+            except BufferError:
+                # a view on the payload is still alive, it is unmapped once garbage collected
+                pass
+            return response
+
+        return payload
+
+    @staticmethod
+    def _fetch_data_from_request(file_key, logger=None, memory_map=False):
+        """
+        Read the payload under `file_key` from a multipart request, or the raw body for "X".
+        When `memory_map` is set and the payload exceeds the configured spool threshold, it is
+        returned as a read-only memory map of a temporary file instead of bytes.
+        """
         filestorage = request.files.get(file_key)
+        spool_threshold = get_request_spool_threshold() if memory_map else None
 
         charset = None
         if filestorage is not None:
-            binary_data = filestorage.stream.read()
+            if spool_threshold is not None and stream_size(filestorage.stream) > spool_threshold:
+                binary_data = PredictMixin._close_after_request(
+                    spool_file_storage(filestorage.stream)
+                )
+                PredictMixin._log_if_possible(
+                    logger, logging.DEBUG, "Spooled {} upload to disk".format(file_key)
+                )
+            else:
+                binary_data = filestorage.stream.read()
             mimetype = StructuredInputReadUtils.resolve_mimetype_by_filename(filestorage.filename)
 
             if logger is not None:
@@ -72,6 +114,17 @@ class PredictMixin:
                     "Filename provided under {} key: {}".format(file_key, filestorage.filename)
                 )
 
+        elif (
+            spool_threshold is not None
+            and file_key == "X"
+            and not request.files
+            and not request.form
+            and (request.content_length or 0) > spool_threshold
+        ):
+            binary_data = PredictMixin._close_after_request(spool_to_memory_map(request.stream))
+            mimetype, charset = PredictMixin._validate_content_type_header(request.content_type)
+            PredictMixin._log_if_possible(logger, logging.DEBUG, "Spooled request body to disk")
+
         # TODO: probably need to return empty response in case of empty request
         elif len(request.data) and file_key == "X":
             binary_data = request.data
@@ -79,7 +132,7 @@ class PredictMixin:
         else:
             wrong_key_error_message = (
                 "Samples should be provided as: "
-                "  - a csv or mtx under `{}` form-data param key."
+                "  - a csv, mtx or npz under `{}` form-data param key."
                 "  - binary data".format(file_key)
             )
             if logger is not None:
@@ -137,7 +190,9 @@ class PredictMixin:
     def _do_predict_structured(self, logger=None):
         response_status = HTTP_200_OK
         try:
-            binary_data, mimetype, charset = self._fetch_data_from_request("X", logger=logger)
+            binary_data, mimetype, charset = self._fetch_data_from_request(
+                "X", logger=logger, memory_map=self._predictor.supports_memory_mapped_input()
+            )
             sparse_column_names = self._get_sparse_column_names(logger=logger)
 
             mimetype_support_error_response = self._check_mimetype_support(mimetype)
@@ -157,34 +212,51 @@ class PredictMixin:
         if self._target_type == TargetType.UNSTRUCTURED:
             response = predict_response.predictions
         else:
-            if self._target_type not in (
+            is_numeric_target = self._target_type not in (
                 TargetType.TEXT_GENERATION,
                 TargetType.GEO_POINT,
                 TargetType.VECTOR_DATABASE,
                 TargetType.AGENTIC_WORKFLOW,
-            ):
-                # float32 is not JSON serializable, so cast to float, which is float64
-                predict_response.predictions = predict_response.predictions.astype("float")
+            )
             if self._deployment_config is not None:
+                if is_numeric_target:
+                    # float32 is not JSON serializable, so cast to float, which is float64
+                    predict_response.predictions = predict_response.predictions.astype("float")
                 response = build_pps_response_json_str(
                     predict_response, self._deployment_config, self._target_type
                 )
             else:
+                if is_numeric_target:
+                    predict_response.predictions = self._as_float_predictions(
+                        predict_response.predictions
+                    )
                 response = self._build_drum_response_json_str(predict_response)
 
         response = Response(response, mimetype=PredictionServerMimetypes.APPLICATION_JSON)
 
         return response, response_status
 
+    @staticmethod
+    def _as_float_predictions(predictions):
+        # The DRUM response encoders write float32 as is, so only predictions of other types are
+        # cast to float and the common case needs no copy of the predictions.
+        if all(dtype.kind == "f" for dtype in predictions.dtypes):
+            return predictions
+        return predictions.astype("float")
+
     @staticmethod
     def _build_drum_response_json_str(predict_response):
         out_data = predict_response.predictions
         extra_model_output = predict_response.extra_model_output
+        predictions_json_str = None
         if len(out_data.columns) == 1:
             out_data = out_data[PRED_COLUMN]
-        # df.to_json() is much faster.
-        # But as it returns string, we have to assemble final json using strings.
-        predictions_json_str = out_data.to_json(orient="records")
+            # Numeric predictions are encoded straight from the underlying numpy array.
+            predictions_json_str = numpy_array_to_json_str(out_data.to_numpy())
+        if predictions_json_str is None:
+            # df.to_json() is much faster than json.dumps.
+            # But as it returns string, we have to assemble final json using strings.
+            predictions_json_str = out_data.to_json(orient="records")
         if extra_model_output is not None:
             # For best performance we use the 'split' orientation.
             extra_output_json_str = extra_model_output.to_json(orient="split")
@@ -203,7 +275,7 @@ class PredictMixin:
 
         try:
             feature_binary_data, feature_mimetype, feature_charset = self._fetch_data_from_request(
-                "X", logger=logger
+                "X", logger=logger, memory_map=self._predictor.supports_memory_mapped_input()
             )
             sparse_column_names = self._get_sparse_column_names(logger=logger)
             mimetype_support_error_response = self._check_mimetype_support(feature_mimetype)
@@ -220,7 +292,11 @@ class PredictMixin:
                         target_binary_data,
                         target_mimetype,
                         target_charset,
-                    ) = self._fetch_data_from_request("y", logger=logger)
+                    ) = self._fetch_data_from_request(
+                        "y",
+                        logger=logger,
+                        memory_map=self._predictor.supports_memory_mapped_input(),
+                    )
                     mimetype_support_error_response = self._check_mimetype_support(target_mimetype)
                     if mimetype_support_error_response is not None:
                         return mimetype_support_error_response
@@ -253,12 +329,26 @@ class PredictMixin:
             )
 
         # make output
-        if is_sparse(out_data):
+        stream_response = self._is_transform_response_streamed()
+        sparse_output = is_sparse(out_data)
+        if sparse_output and self._is_npz_transform_output(feature_mimetype):
+            # The column names are embedded in the NPZ payload, there is no separate field.
+            sparse_output = False
+            feature_payload = make_npz_payload(out_data)
+            target_payload = make_csv_payload(out_target) if out_target is not None else None
+            out_format = PayloadFormat.NPZ
+        elif sparse_output:
             target_payload = make_csv_payload(out_target) if out_target is not None else None
-            feature_payload, colnames = make_mtx_payload(out_data)
+            if stream_response:
+                feature_payload, colnames = iter_mtx_payload(out_data)
+            else:
+                feature_payload, colnames = make_mtx_payload(out_data)
             out_format = "sparse"
         else:
-            feature_payload = make_csv_payload(out_data)
+            if stream_response:
+                feature_payload = iter_csv_payload(out_data)
+            else:
+                feature_payload = make_csv_payload(out_data)
             target_payload = make_csv_payload(out_target) if out_target is not None else None
             out_format = "csv"
 
@@ -271,7 +361,7 @@ class PredictMixin:
             ),
         }
 
-        if is_sparse(out_data):
+        if sparse_output:
             out_fields.update(
                 {
                     SPARSE_COLNAMES: (
@@ -294,12 +384,36 @@ class PredictMixin:
                 }
             )
 
+        if stream_response:
+            # The features are serialized chunk by chunk while the response is being sent,
+            # so the client receives the first bytes early and the whole payload is never built.
+            boundary = uuid.uuid4().hex
+            response = Response(
+                stream_with_context(iter_multipart_payload(out_fields, boundary)),
+                mimetype="multipart/form-data; boundary={}".format(boundary),
+            )
+            return response, response_status
+
         m = MultipartEncoder(fields=out_fields)
 
         response = Response(m.to_string(), mimetype=m.content_type)
 
         return response, response_status
 
+    @staticmethod
+    def _is_npz_transform_output(feature_mimetype):
+        # Sparse features are returned as NPZ when they were sent as NPZ or when it is requested
+        return (
+            feature_mimetype == PredictionServerMimetypes.APPLICATION_X_NPZ
+            or request.args.get("sparse_format") == PayloadFormat.NPZ
+        )
+
+    @staticmethod
+    def _is_transform_response_streamed():
+        return RuntimeParameters.has("DRUM_STREAM_TRANSFORM_RESPONSE") and to_bool(
+            RuntimeParameters.get("DRUM_STREAM_TRANSFORM_RESPONSE")
+        )
+
     def do_predict_structured(self, logger=None):
         wrong_target_type_error_message = (
             "This model has target type '{}', use the {{}} endpoint.".format(
@@ -342,23 +456,29 @@ class PredictMixin:
         response_status = HTTP_200_OK
         kwargs_params = {}
 
-        data = request.get_data()
         mimetype, charset = PredictMixin._validate_content_type_header(request.content_type)
-
-        data_binary_or_text, mimetype, charset = _resolve_incoming_unstructured_data(
-            data,
-            mimetype,
-            charset,
-        )
-        kwargs_params[UnstructuredDtoKeys.MIMETYPE] = mimetype
-        if charset is not None:
-            kwargs_params[UnstructuredDtoKeys.CHARSET] = charset
         kwargs_params[UnstructuredDtoKeys.QUERY] = request.args
         kwargs_params[UnstructuredDtoKeys.HEADERS] = dict(request.headers)
 
-        ret_data, ret_kwargs = self._predictor.predict_unstructured(
-            data_binary_or_text, **kwargs_params
-        )
+        if self._predictor.supports_streaming_unstructured_input():
+            # the hook reads the body while it is being received, it is never buffered by DRUM
+            ret_data, ret_kwargs = self._predictor.predict_unstructured_stream(
+                request.stream, mimetype=mimetype, charset=charset, **kwargs_params
+            )
+        else:
+            data = request.get_data()
+            data_binary_or_text, mimetype, charset = _resolve_incoming_unstructured_data(
+                data,
+                mimetype,
+                charset,
+            )
+            kwargs_params[UnstructuredDtoKeys.MIMETYPE] = mimetype
+            if charset is not None:
+                kwargs_params[UnstructuredDtoKeys.CHARSET] = charset
+
+            ret_data, ret_kwargs = self._predictor.predict_unstructured(
+                data_binary_or_text, **kwargs_params
+            )
 
         response_data, response_mimetype, response_charset = _resolve_outgoing_unstructured_data(
             ret_data, ret_kwargs
@@ -371,6 +491,8 @@ class PredictMixin:
             if response_charset is not None:
                 content_type += "; charset={}".format(response_charset)
             response.headers["Content-Type"] = content_type
+        if ret_kwargs:
+            response.headers.update(ret_kwargs.get(UnstructuredDtoKeys.HEADERS) or {})
 
         return response, response_status
 
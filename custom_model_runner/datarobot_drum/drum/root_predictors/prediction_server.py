@@ -49,10 +49,12 @@ from datarobot_drum.drum.server import (
     HEADER_DRUM_USER_HTTP_ERROR,
     HTTP_200_OK,
     HTTP_400_BAD_REQUEST,
+    HTTP_413_REQUEST_ENTITY_TOO_LARGE,
     HTTP_500_INTERNAL_SERVER_ERROR,
     base_api_blueprint,
     get_flask_app,
 )
+from datarobot_drum.drum.utils.spooled_payload import get_max_request_body_size
 from datarobot_drum.profiler.stats_collector import StatsCollector, StatsOperation
 from datarobot_drum.drum.common import (
     otel_context,
@@ -81,7 +83,9 @@ class PredictionServer(PredictMixin):
             flask_app  # This is the Flask app object, used when running the application via CLI
         )
         self._show_perf = self._params.get("show_perf")
-        self._resource_monitor = ResourceMonitor(monitor_current_process=True)
+        self._resource_monitor = ResourceMonitor.from_runtime_parameters(
+            monitor_current_process=True
+        )
         self._run_language = RunLanguage(params.get("run_language"))
         self._gpu_predictor_type = self._params.get("gpu_predictor")
         self._target_type = TargetType(params[TARGET_TYPE_ARG_KEYWORD])
@@ -307,7 +311,13 @@ class PredictionServer(PredictMixin):
 
         @model_api.route("/stats/", methods=["GET"])
         def stats():
-            ret_dict = self._resource_monitor.collect_resources_info()
+            # the usage is sampled in the background, ?refresh=1 reads it for this request
+            ret_dict = self._resource_monitor.collect_resources_info(
+                refresh=request.args.get("refresh") in ("1", "true")
+            )
+            chat_cache_stats = self._predictor.get_chat_cache_stats()
+            if chat_cache_stats is not None:
+                ret_dict["chat_cache"] = chat_cache_stats
 
             self._stats_collector.round()
             ret_dict["time_info"] = {}
@@ -332,6 +342,16 @@ class PredictionServer(PredictMixin):
             if isinstance(e, HTTPException) and e.code == HTTP_400_BAD_REQUEST:
                 return jsonify(error=e.description), e.code
 
+            if isinstance(e, HTTPException) and e.code == HTTP_413_REQUEST_ENTITY_TOO_LARGE:
+                return (
+                    {
+                        "message": "ERROR: Request body exceeds the maximum size of {} bytes".format(
+                            request.max_content_length
+                        )
+                    },
+                    e.code,
+                )
+
             return {"message": "ERROR: {}".format(e)}, HTTP_500_INTERNAL_SERVER_ERROR
 
         # Disables warning for development server
@@ -339,6 +359,10 @@ class PredictionServer(PredictMixin):
         cli.show_server_banner = lambda *x: None
 
         app = get_flask_app(model_api, self.flask_app)
+        max_request_body_size = get_max_request_body_size()
+        if max_request_body_size is not None:
+            # werkzeug rejects larger bodies with 413 before reading them
+            app.config["MAX_CONTENT_LENGTH"] = max_request_body_size
         self.load_flask_extensions(app)
         self._run_flask_app(app)
 
@@ -493,6 +517,7 @@ class PredictionServer(PredictMixin):
                 time.sleep(sleep_time)
 
     def terminate(self):
+        self._resource_monitor.stop()
         terminate_op = getattr(self._predictor, "terminate", None)
         if callable(terminate_op):
             terminate_op()
@@ -4,6 +4,7 @@ All rights reserved.
 This is proprietary source code of DataRobot, Inc. and its affiliates.
 Released under the terms of DataRobot Tool and Utility Agreement.
 """
+import numpy as np
 import pandas as pd
 import logging
 
@@ -12,9 +13,15 @@ from io import BytesIO, StringIO
 from scipy.io import mmwrite, mmread
 from scipy.sparse import issparse
 from scipy.sparse import csr_matrix
+from urllib3.fields import RequestField
 from werkzeug.formparser import parse_form_data
 
 from datarobot_drum.drum.enum import X_FORMAT_KEY, X_TRANSFORM_KEY
+from datarobot_drum.drum.utils import npz_utils
+
+# Chunk sizes of streamed transform responses
+STREAM_CSV_CHUNK_ROWS = 10000
+STREAM_MTX_CHUNK_ENTRIES = 100000
 
 
 def filter_urllib3_logging():
@@ -80,6 +87,28 @@ def make_csv_payload(df):
     return s_buf.getvalue()[:-2].encode("utf-8")
 
 
+def iter_csv_payload(df, chunk_rows=STREAM_CSV_CHUNK_ROWS):
+    """
+    Streamed counterpart of `make_csv_payload`: the same payload, serialized `chunk_rows` rows
+    at a time. Column names are validated up front, serialization happens while iterating.
+    """
+    df = validate_and_convert_column_names_for_serialization(df)
+
+    def _iter_chunks():
+        # the header is written even if there are no rows
+        for start in range(0, max(len(df), 1), chunk_rows):
+            s_buf = StringIO()
+            df.iloc[start : start + chunk_rows].to_csv(
+                s_buf, index=False, header=start == 0, lineterminator="\r\n"
+            )
+            # As in make_csv_payload, the payload has no trailing \r\n,
+            # so the line terminator between chunks is written at the start of the next one.
+            chunk = s_buf.getvalue()[:-2]
+            yield (chunk if start == 0 else "\r\n" + chunk).encode("utf-8")
+
+    return _iter_chunks()
+
+
 def read_csv_payload(response_dict, transform_key):
     bytes = response_dict[transform_key]
     return pd.read_csv(BytesIO(bytes))
@@ -95,12 +124,83 @@ def make_mtx_payload(df):
     return sink.getvalue(), column_payload
 
 
+def make_npz_payload(df):
+    """
+    Binary alternative to `make_mtx_payload`: the sparse features as an uncompressed CSR NPZ
+    payload, with the column names embedded in it.
+    """
+    sparse_mat = validate_and_convert_column_names_for_serialization(df)
+    return npz_utils.make_npz_payload(sparse_mat.sparse.to_coo(), columns=sparse_mat.columns)
+
+
+def iter_mtx_payload(df, chunk_entries=STREAM_MTX_CHUNK_ENTRIES):
+    """
+    Streamed counterpart of `make_mtx_payload`: a Matrix Market coordinate payload whose
+    entries are serialized `chunk_entries` at a time, and the column names payload.
+    """
+    sparse_mat = validate_and_convert_column_names_for_serialization(df)
+    colnames = df.columns.values
+    coo = sparse_mat.sparse.to_coo()
+    column_payload = "\n".join(str(colname) for colname in colnames)
+
+    is_integer = coo.dtype.kind in "iub"
+    entry_format = "%d %d %d" if is_integer else "%d %d %.17g"
+
+    def _iter_chunks():
+        yield "%%MatrixMarket matrix coordinate {} general\n{} {} {}\n".format(
+            "integer" if is_integer else "real", coo.shape[0], coo.shape[1], coo.nnz
+        ).encode("utf-8")
+        for start in range(0, coo.nnz, chunk_entries):
+            end = start + chunk_entries
+            sink = BytesIO()
+            # Matrix Market indices are 1-based
+            np.savetxt(
+                sink,
+                np.column_stack(
+                    (coo.row[start:end] + 1, coo.col[start:end] + 1, coo.data[start:end])
+                ),
+                fmt=entry_format,
+            )
+            yield sink.getvalue()
+
+    return _iter_chunks(), column_payload
+
+
+def iter_multipart_payload(fields, boundary):
+    """
+    Serialize multipart/form-data fields as requests_toolbelt's MultipartEncoder does, but
+    lazily. `fields` maps a name to a value or a (filename, value, content type) tuple, where
+    the value is str, bytes or an iterable of bytes chunks that are yielded as produced.
+    """
+    for name, value in fields.items():
+        filename = content_type = None
+        if isinstance(value, tuple):
+            filename, value, content_type = value
+
+        field = RequestField(name=name, data=None, filename=filename)
+        field.make_multipart(content_type=content_type)
+        yield "--{}\r\n{}".format(boundary, field.render_headers()).encode("utf-8")
+        if isinstance(value, str):
+            yield value.encode("utf-8")
+        elif isinstance(value, bytes):
+            yield value
+        else:
+            yield from value
+        yield b"\r\n"
+    yield "--{}--\r\n".format(boundary).encode("utf-8")
+
+
 def read_mtx_payload(response_dict, transform_key):
     bytes = response_dict[transform_key]
     sparse_mat = mmread(BytesIO(bytes))
     return csr_matrix(sparse_mat)
 
 
+def read_npz_payload(response_dict, transform_key):
+    matrix, columns = npz_utils.read_npz_payload(response_dict[transform_key])
+    return pd.DataFrame.sparse.from_spmatrix(matrix, columns=columns)
+
+
 def parse_multi_part_response(response):
     environ = {
         "wsgi.input": BytesIO(response.content),
@@ -124,6 +224,7 @@ def read_x_data_from_response(response):
     reader = {
         "sparse": _sparse,
         "csv": read_csv_payload,
+        "npz": read_npz_payload,
     }
     data = parse_multi_part_response(response)
     return reader[data[X_FORMAT_KEY]](data, X_TRANSFORM_KEY)
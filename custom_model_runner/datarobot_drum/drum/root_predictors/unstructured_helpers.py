@@ -16,10 +16,7 @@ def _is_text_mimetype(mimetype):
     return mimetype.startswith("text/") or mimetype == PredictionServerMimetypes.APPLICATION_JSON
 
 
-def _resolve_incoming_unstructured_data(in_data, mimetype, charset):
-    if not isinstance(in_data, bytes):
-        raise DrumCommonException("bytes data is expected, received {}".format(type(in_data)))
-
+def _resolve_incoming_unstructured_mimetype(mimetype, charset):
     # Incoming mimetype that startswith `text/` or `application/json` or "" or missing is considered "textual".
     # If user sends request with "textual" mimetype, but charset is missing, we set default charset to `utf8`.
     # If user sends request with non textual mimetype, but charset is missing, we don't pass charset param into the hook.
@@ -27,9 +24,20 @@ def _resolve_incoming_unstructured_data(in_data, mimetype, charset):
 
     if _is_text_mimetype(ret_mimetype):
         ret_charset = charset if charset is not None else CHARSET_DEFAULT
-        ret_data = in_data.decode(ret_charset)
     else:
         ret_charset = charset
+
+    return ret_mimetype, ret_charset
+
+
+def _resolve_incoming_unstructured_data(in_data, mimetype, charset):
+    if not isinstance(in_data, bytes):
+        raise DrumCommonException("bytes data is expected, received {}".format(type(in_data)))
+
+    ret_mimetype, ret_charset = _resolve_incoming_unstructured_mimetype(mimetype, charset)
+    if _is_text_mimetype(ret_mimetype):
+        ret_data = in_data.decode(ret_charset)
+    else:
         ret_data = in_data
 
     return ret_data, ret_mimetype, ret_charset
@@ -22,6 +22,7 @@ from datarobot_drum.drum.enum import URL_PREFIX_ENV_VAR_NAME
 HTTP_200_OK = 200
 HTTP_400_BAD_REQUEST = 400
 HTTP_404_NOT_FOUND = 404
+HTTP_413_REQUEST_ENTITY_TOO_LARGE = 413
 HTTP_422_UNPROCESSABLE_ENTITY = 422
 HTTP_500_INTERNAL_SERVER_ERROR = 500
 HTTP_513_DRUM_PIPELINE_ERROR = 513
@@ -37,3 +37,38 @@ def extract_additional_columns(
             ]
         predictions = origin_dataframe[ordered_pred_columns]
         return predictions, extra_model_output
+
+
+def downcast_dataframe(
+    dataframe: pd.DataFrame, exclude: Optional[List[str]] = None, max_category_ratio: float = 0.5
+) -> pd.DataFrame:
+    """
+    Shrink the columns of a dense DataFrame without changing their values: 64 bit integers to
+    int32 when they fit, floats to float32 when every value is exactly representable, and string
+    columns to category when at most `max_category_ratio` of their values are distinct.
+    Columns in `exclude` are kept as they are.
+    """
+    exclude = set(exclude or [])
+    downcast = {}
+    for name, column in dataframe.items():
+        if name in exclude or len(column) == 0:
+            continue
+        if column.dtype == np.int64:
+            int32 = np.iinfo(np.int32)
+            if int32.min <= column.min() and column.max() <= int32.max:
+                downcast[name] = column.astype(np.int32)
+        elif column.dtype == np.float64:
+            with np.errstate(over="ignore"):
+                float32 = column.to_numpy().astype(np.float32)
+            if np.array_equal(float32, column.to_numpy(), equal_nan=True):
+                downcast[name] = pd.Series(float32, index=column.index, name=name)
+        elif column.dtype == object and pd.api.types.infer_dtype(column) == "string":
+            if column.nunique() <= max_category_ratio * len(column):
+                downcast[name] = column.astype("category")
+
+    if not downcast:
+        return dataframe
+    dataframe = dataframe.copy(deep=False)
+    for name, column in downcast.items():
+        dataframe[name] = column
+    return dataframe
@@ -138,6 +138,8 @@ class DrumUtils:
 
     @classmethod
     def delete_cmd_argument(cls, cmd_list, arg_name):
+        # --arg=value form
+        cmd_list[:] = [arg for arg in cmd_list if not arg.startswith(arg_name + "=")]
         try:
             ind = cmd_list.index(arg_name)
             # Handle case when no value argument, like --skip-deps-install,
@@ -0,0 +1,58 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+from typing import Optional
+
+import numpy as np
+import orjson
+import pandas as pd
+
+# numpy dtype kinds orjson serializes natively: float, signed/unsigned int, bool
+_ORJSON_NUMPY_KINDS = "fiub"
+
+
+def json_loads(data):
+    """
+    Decode a JSON document from str or any bytes-like object (e.g. a memory map) with orjson.
+    """
+    if not isinstance(data, (str, bytes, bytearray)):
+        with memoryview(data) as view:
+            return orjson.loads(view)
+    return orjson.loads(data)
+
+
+def numpy_array_to_json_str(array: np.ndarray) -> Optional[str]:
+    """
+    Serialize a numeric numpy array to a JSON list straight from its buffer, without casting it
+    or converting it to Python objects first. NaN and infinity are written as null, as pandas
+    does. Returns None when orjson does not support the array, so the caller can fall back to
+    pandas.
+    """
+    if array.dtype.kind not in _ORJSON_NUMPY_KINDS:
+        return None
+    try:
+        return orjson.dumps(np.ascontiguousarray(array), option=orjson.OPT_SERIALIZE_NUMPY).decode(
+            "utf-8"
+        )
+    except orjson.JSONEncodeError:
+        return None
+
+
+def json_payload_to_df(payload) -> pd.DataFrame:
+    """
+    Build a DataFrame from a decoded JSON payload in one of the supported orientations:
+    - records: [{"col1": 1, "col2": "a"}, {"col1": 2, "col2": "b"}]
+    - columns: {"col1": [1, 2], "col2": ["a", "b"]}
+    """
+    if isinstance(payload, list):
+        return pd.DataFrame.from_records(payload)
+    if isinstance(payload, dict):
+        return pd.DataFrame(payload).reset_index(drop=True)
+    raise ValueError(
+        "JSON payload must be a list of records or a mapping of columns, got {}".format(
+            type(payload).__name__
+        )
+    )
@@ -0,0 +1,112 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import io
+import struct
+import zipfile
+
+import numpy as np
+from scipy import sparse
+
+from datarobot_drum.drum.utils.spooled_payload import open_payload
+
+# Extra array with the column names, next to the ones scipy.sparse.save_npz writes,
+# so payloads stay readable with scipy.sparse.load_npz.
+NPZ_COLUMNS_KEY = "columns"
+
+# Size of the fixed part of a zip local file header, followed by the file name and extra field
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+def make_npz_payload(matrix, columns=None) -> bytes:
+    """
+    Serialize a scipy sparse matrix to an uncompressed NPZ payload in CSR layout, with the
+    column names embedded. Uncompressed members can be decoded without copying them.
+    """
+    csr = sparse.csr_matrix(matrix)
+    arrays = dict(
+        format=np.array(b"csr"),
+        shape=np.array(csr.shape),
+        data=csr.data,
+        indices=csr.indices,
+        indptr=csr.indptr,
+    )
+    if columns is not None:
+        arrays[NPZ_COLUMNS_KEY] = np.array([str(column) for column in columns], dtype=str)
+
+    sink = io.BytesIO()
+    np.savez(sink, **arrays)
+    return sink.getvalue()
+
+
+def _read_stored_array(buffer, info):
+    # The array is read in place from an uncompressed member: only its headers are parsed.
+    local_header = buffer[info.header_offset : info.header_offset + _ZIP_LOCAL_HEADER_SIZE]
+    name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+    offset = info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+
+    with open_payload(buffer) as stream:
+        stream.seek(offset)
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+        data_offset = stream.tell()
+
+    if dtype.hasobject:
+        raise ValueError("Arrays of Python objects are not supported")
+    array = np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape)), offset=data_offset)
+    return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+def load_npz_arrays(binary_data) -> dict:
+    """
+    Read the arrays of an NPZ payload (bytes or a memory map). Uncompressed members are
+    returned as read-only views on the payload, compressed ones are decompressed.
+    """
+    arrays = {}
+    with zipfile.ZipFile(open_payload(binary_data)) as archive:
+        for info in archive.infolist():
+            name = (
+                info.filename[: -len(".npy")] if info.filename.endswith(".npy") else info.filename
+            )
+            if info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = _read_stored_array(binary_data, info)
+            else:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+    return arrays
+
+
+def read_npz_payload(binary_data):
+    """
+    Decode a sparse NPZ payload, as written by `make_npz_payload` or scipy.sparse.save_npz.
+    Returns the sparse matrix and the embedded column names (None if there are none).
+    """
+    arrays = load_npz_arrays(binary_data)
+    sparse_format = arrays["format"].item()
+    if isinstance(sparse_format, bytes):
+        sparse_format = sparse_format.decode("ascii")
+    shape = tuple(int(size) for size in arrays["shape"])
+
+    if sparse_format == "csr":
+        matrix = sparse.csr_matrix(
+            (arrays["data"], arrays["indices"], arrays["indptr"]), shape=shape, copy=False
+        )
+    elif sparse_format == "csc":
+        matrix = sparse.csc_matrix(
+            (arrays["data"], arrays["indices"], arrays["indptr"]), shape=shape, copy=False
+        )
+    elif sparse_format == "coo":
+        matrix = sparse.coo_matrix(
+            (arrays["data"], (arrays["row"], arrays["col"])), shape=shape, copy=False
+        )
+    else:
+        raise ValueError("Unsupported sparse NPZ format: {}".format(sparse_format))
+
+    columns = arrays.get(NPZ_COLUMNS_KEY)
+    return matrix, None if columns is None else columns.tolist()
@@ -0,0 +1,141 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.runtime_parameters.runtime_parameters import RuntimeParameters
+
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+def _get_size_in_bytes(param_name) -> Optional[int]:
+    if not RuntimeParameters.has(param_name):
+        return None
+    try:
+        size = int(float(RuntimeParameters.get(param_name)) * 1024 * 1024)
+    except (TypeError, ValueError):
+        raise DrumCommonException(
+            "Runtime parameter {} must be a size in megabytes, got: {}".format(
+                param_name, RuntimeParameters.get(param_name)
+            )
+        )
+    return size if size > 0 else None
+
+
+def get_request_spool_threshold() -> Optional[int]:
+    """
+    Size in bytes above which structured uploads are spooled to a temporary file and parsed
+    from a memory map, configured in megabytes with the `DRUM_REQUEST_SPOOL_THRESHOLD_MB`
+    runtime parameter. Returns None when spooling is disabled, which is the default.
+    """
+    return _get_size_in_bytes("DRUM_REQUEST_SPOOL_THRESHOLD_MB")
+
+
+def get_max_request_body_size() -> Optional[int]:
+    """
+    Maximum request body size in bytes, configured in megabytes with the
+    `DRUM_MAX_REQUEST_BODY_MB` runtime parameter. Returns None when the size is not limited.
+    """
+    return _get_size_in_bytes("DRUM_MAX_REQUEST_BODY_MB")
+
+
+def memory_map_file(file_obj) -> mmap.mmap:
+    """Map a non-empty on-disk file read-only. The map stays valid after the file is closed."""
+    file_obj.flush()
+    return mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def spool_to_memory_map(stream) -> mmap.mmap:
+    """
+    Copy a binary stream to an anonymous temporary file in chunks and map it read-only, so the
+    payload is never held as a private bytes copy. The file is removed when the map is closed.
+    """
+    with tempfile.TemporaryFile() as spool_file:
+        shutil.copyfileobj(stream, spool_file, SPOOL_CHUNK_SIZE)
+        if spool_file.tell() == 0:
+            raise DrumCommonException("Can not spool an empty payload")
+        return memory_map_file(spool_file)
+
+
+def spool_file_storage(stream) -> mmap.mmap:
+    """
+    Memory map an uploaded file. Uploads which werkzeug already buffered to disk are mapped in
+    place, smaller ones are spooled to a temporary file first.
+    """
+    try:
+        stream.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        stream.seek(0)
+        return spool_to_memory_map(stream)
+    return memory_map_file(stream)
+
+
+def stream_size(stream) -> int:
+    """Size of a seekable stream, keeping its current position."""
+    position = stream.tell()
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(position)
+    return size
+
+
+class MemoryMappedReader(io.RawIOBase):
+    """
+    Binary stream over a memory map (or any other buffer) which reads straight from the
+    buffer, without a private copy of it and without moving the map's own position.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        size = max(0, min(len(b), len(self._view) - self._position))
+        b[:size] = self._view[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError("Invalid whence: {}".format(whence))
+        if position < 0:
+            raise ValueError("Negative seek position: {}".format(position))
+        self._position = position
+        return position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            # release the buffer export, otherwise the memory map can not be closed
+            self._view.release()
+        super().close()
+
+
+def open_payload(binary_data):
+    """Open a binary stream over a bytes or memory-mapped payload without copying it."""
+    if isinstance(binary_data, mmap.mmap):
+        return io.BufferedReader(MemoryMappedReader(binary_data), SPOOL_CHUNK_SIZE)
+    return io.BytesIO(binary_data)
@@ -4,8 +4,10 @@ All rights reserved.
 This is proprietary source code of DataRobot, Inc. and its affiliates.
 Released under the terms of DataRobot Tool and Utility Agreement.
 """
+import csv
 import io
 import os
+import zipfile
 
 import numpy as np
 import pandas as pd
@@ -13,15 +15,28 @@ from scipy.io import mmread
 
 from datarobot_drum.drum.common import get_drum_logger
 from datarobot_drum.drum.enum import (
+    CsvParserEngine,
     InputFormatToMimetype,
     PredictionServerMimetypes,
 )
 from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.drum.utils.json_utils import json_loads, json_payload_to_df
+from datarobot_drum.drum.utils.npz_utils import read_npz_payload
+from datarobot_drum.drum.utils.spooled_payload import memory_map_file, open_payload
+from datarobot_drum.runtime_parameters.runtime_parameters import RuntimeParameters
 
 
 logger = get_drum_logger(__name__)
 
 
+def _pyarrow_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
 class StructuredInputReadUtils:
     @staticmethod
     def read_structured_input_file_as_binary(filename):
@@ -44,6 +59,68 @@ class StructuredInputReadUtils:
             binary_data, mimetype, sparse_colnames
         )
 
+    @staticmethod
+    def _csv_file_has_single_column(filename):
+        if os.path.getsize(filename) == 0:
+            return False
+        with open(filename, "rb") as file, memory_map_file(file) as payload:
+            return StructuredInputReadUtils._has_single_column(payload)
+
+    @staticmethod
+    def read_csv_file_sample(filename, num_rows, random_state=None, chunksize=100000):
+        """
+        Uniform random sample of `num_rows` rows of a CSV file, without replacement. The file is
+        read in chunks, and every row gets a random key: only the rows with the smallest keys
+        seen so far are kept, so at most about 2 * `num_rows` + `chunksize` rows are in memory.
+
+        Returns the sampled rows in file order, indexed by their row position in the file.
+
+        Raises
+        ------
+        DrumCommonException
+            Raised when `num_rows` is not positive, or the file has less than `num_rows` rows.
+        """
+        if num_rows <= 0:
+            raise DrumCommonException(
+                "Number of rows to sample must be positive, got {}".format(num_rows)
+            )
+        random = np.random.RandomState(random_state)
+        kept, kept_keys = [], []
+        num_kept = total_rows = 0
+        threshold = 1.0
+
+        def _compact():
+            keys = np.concatenate(kept_keys)
+            smallest = np.argpartition(keys, num_rows - 1)[:num_rows]
+            sample = pd.concat(kept).iloc[smallest]
+            return [sample], [keys[smallest]], float(keys[smallest].max())
+
+        skip_blank_lines = not StructuredInputReadUtils._csv_file_has_single_column(filename)
+        with pd.read_csv(
+            filename, chunksize=chunksize, skip_blank_lines=skip_blank_lines
+        ) as reader:
+            for chunk in reader:
+                chunk.index = pd.RangeIndex(total_rows, total_rows + len(chunk))
+                total_rows += len(chunk)
+                keys = random.random_sample(len(chunk))
+                mask = keys < threshold
+                kept.append(chunk[mask])
+                kept_keys.append(keys[mask])
+                num_kept += int(mask.sum())
+                if num_kept >= 2 * num_rows:
+                    kept, kept_keys, threshold = _compact()
+                    num_kept = num_rows
+
+        if total_rows < num_rows:
+            raise DrumCommonException(
+                "Requested number of rows greater than data length {} > {}".format(
+                    num_rows, total_rows
+                )
+            )
+        if num_kept > num_rows:
+            kept, kept_keys, threshold = _compact()
+        return pd.concat(kept).sort_index()
+
     @staticmethod
     def resolve_mimetype_by_filename(filename):
         return InputFormatToMimetype.get(os.path.splitext(filename)[1])
@@ -59,28 +136,124 @@ class StructuredInputReadUtils:
             return StructuredInputReadUtils.read_sparse_column_data_as_list(f.read())
 
     @staticmethod
-    def read_structured_input_data_as_df(binary_data, mimetype, sparse_colnames=None):
+    def get_csv_engine():
+        """
+        Resolve the pandas CSV parser engine. It is configured with the `DRUM_CSV_ENGINE`
+        runtime parameter ('c', 'pyarrow' or 'python') and defaults to 'c'. The multithreaded
+        'pyarrow' engine requires the optional `pyarrow` package.
+        """
+        if not RuntimeParameters.has("DRUM_CSV_ENGINE"):
+            return CsvParserEngine.C
+
+        engine = str(RuntimeParameters.get("DRUM_CSV_ENGINE")).lower()
+        if engine not in CsvParserEngine.ALL:
+            raise DrumCommonException(
+                "Unsupported CSV engine '{}', supported engines: {}".format(
+                    engine, CsvParserEngine.ALL
+                )
+            )
+        if engine == CsvParserEngine.PYARROW and not _pyarrow_available():
+            logger.warning(
+                "CSV engine '%s' requires the 'pyarrow' package, falling back to '%s'",
+                engine,
+                CsvParserEngine.C,
+            )
+            return CsvParserEngine.C
+        return engine
+
+    @staticmethod
+    def _has_single_column(binary_data):
+        # Only the header line is parsed, which is enough to tell a single-column payload apart
+        # without parsing the whole payload twice.
+        with io.TextIOWrapper(open_payload(binary_data), encoding="utf-8", newline="") as text:
+            for row in csv.reader(text):
+                # leading blank lines are skipped, as pandas does when looking for the header
+                if row:
+                    return len(row) == 1
+        return False
+
+    @staticmethod
+    def _read_csv(binary_data, engine, dtype):
+        # If the DataFrame only contains a single column, treat blank lines as NANs
+        skip_blank_lines = True
+        if StructuredInputReadUtils._has_single_column(binary_data):
+            logger.info("Input data only contains a single column, treating blank lines as NaNs")
+            skip_blank_lines = False
+
+        if dtype:
+            try:
+                with open_payload(binary_data) as stream:
+                    return pd.read_csv(
+                        stream, engine=engine, dtype=dtype, skip_blank_lines=skip_blank_lines
+                    )
+            except (pd.errors.ParserError, UnicodeDecodeError):
+                raise
+            except (TypeError, ValueError) as e:
+                logger.warning("Failed to apply column dtypes, inferring them instead: %s", e)
+
+        with open_payload(binary_data) as stream:
+            return pd.read_csv(stream, engine=engine, skip_blank_lines=skip_blank_lines)
+
+    @staticmethod
+    def _read_json(binary_data, dtype):
+        try:
+            df = json_payload_to_df(json_loads(binary_data))
+        except ValueError as e:
+            # orjson.JSONDecodeError is a ValueError
+            raise DrumCommonException("Failed to read JSON input data: {}".format(e))
+
+        if dtype:
+            hinted = {column: dtype[column] for column in df.columns if column in dtype}
+            try:
+                df = df.astype(hinted)
+            except (TypeError, ValueError) as e:
+                logger.warning("Failed to apply column dtypes, inferring them instead: %s", e)
+        return df
+
+    @staticmethod
+    def _read_npz(binary_data, sparse_colnames):
+        try:
+            matrix, columns = read_npz_payload(binary_data)
+        except (KeyError, ValueError, zipfile.BadZipFile) as e:
+            raise DrumCommonException("Failed to read NPZ input data: {}".format(e))
+        return pd.DataFrame.sparse.from_spmatrix(matrix, columns=columns or sparse_colnames)
+
+    @staticmethod
+    def read_structured_input_data_as_df(binary_data, mimetype, sparse_colnames=None, dtype=None):
+        """
+        Parse a structured payload into a DataFrame.
+
+        Parameters
+        ----------
+        binary_data: bytes or mmap.mmap
+            The payload, a memory map when a large upload was spooled to disk
+        mimetype: str
+            The payload mimetype, CSV is assumed unless it is Matrix Market, NPZ or JSON
+        sparse_colnames: list, optional
+            Column names of a sparse payload, names embedded in an NPZ payload take precedence
+        dtype: dict, optional
+            Column name to dtype hints, e.g. from the model metadata.
+            Hinted CSV columns skip dtype inference.
+        """
         try:
             if mimetype == PredictionServerMimetypes.TEXT_MTX:
-                return pd.DataFrame.sparse.from_spmatrix(
-                    mmread(io.BytesIO(binary_data)), columns=sparse_colnames
-                )
+                with open_payload(binary_data) as stream:
+                    return pd.DataFrame.sparse.from_spmatrix(
+                        mmread(stream), columns=sparse_colnames
+                    )
+            elif mimetype == PredictionServerMimetypes.APPLICATION_X_NPZ:
+                return StructuredInputReadUtils._read_npz(binary_data, sparse_colnames)
+            elif mimetype == PredictionServerMimetypes.APPLICATION_JSON:
+                return StructuredInputReadUtils._read_json(binary_data, dtype)
             else:  # CSV format
+                engine = StructuredInputReadUtils.get_csv_engine()
                 try:
-                    df = pd.read_csv(io.BytesIO(binary_data))
+                    return StructuredInputReadUtils._read_csv(binary_data, engine, dtype)
                 except UnicodeDecodeError:
                     logger.error(
                         "A non UTF-8 encoding was encountered while opening the data.\nSave this using utf-8 encoding, for example with pandas to_csv('filename.csv', encoding='utf-8')."
                     )
                     raise DrumCommonException("Supplied CSV input file encoding must be UTF-8.")
-                # If the DataFrame only contains a single column, treat blank lines as NANs
-                if df.shape[1] == 1:
-                    logger.info(
-                        "Input data only contains a single column, treating blank lines as NaNs"
-                    )
-                    df = pd.read_csv(io.BytesIO(binary_data), skip_blank_lines=False)
-
-                return df
 
         except pd.errors.ParserError as e:
             raise DrumCommonException(
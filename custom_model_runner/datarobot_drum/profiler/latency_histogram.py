@@ -0,0 +1,81 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import math
+import threading
+from collections import Counter
+
+REPORTED_PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram(object):
+    """
+    Latency histogram with HDR-style log-linear buckets: every value is kept with
+    `significant_digits` of precision, so percentiles stay accurate in the tail while the
+    memory used only grows with the range of the values, not with their count.
+    Values are recorded in seconds and bucketed in microseconds. Recording is thread-safe.
+    """
+
+    UNITS_PER_SECOND = 1000000
+
+    def __init__(self, significant_digits=3):
+        # Values below 2 * 10^digits are kept exactly, larger ones are truncated to as many bits.
+        self._sub_bucket_bits = int(math.ceil(math.log2(2 * 10**significant_digits)))
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self.count = 0
+        self._total = 0
+        self._min = None
+        self._max = None
+
+    def _bucket(self, value):
+        shift = max(0, value.bit_length() - self._sub_bucket_bits)
+        return (value >> shift) << shift, (1 << shift) - 1
+
+    def record(self, seconds):
+        value = max(0, int(round(seconds * self.UNITS_PER_SECOND)))
+        bucket, _ = self._bucket(value)
+        with self._lock:
+            self._counts[bucket] += 1
+            self.count += 1
+            self._total += value
+            self._min = value if self._min is None else min(self._min, value)
+            self._max = value if self._max is None else max(self._max, value)
+
+    @property
+    def min(self):
+        return None if self._min is None else self._min / self.UNITS_PER_SECOND
+
+    @property
+    def max(self):
+        return None if self._max is None else self._max / self.UNITS_PER_SECOND
+
+    @property
+    def mean(self):
+        return None if self.count == 0 else self._total / self.count / self.UNITS_PER_SECOND
+
+    def percentile(self, percentile):
+        """
+        Value in seconds below which `percentile` percent of the recorded values fall, reported
+        as the highest value of its bucket, as HDR histograms do.
+        """
+        if self.count == 0:
+            return None
+        # rounded so that e.g. the 99.9th percentile of 1000 values is the 999th one
+        rank = max(1, int(math.ceil(round(percentile * self.count / 100.0, 6))))
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                _, width = self._bucket(bucket)
+                return min(bucket + width, self._max) / self.UNITS_PER_SECOND
+        return self.max
+
+    def to_dict(self):
+        report = {"count": self.count, "min": self.min, "mean": self.mean, "max": self.max}
+        for percentile in REPORTED_PERCENTILES:
+            report["p{:g}".format(percentile)] = self.percentile(percentile)
+        return report
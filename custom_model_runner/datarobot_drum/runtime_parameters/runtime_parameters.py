@@ -4,6 +4,7 @@ All rights reserved.
 This is proprietary source code of DataRobot, Inc. and its affiliates.
 Released under the terms of DataRobot Tool and Utility Agreement.
 """
+import copy
 import json
 import os
 from collections import namedtuple
@@ -47,6 +48,11 @@ class RuntimeParameters:
 
     PARAM_PREFIX = "MLOPS_RUNTIME_PARAM"
 
+    # Parsed and validated payloads, with the environment value they were parsed from:
+    # {namespaced param name: (environment value, payload)}. A parameter is only parsed again
+    # when its environment value changes, so reading it on every request is a lookup.
+    _parsed_values = {}
+
     @classmethod
     def get(cls, key):
         """
@@ -74,14 +80,55 @@ class RuntimeParameters:
             Raised if the value of the parameter doesn't match the declared type
         """
         runtime_param_key = cls.namespaced_param_name(key)
-        if runtime_param_key not in os.environ:
+        raw_value = os.environ.get(runtime_param_key)
+        if raw_value is None:
             raise ValueError(f"Runtime parameter '{key}' does not exist!")
 
+        parsed = cls._parsed_values.get(runtime_param_key)
+        if parsed is None or parsed[0] != raw_value:
+            parsed = (raw_value, cls._parse_payload(raw_value))
+            cls._parsed_values[runtime_param_key] = parsed
+        payload = parsed[1]
+        # the cached payload must not be modified by the caller
+        return copy.deepcopy(payload) if isinstance(payload, (dict, list)) else payload
+
+    @classmethod
+    def get_positive_int(cls, key, default=None):
+        """
+        Fetches a runtime parameter holding a positive integer, as a string or a numeric value.
+
+        Parameters
+        ----------
+        key: str
+            The name of the runtime parameter
+        default:
+            Returned when the parameter is not set
+
+        Raises
+        ------
+        InvalidRuntimeParam
+            Raised if the value of the parameter is not a positive integer
+        """
+        if not cls.has(key):
+            return default
+        raw_value = cls.get(key)
+        try:
+            value = int(raw_value)
+        except (TypeError, ValueError):
+            value = 0
+        if value <= 0:
+            raise InvalidRuntimeParam(
+                f"Runtime parameter {key} must be a positive integer, got: {raw_value}"
+            )
+        return value
+
+    @staticmethod
+    def _parse_payload(raw_value):
         try:
-            env_value = json.loads(os.environ[runtime_param_key])
+            env_value = json.loads(raw_value)
         except json.decoder.JSONDecodeError:
             raise InvalidJsonException(
-                f"Invalid runtime parameter json payload. payload={os.environ[runtime_param_key]}"
+                f"Invalid runtime parameter json payload. payload={raw_value}"
             )
 
         try:
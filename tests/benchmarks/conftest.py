@@ -0,0 +1,17 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import numpy as np
+import pandas as pd
+
+from datarobot_drum.drum.description import version as drum_version
+
+
+def pytest_benchmark_update_machine_info(config, machine_info):
+    # Saved with the results, so runs of different DRUM versions can be told apart when compared
+    machine_info["datarobot_drum"] = drum_version
+    machine_info["numpy"] = np.__version__
+    machine_info["pandas"] = pd.__version__
@@ -0,0 +1,55 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import numpy as np
+import pandas as pd
+
+# Synthetic data shapes shared by the benchmarks: (rows, columns)
+SHAPES = {"narrow": (10000, 10), "wide": (1000, 1000), "single": (100000, 1)}
+DTYPES = ["float", "int", "str", "mixed"]
+
+
+def make_column(rng, num_rows, dtype):
+    if dtype == "float":
+        return rng.random(num_rows)
+    if dtype == "int":
+        return rng.integers(0, 1000, num_rows)
+    if dtype == "str":
+        return np.array([f"category_{i}" for i in range(50)])[rng.integers(0, 50, num_rows)]
+    raise ValueError(f"Unknown dtype: {dtype}")
+
+
+def make_dataframe(num_rows, num_columns, dtype="float", seed=42):
+    """
+    Synthetic DataFrame of `num_rows` x `num_columns`, all of `dtype` ("float", "int" or "str"),
+    or "mixed": the column types cycle through float, int and str.
+    """
+    rng = np.random.default_rng(seed)
+    column_dtypes = ["float", "int", "str"] if dtype == "mixed" else [dtype]
+    return pd.DataFrame(
+        {
+            f"c{i}": make_column(rng, num_rows, column_dtypes[i % len(column_dtypes)])
+            for i in range(num_columns)
+        }
+    )
+
+
+def pandas_dtypes(df):
+    """Column dtype hints for `df`, as in `inferenceModel.columnDtypes`."""
+    return {column: str(dtype) for column, dtype in df.dtypes.items()}
+
+
+def make_predictions(num_rows, num_classes=None, dtype="float64", seed=42):
+    """
+    Synthetic model output: a 1-d array for regression (`num_classes` None), or rows of
+    probabilities summing to one and the class labels for classification.
+    """
+    rng = np.random.default_rng(seed)
+    if num_classes is None:
+        return rng.random(num_rows).astype(dtype), None
+    probabilities = rng.random((num_rows, num_classes))
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    return probabilities.astype(dtype), [f"class_{i}" for i in range(num_classes)]
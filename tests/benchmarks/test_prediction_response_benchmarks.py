@@ -0,0 +1,86 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import pandas as pd
+import pytest
+
+from datarobot_drum.drum.data_marshalling import marshal_predictions
+from datarobot_drum.drum.enum import PRED_COLUMN, TargetType
+from datarobot_drum.drum.language_predictors.base_language_predictor import PredictResponse
+from datarobot_drum.drum.root_predictors.deployment_config_helpers import (
+    build_pps_response_json_str,
+)
+from datarobot_drum.drum.root_predictors.predict_mixin import PredictMixin
+from tests.benchmarks.helpers import make_dataframe, make_predictions
+
+pytest.importorskip("pytest_benchmark")
+
+# target type -> number of classes of the model output
+TARGETS = {
+    TargetType.REGRESSION: None,
+    TargetType.BINARY: 2,
+    TargetType.MULTICLASS: 10,
+}
+
+
+def make_predict_response(target_type, num_rows, dtype="float64", num_extra_columns=0):
+    predictions, labels = make_predictions(num_rows, TARGETS[target_type], dtype)
+    predictions_df = pd.DataFrame(predictions, columns=labels or [PRED_COLUMN])
+    extra_model_output = (
+        make_dataframe(num_rows, num_extra_columns, "mixed") if num_extra_columns else None
+    )
+    return PredictResponse(predictions_df, extra_model_output)
+
+
+@pytest.mark.parametrize("target_type", list(TARGETS), ids=str)
+@pytest.mark.parametrize("num_rows", [1000, 100000])
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_marshal_predictions(benchmark, target_type, num_rows, dtype):
+    predictions, labels = make_predictions(num_rows, TARGETS[target_type], dtype)
+    benchmark.group = f"marshal_predictions-{target_type}-{num_rows}"
+
+    predictions_df = benchmark(marshal_predictions, labels, predictions, target_type)
+
+    assert len(predictions_df) == num_rows
+
+
+@pytest.mark.parametrize("target_type", list(TARGETS), ids=str)
+@pytest.mark.parametrize("num_rows", [1000, 100000])
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+@pytest.mark.parametrize("num_extra_columns", [0, 5], ids=["no_extra", "extra"])
+def test_build_drum_response_json_str(benchmark, target_type, num_rows, dtype, num_extra_columns):
+    predict_response = make_predict_response(target_type, num_rows, dtype, num_extra_columns)
+    benchmark.group = f"drum_response_json-{target_type}-{num_rows}"
+
+    response = benchmark(PredictMixin._build_drum_response_json_str, predict_response)
+
+    assert response.startswith('{"predictions":')
+
+
+@pytest.mark.parametrize("target_type", list(TARGETS), ids=str)
+@pytest.mark.parametrize("num_rows", [1000, 10000])
+@pytest.mark.parametrize("num_extra_columns", [0, 5], ids=["no_extra", "extra"])
+def test_build_pps_response_json_str(benchmark, target_type, num_rows, num_extra_columns):
+    predict_response = make_predict_response(
+        target_type, num_rows, num_extra_columns=num_extra_columns
+    )
+    labels = list(predict_response.predictions.columns)
+    deployment_config = {
+        "target": {
+            "name": "target",
+            "class_mapping": [[label, i] for i, label in enumerate(labels)]
+            if TARGETS[target_type]
+            else None,
+            "prediction_threshold": 0.5,
+        }
+    }
+    benchmark.group = f"pps_response_json-{target_type}-{num_rows}"
+
+    response = benchmark(
+        build_pps_response_json_str, predict_response, deployment_config, target_type
+    )
+
+    assert response.startswith('{"data":')
@@ -0,0 +1,45 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from datarobot_drum import RuntimeParameters
+from datarobot_drum.runtime_parameters.runtime_parameters_schema import RuntimeParameterTypes
+
+pytest.importorskip("pytest_benchmark")
+
+PAYLOADS = {
+    RuntimeParameterTypes.STRING: "Some string value",
+    RuntimeParameterTypes.BOOLEAN: True,
+    RuntimeParameterTypes.NUMERIC: 10,
+    RuntimeParameterTypes.CREDENTIAL: {
+        "credentialType": "s3",
+        "region": "us-west",
+        "awsAccessKeyId": "123aaa",
+        "awsSecretAccessKey": "3425sdd",
+        "awsSessionToken": "12345abcde",
+    },
+}
+
+
+@pytest.mark.parametrize("param_type", list(PAYLOADS), ids=lambda t: t.value)
+def test_get(benchmark, param_type):
+    name = "BENCHMARK_PARAM"
+    env_value = json.dumps({"type": param_type.value, "payload": PAYLOADS[param_type]})
+    benchmark.group = "runtime_parameters_get"
+
+    with patch.dict(os.environ, {RuntimeParameters.namespaced_param_name(name): env_value}):
+        assert benchmark(RuntimeParameters.get, name) == PAYLOADS[param_type]
+
+
+def test_has_missing(benchmark):
+    benchmark.group = "runtime_parameters_get"
+
+    assert not benchmark(RuntimeParameters.has, "BENCHMARK_MISSING_PARAM")
@@ -0,0 +1,42 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import pytest
+
+from datarobot_drum.drum.typeschema_validation import SchemaValidator
+from tests.benchmarks.helpers import DTYPES, SHAPES, make_dataframe
+
+pytest.importorskip("pytest_benchmark")
+
+# input requirements accepting every synthetic DataFrame, so all the validators run to the end
+INPUT_REQUIREMENTS = [
+    {"field": "data_types", "condition": "IN", "value": ["NUM", "CAT", "TXT"]},
+    {"field": "sparse", "condition": "EQUALS", "value": "SUPPORTED"},
+    {"field": "number_of_columns", "condition": "GREATER_THAN", "value": 0},
+    {"field": "contains_missing", "condition": "EQUALS", "value": "SUPPORTED"},
+]
+
+
+@pytest.mark.parametrize("shape", ["narrow", "wide"])
+@pytest.mark.parametrize("dtype", DTYPES)
+def test_validate_inputs(benchmark, shape, dtype):
+    num_rows, num_columns = SHAPES[shape]
+    df = make_dataframe(num_rows, num_columns, dtype)
+    validator = SchemaValidator({"input_requirements": INPUT_REQUIREMENTS})
+    benchmark.group = f"validate_inputs-{num_rows}x{num_columns}"
+
+    assert benchmark(validator.validate_inputs, df)
+
+
+@pytest.mark.parametrize("requirement", INPUT_REQUIREMENTS, ids=lambda r: r["field"])
+@pytest.mark.parametrize("dtype", ["float", "str"])
+def test_validate_inputs_per_field(benchmark, requirement, dtype):
+    num_rows, num_columns = SHAPES["narrow"]
+    df = make_dataframe(num_rows, num_columns, dtype)
+    validator = SchemaValidator({"input_requirements": [requirement]})
+    benchmark.group = f"validate_inputs-{requirement['field']}"
+
+    assert benchmark(validator.validate_inputs, df)
@@ -0,0 +1,62 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import pytest
+
+from datarobot_drum.drum.enum import CsvParserEngine, PredictionServerMimetypes
+from datarobot_drum.drum.utils.structured_input_read_utils import StructuredInputReadUtils
+from tests.benchmarks.helpers import DTYPES, SHAPES, make_dataframe, pandas_dtypes
+from tests.unit.datarobot_drum.drum.helpers import (
+    inject_runtime_parameter,
+    unset_runtime_parameter,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+
+def make_csv_payload(num_rows, num_columns, dtype="float"):
+    df = make_dataframe(num_rows, num_columns, dtype)
+    return df.to_csv(index=False).encode("utf-8"), pandas_dtypes(df)
+
+
+@pytest.fixture(params=[CsvParserEngine.C, CsvParserEngine.PYARROW])
+def csv_engine(request):
+    if request.param == CsvParserEngine.PYARROW:
+        pytest.importorskip("pyarrow")
+    inject_runtime_parameter("DRUM_CSV_ENGINE", request.param)
+    yield request.param
+    unset_runtime_parameter("DRUM_CSV_ENGINE")
+
+
+@pytest.mark.parametrize("shape", ["narrow", "wide"])
+@pytest.mark.parametrize("dtype", DTYPES)
+@pytest.mark.parametrize("use_dtype_hints", [False, True], ids=["inferred", "hinted"])
+def test_read_csv_payload(benchmark, csv_engine, shape, dtype, use_dtype_hints):
+    num_rows, num_columns = SHAPES[shape]
+    binary_data, dtypes = make_csv_payload(num_rows, num_columns, dtype)
+    benchmark.group = f"read_csv-{num_rows}x{num_columns}-{dtype}"
+
+    df = benchmark(
+        StructuredInputReadUtils.read_structured_input_data_as_df,
+        binary_data,
+        PredictionServerMimetypes.TEXT_CSV,
+        dtype=dtypes if use_dtype_hints else None,
+    )
+
+    assert df.shape == (num_rows, num_columns)
+
+
+def test_read_single_column_csv_payload(benchmark, csv_engine):
+    num_rows, num_columns = SHAPES["single"]
+    binary_data, _ = make_csv_payload(num_rows, num_columns)
+
+    df = benchmark(
+        StructuredInputReadUtils.read_structured_input_data_as_df,
+        binary_data,
+        PredictionServerMimetypes.TEXT_CSV,
+    )
+
+    assert df.shape == (num_rows, num_columns)
@@ -0,0 +1,33 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import numpy as np
+import pytest
+
+from datarobot_drum.custom_task_interfaces.user_secrets import scrub_values_from_string
+
+pytest.importorskip("pytest_benchmark")
+
+
+def make_log_message(length, secrets, seed=42):
+    """Random words of about `length` characters, with every secret appearing once."""
+    rng = np.random.default_rng(seed)
+    words = ["".join(rng.choice(list("abcdefghijklmnop"), 8)) for _ in range(length // 9)]
+    for secret in secrets:
+        words.insert(int(rng.integers(0, len(words) + 1)), secret)
+    return " ".join(words)
+
+
+@pytest.mark.parametrize("num_secrets", [1, 10, 100])
+@pytest.mark.parametrize("length", [200, 10000, 1000000], ids=["short", "long", "huge"])
+def test_scrub_values_from_string(benchmark, num_secrets, length):
+    secrets = [f"secret-value-{i:04d}" for i in range(num_secrets)]
+    message = make_log_message(length, secrets)
+    benchmark.group = f"scrub_values_from_string-{length}"
+
+    scrubbed = benchmark(scrub_values_from_string, secrets, message)
+
+    assert "secret-value" not in scrubbed
@@ -7,11 +7,12 @@ from pathlib import Path
 
 import pytest
 from unittest.mock import patch
-from datarobot_storage.amazon import S3Storage
 
 from datarobot_drum.drum.lazy_loading.constants import BackendType
 from datarobot_drum.drum.lazy_loading.constants import EnumEncoder
 from datarobot_drum.drum.lazy_loading.constants import LazyLoadingEnvVars
+from datarobot_drum.drum.lazy_loading.downloader import RemoteObject
+from datarobot_drum.drum.lazy_loading.downloader import S3RemoteFiles
 from datarobot_drum.drum.lazy_loading.lazy_loading_handler import LazyLoadingHandler
 from datarobot_drum.drum.lazy_loading.schema import LazyLoadingRepository
 from datarobot_drum.drum.lazy_loading.schema import S3Credentials
@@ -99,27 +100,33 @@ class TestDownloadFromS3:
     def test_download_success(self, lazy_loading_data, repository_credential_data, tmpdir, caplog):
         """
         The test validates that the download process is successful and the files are
-        downloaded. It mocks the S3Storage.get method to simulate the download process, which is
-        a synchronous operation. This operation is being executed using async.io, which is covered
-        by the datarobot_storage library.
+        downloaded. It mocks the S3RemoteFiles methods to simulate the download process, which are
+        synchronous operations. They are executed concurrently by the LazyLoadingDownloader.
         Note that the use of tim.sleep(0.01) is required to test the logging order.
         """
+        content = b"dummy content"
 
-        def mock_s3_storage_get_method(remote_path, local_path):
+        def mock_head_method(remote_path):
+            return RemoteObject(size=len(content), etag='"dummy-etag"')
+
+        def mock_download_range_method(remote_path, etag, offset, size, local_path):
             logger.info(
                 "Start downloading file from  S3.",
                 extra={"remote_path": remote_path, "local_path": local_path},
             )
             # Simulate a download delay - it's required to test the logging order
             time.sleep(0.01)
-            with open(local_path, "w") as file:
-                file.write("dummy content")
+            with open(local_path, "r+b") as file:
+                file.seek(offset)
+                file.write(content[offset : offset + size])
             logger.info(
                 "Finished downloading file from S3.",
                 extra={"remote_path": remote_path, "local_path": local_path},
             )
 
-        with patch.object(S3Storage, "get", side_effect=mock_s3_storage_get_method):
+        with patch.object(S3RemoteFiles, "head", side_effect=mock_head_method), patch.object(
+            S3RemoteFiles, "download_range", side_effect=mock_download_range_method
+        ):
             handler = LazyLoadingHandler()
             handler.download_lazy_loading_files()
         assert handler.is_lazy_loading_available
@@ -5,15 +5,21 @@
 #  This is proprietary source code of DataRobot, Inc. and its affiliates.
 #  Released under the terms of DataRobot Tool and Utility Agreement.
 #
+import os
+import pickle
+import sys
 from unittest.mock import patch, Mock
 
+import numpy as np
 import pytest
 
 from datarobot_drum.custom_task_interfaces.custom_task_interface import (
     CustomTaskInterface,
+    Serializable,
     secrets_injection_context,
 )
 from datarobot_drum.custom_task_interfaces.user_secrets import BasicSecret
+from datarobot_drum.drum.exceptions import DrumSerializationError
 
 
 @pytest.fixture
@@ -83,3 +89,92 @@ class TestSecretsInjectionContext:
         with secrets_injection_context(CustomTaskInterface(), Mock(), Mock()):
             mock_reset_outputs_to_allow_secrets.assert_not_called()
         mock_reset_outputs_to_allow_secrets.assert_called_once_with()
+
+
+class ArrayTask(CustomTaskInterface):
+    def __init__(self):
+        self.weights = np.arange(100000, dtype=np.float64).reshape(1000, 100)
+        self.small = np.arange(3)
+        self.name = "task"
+
+
+class CompressedTask(ArrayTask):
+    artifact_compression = "lz4"
+
+
+class TestSerializable:
+    def _assert_loaded(self, loaded):
+        assert isinstance(loaded, ArrayTask)
+        np.testing.assert_array_equal(loaded.weights, ArrayTask().weights)
+        np.testing.assert_array_equal(loaded.small, ArrayTask().small)
+        assert loaded.name == "task"
+
+    def test_arrays_are_saved_out_of_band(self, tmp_path):
+        ArrayTask().save(str(tmp_path))
+
+        assert sorted(os.listdir(tmp_path)) == [
+            Serializable.default_buffers_filename,
+            Serializable.default_artifact_filename,
+        ]
+        assert os.path.getsize(tmp_path / Serializable.default_artifact_filename) < 1000
+
+    def test_load_memory_maps_arrays(self, tmp_path):
+        ArrayTask().save(str(tmp_path))
+
+        loaded = ArrayTask.load(str(tmp_path))
+
+        self._assert_loaded(loaded)
+        assert not loaded.weights.flags.owndata
+        assert loaded.weights.flags.writeable
+        assert loaded.weights.ctypes.data % 64 == 0
+        loaded.weights[0, 0] = -1
+        assert ArrayTask.load(str(tmp_path)).weights[0, 0] == 0
+
+    @pytest.mark.parametrize("compression, package", [("lz4", "lz4"), ("zstd", "zstandard")])
+    def test_compression(self, tmp_path, compression, package):
+        pytest.importorskip(package)
+        ArrayTask().save_task(str(tmp_path), compression=compression)
+
+        loaded = ArrayTask.load(str(tmp_path))
+
+        self._assert_loaded(loaded)
+        assert loaded.weights.flags.writeable
+
+    def test_compression_class_attribute(self, tmp_path):
+        with patch.dict(sys.modules, {"lz4": None, "lz4.frame": None}):
+            with pytest.raises(DrumSerializationError, match="requires the lz4 package"):
+                CompressedTask().save(str(tmp_path))
+        assert os.listdir(tmp_path) == []
+
+    def test_unsupported_compression(self, tmp_path):
+        with pytest.raises(DrumSerializationError, match="Unsupported task artifact compression"):
+            ArrayTask().save_task(str(tmp_path), compression="gzip")
+
+    def test_exclude(self, tmp_path):
+        task = ArrayTask()
+        task.save_task(str(tmp_path), exclude=["weights"])
+
+        assert task.weights is not None
+        assert ArrayTask.load(str(tmp_path)).weights is None
+
+    def test_removes_stale_buffers(self, tmp_path):
+        ArrayTask().save(str(tmp_path))
+        task = ArrayTask()
+        task.weights = task.small = None
+        task.save(str(tmp_path))
+
+        assert os.listdir(tmp_path) == [Serializable.default_artifact_filename]
+        assert ArrayTask.load(str(tmp_path)).weights is None
+
+    def test_loads_in_band_pickle(self, tmp_path):
+        with open(tmp_path / Serializable.default_artifact_filename, "wb") as fp:
+            pickle.dump(ArrayTask(), fp, protocol=4)
+
+        self._assert_loaded(ArrayTask.load(str(tmp_path)))
+
+    def test_missing_buffers(self, tmp_path):
+        ArrayTask().save(str(tmp_path))
+        os.remove(tmp_path / Serializable.default_buffers_filename)
+
+        with pytest.raises(DrumSerializationError, match="refers to out-of-band buffers"):
+            ArrayTask.load(str(tmp_path))
@@ -108,6 +108,19 @@ class TestOrderIntuition:
                 target_name="Species",
             )
 
+    def test_missing_target_column(self):
+        with NamedTemporaryFile(suffix=".csv") as input_file:
+            pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}).to_csv(input_file.name, index=False)
+
+            with pytest.raises(
+                DrumCommonException, match=r"The columns in your dataframe are these: \['a', 'b'\]"
+            ):
+                possibly_intuit_order(
+                    input_filename=input_file.name,
+                    target_type=TargetType.BINARY,
+                    target_name="Species",
+                )
+
     def test_unsupervised(self):
         classes = possibly_intuit_order(
             input_filename=self.regression_filename,
@@ -204,6 +204,73 @@ class TestDrumFitAdapterSampling(object):
             )
 
 
+class TestDrumFitAdapterSamplingWhileReading(object):
+    def test_only_sample_is_read(self, dense_csv_with_target_and_weights, target_col_name):
+        drum_cli_adapter = DrumFitAdapter(
+            custom_task_folder_path="path/to/nothing",
+            input_filename=dense_csv_with_target_and_weights,
+            target_type=TargetType.REGRESSION,
+            target_name=target_col_name,
+            num_rows="4",
+        )
+
+        assert len(drum_cli_adapter.input_dataframe) == 4
+        sampled_x = drum_cli_adapter.sample_data_if_necessary(drum_cli_adapter.X)
+        sampled_y = drum_cli_adapter.sample_data_if_necessary(drum_cli_adapter.y)
+        assert sampled_x.index.equals(drum_cli_adapter.input_dataframe.index)
+        assert sampled_y.index.equals(drum_cli_adapter.input_dataframe.index)
+
+    def test_target_file_is_aligned_with_sample(
+        self, dense_csv, target_csv, col_data, target_data_offset
+    ):
+        drum_cli_adapter = DrumFitAdapter(
+            custom_task_folder_path="path/to/nothing",
+            input_filename=dense_csv,
+            target_type=TargetType.REGRESSION,
+            target_filename=target_csv,
+            num_rows=4,
+        )
+
+        sampled_x = drum_cli_adapter.sample_data_if_necessary(drum_cli_adapter.X)
+        sampled_y = drum_cli_adapter.sample_data_if_necessary(drum_cli_adapter.y)
+
+        assert len(sampled_y) == 4
+        assert sampled_y.index.equals(sampled_x.index)
+        np.testing.assert_allclose(
+            sampled_y.values, sampled_x.iloc[:, -1].values + target_data_offset
+        )
+
+    def test_missing_data_is_not_sampled(self, dense_csv):
+        drum_cli_adapter = DrumFitAdapter(
+            custom_task_folder_path="path/to/nothing",
+            input_filename=dense_csv,
+            target_type=TargetType.ANOMALY,
+            num_rows=4,
+        )
+
+        assert drum_cli_adapter.sample_data_if_necessary(None) is None
+
+
+class TestDrumFitAdapterDowncastDtypes(object):
+    @pytest.mark.parametrize("downcast_dtypes", [False, True])
+    def test_downcast_features(
+        self, dense_csv_with_target_and_weights, target_col_name, weights_col_name, downcast_dtypes
+    ):
+        drum_cli_adapter = DrumFitAdapter(
+            custom_task_folder_path="path/to/nothing",
+            input_filename=dense_csv_with_target_and_weights,
+            target_type=TargetType.REGRESSION,
+            target_name=target_col_name,
+            weights_name=weights_col_name,
+            downcast_dtypes=downcast_dtypes,
+        )
+
+        expected_dtype = np.int32 if downcast_dtypes else np.int64
+        assert all(dtype == expected_dtype for dtype in drum_cli_adapter.X.dtypes)
+        assert drum_cli_adapter.y.dtype == np.float64
+        assert drum_cli_adapter.weights.dtype == np.float64
+
+
 class TestDrumFitAdapterParameters(object):
     @pytest.fixture
     def parameters(self):
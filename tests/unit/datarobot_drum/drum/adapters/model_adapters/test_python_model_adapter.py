@@ -6,6 +6,7 @@
 #  Released under the terms of DataRobot Tool and Utility Agreement.
 #
 import contextlib
+import io
 import json
 import logging
 import os
@@ -475,6 +476,65 @@ class TestPythonModelAdapterPrivateHelpers:
         assert str(exc_info.value) == "My post process error"
 
 
+class TestDataFrameInput:
+    @pytest.fixture
+    def adapter(self):
+        adapter = TestingPythonModelAdapter("dummy_dir", TargetType.REGRESSION)
+        adapter._custom_task_class = None
+        return adapter
+
+    @pytest.fixture
+    def input_df(self):
+        return pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    def test_predict_uses_dataframe_as_is(self, adapter, input_df):
+        score = Mock(return_value=pd.DataFrame({"Predictions": [1.0, 2.0, 3.0]}))
+        adapter._custom_hooks[CustomHooks.SCORE] = score
+
+        with patch.object(adapter, "load_data") as mock_load_data:
+            response = adapter.predict(dataframe=input_df)
+
+        mock_load_data.assert_not_called()
+        assert score.call_args[0][0] is input_df
+        assert "dataframe" not in score.call_args[1]
+        np.testing.assert_array_equal(response.predictions, [[1.0], [2.0], [3.0]])
+
+    def test_transform_uses_dataframe_as_is(self, adapter, input_df):
+        adapter._target_type = TargetType.TRANSFORM
+        adapter._custom_hooks[CustomHooks.TRANSFORM] = lambda data, model: data.assign(c=1)
+
+        with patch.object(adapter, "load_data") as mock_load_data:
+            output_data, output_target = adapter.transform(dataframe=input_df)
+
+        mock_load_data.assert_not_called()
+        assert list(output_data.columns) == ["a", "b", "c"]
+        assert output_target is None
+
+
+class TestStreamingUnstructuredHook:
+    @pytest.fixture
+    def adapter(self):
+        return TestingPythonModelAdapter("dummy_dir", TargetType.UNSTRUCTURED)
+
+    def test_hook_declaring_stream(self, adapter):
+        def score_unstructured(model, data, stream, **kwargs):
+            return stream.read().upper()
+
+        adapter._custom_hooks[CustomHooks.SCORE_UNSTRUCTURED] = score_unstructured
+
+        assert adapter.has_streaming_unstructured_hook()
+        assert adapter.predict_unstructured(None, None, stream=io.BytesIO(b"abc")) == b"ABC"
+
+    @pytest.mark.parametrize(
+        "hook",
+        [None, lambda model, data, **kwargs: data, lambda model, data, query: data],
+    )
+    def test_regular_hook(self, adapter, hook):
+        adapter._custom_hooks[CustomHooks.SCORE_UNSTRUCTURED] = hook
+
+        assert not adapter.has_streaming_unstructured_hook()
+
+
 class TestPredictResultSplitter:
     """
     Test the method that takes the predict output DataFrame and splits it to predictions DataFrame
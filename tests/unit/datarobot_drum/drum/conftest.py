@@ -163,3 +163,5 @@ def prediction_server(test_flask_app, chat_python_model_adapter):
         server = PredictionServer(params)
         server._predictor._mlops = Mock()
         server.materialize()
+    yield server
+    server._resource_monitor.stop()
@@ -1,7 +1,10 @@
 import json
 import os
+import threading
+import time
 import typing
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -154,3 +157,127 @@ class TestVLLMPredictor:
         assert predictor.health_route == "/health"
         assert predictor.openai_port == "45678"
         assert predictor.openai_host == "mocked.openai.host"
+
+
+class TestTextGenerationPredict:
+    @pytest.fixture
+    def predictor(self, mock_target_name_env_var):
+        predictor = TestGPUPredictor()
+        predictor.configure(
+            {
+                "target_type": TargetType.TEXT_GENERATION,
+                "__custom_model_path__": "/opt/code/custom.py",
+            }
+        )
+        predictor.ai_client = Mock()
+        return predictor
+
+    @staticmethod
+    def _completion(content):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    @staticmethod
+    def _predict(predictor, prompts):
+        data = "promptText\n" + "".join("{}\n".format(prompt) for prompt in prompts)
+        return predictor._predict(binary_data=data.encode("utf8")).predictions.tolist()
+
+    def test_default_max_concurrent_completions(self, predictor):
+        assert predictor.max_concurrent_completions == 16
+
+    def test_max_concurrent_completions_runtime_parameter(self):
+        with patch.dict(
+            os.environ,
+            {
+                rt_param_name("max_concurrent_completions"): rt_param_value(
+                    RuntimeParameterTypes.NUMERIC.value, 3
+                )
+            },
+        ):
+            assert TestGPUPredictor().max_concurrent_completions == 3
+
+    def test_concurrent_completions_keep_row_order(self, predictor):
+        predictor.max_concurrent_completions = 4
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def create(messages, **kwargs):
+            prompt = messages[0]["content"]
+            with lock:
+                in_flight.append(prompt)
+                max_in_flight.append(len(in_flight))
+            # later rows complete first
+            time.sleep(0.02 * (20 - int(prompt)) / 20)
+            with lock:
+                in_flight.remove(prompt)
+            return self._completion("answer " + prompt)
+
+        predictor.ai_client.chat.completions.create.side_effect = create
+
+        predictions = self._predict(predictor, range(20))
+
+        assert predictions == ["answer {}".format(i) for i in range(20)]
+        assert 1 < max(max_in_flight) <= 4
+
+    def test_failed_row_does_not_fail_the_others(self, predictor):
+        def create(messages, **kwargs):
+            if messages[0]["content"] == "bad":
+                raise RuntimeError("completion failed")
+            return self._completion("ok")
+
+        predictor.ai_client.chat.completions.create.side_effect = create
+
+        assert self._predict(predictor, ["a", "bad", "b"]) == ["ok", None, "ok"]
+
+    def test_raises_when_every_row_fails(self, predictor):
+        predictor.ai_client.chat.completions.create.side_effect = RuntimeError("server is down")
+
+        with pytest.raises(RuntimeError, match="server is down"):
+            self._predict(predictor, ["a", "b"])
+
+
+class TestHealthCheck:
+    @pytest.fixture
+    def predictor(self, mock_target_name_env_var):
+        predictor = TestGPUPredictor()
+        predictor._check_server_health = Mock(return_value=({"message": "OK"}, 200))
+        yield predictor
+        if predictor._health_poller is not None:
+            predictor._health_poller.stop()
+            predictor._health_poller._thread.join()
+
+    def test_probes_are_answered_from_the_polled_health(self, predictor):
+        for _ in range(10):
+            assert BaseOpenAiGpuPredictor.health_check(predictor) == ({"message": "OK"}, 200)
+
+        # the first probe checks the server and starts the poller, which waits for its interval
+        predictor._check_server_health.assert_called_once()
+        assert predictor._health_poller.interval == 5
+        assert predictor._health_poller.max_staleness == 30
+
+    def test_polling_disabled(self, mock_target_name_env_var):
+        with patch.dict(
+            os.environ,
+            {
+                rt_param_name("health_check_interval_sec"): rt_param_value(
+                    RuntimeParameterTypes.NUMERIC.value, 0
+                )
+            },
+        ):
+            predictor = TestGPUPredictor()
+        predictor._check_server_health = Mock(return_value=({"message": "OK"}, 200))
+
+        for _ in range(3):
+            BaseOpenAiGpuPredictor.health_check(predictor)
+
+        assert predictor._check_server_health.call_count == 3
+        assert predictor._health_poller is None
+
+    def test_crashed_server_is_reported_without_polling(self, predictor):
+        predictor.openai_process = Mock()
+
+        with patch.object(BaseOpenAiGpuPredictor, "_check_process", return_value=False):
+            _, status = BaseOpenAiGpuPredictor.health_check(predictor)
+
+        assert status == 513
+        predictor._check_server_health.assert_not_called()
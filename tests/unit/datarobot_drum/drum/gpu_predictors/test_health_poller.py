@@ -0,0 +1,117 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from datarobot_drum.drum.gpu_predictors.health_poller import BackendHealthPoller
+
+
+class FakeBackend(object):
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if isinstance(status, Exception):
+            raise status
+        return {"message": "status {}".format(status)}, status
+
+
+@pytest.fixture
+def metric_reader():
+    return InMemoryMetricReader()
+
+
+def make_poller(backend, metric_reader, interval=60, max_staleness=120):
+    meter = MeterProvider(metric_readers=[metric_reader]).get_meter("test")
+    return BackendHealthPoller(
+        backend, "Backend", interval=interval, max_staleness=max_staleness, meter=meter
+    )
+
+
+def collect_metrics(metric_reader):
+    points = {}
+    for resource_metrics in metric_reader.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                for point in metric.data.data_points:
+                    key = tuple(sorted(point.attributes.items()))
+                    points.setdefault(metric.name, {})[key] = point.value
+    return points
+
+
+class TestBackendHealthPoller:
+    def test_health_is_answered_from_the_last_check(self, metric_reader):
+        backend = FakeBackend(200)
+        poller = make_poller(backend, metric_reader)
+        poller.poll()
+
+        for _ in range(10):
+            assert poller.health() == ({"message": "status 200"}, 200)
+        assert backend.calls == 1
+
+    def test_not_checked_yet(self, metric_reader):
+        poller = make_poller(FakeBackend(200), metric_reader)
+
+        message, status = poller.health()
+
+        assert status == 503
+        assert message == {"message": "Waiting for the first Backend health check."}
+
+    def test_stale_result_is_not_trusted(self, metric_reader):
+        poller = make_poller(FakeBackend(200), metric_reader, max_staleness=30)
+        with patch("time.monotonic", return_value=1000):
+            poller.poll()
+
+        with patch("time.monotonic", return_value=1029):
+            assert poller.health()[1] == 200
+        with patch("time.monotonic", return_value=1031):
+            message, status = poller.health()
+
+        assert status == 503
+        assert message == {"message": "Backend health is unknown, it was last checked 31s ago."}
+
+    def test_failing_check(self, metric_reader):
+        poller = make_poller(FakeBackend(ValueError("boom")), metric_reader)
+        poller.poll()
+
+        assert poller.health() == ({"message": "Backend health check failed: boom"}, 503)
+
+    def test_transitions_are_counted(self, metric_reader):
+        poller = make_poller(FakeBackend(503, 200, 200, 503, 503), metric_reader)
+
+        for _ in range(5):
+            poller.poll()
+
+        points = collect_metrics(metric_reader)
+        assert points["drum.backend_health.transitions"] == {
+            (("backend", "Backend"), ("healthy", False)): 2,
+            (("backend", "Backend"), ("healthy", True)): 1,
+        }
+        assert points["drum.backend_health.healthy"] == {(("backend", "Backend"),): 0}
+
+    def test_background_polling(self, metric_reader):
+        backend = FakeBackend(503, 200)
+        poller = make_poller(backend, metric_reader, interval=0.01)
+
+        poller.start()
+        try:
+            deadline = time.time() + 5
+            while poller.health()[1] != 200 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            poller.stop()
+            poller._thread.join()
+
+        assert poller.health()[1] == 200
+        assert backend.calls >= 2
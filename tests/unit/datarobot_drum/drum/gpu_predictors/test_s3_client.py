@@ -0,0 +1,110 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import threading
+import time
+
+import pytest
+
+from datarobot_drum.drum.gpu_predictors.utils import S3Client
+
+
+class FakeS3(object):
+    """Lists and downloads in-memory objects, tracking how many downloads run at once."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.fail_keys = set()
+        self.downloaded = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        return {
+            "Contents": [
+                {"Key": key, "Size": len(content), "ETag": '"{}"'.format(hash(content))}
+                for key, content in sorted(self.objects.items())
+            ]
+        }
+
+    def download_file(self, bucket, key, filename, Config=None):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        if key in self.fail_keys:
+            with self._lock:
+                self.running -= 1
+            raise ConnectionError("connection reset")
+        with open(filename, "wb") as f:
+            f.write(self.objects[key])
+        with self._lock:
+            self.running -= 1
+            self.downloaded.append(key)
+
+
+@pytest.fixture
+def fake_s3():
+    objects = {"models/llm/model-{:02}.safetensors".format(i): b"x" * i for i in range(12)}
+    objects["models/llm/config.json"] = b"{}"
+    return FakeS3(objects)
+
+
+@pytest.fixture
+def s3_client(fake_s3):
+    credential = {"awsAccessKeyId": "key", "awsSecretAccessKey": "secret"}
+    client = S3Client("s3://bucket/models/llm/", credential, max_workers=4)
+    client.s3_client = fake_s3
+    return client
+
+
+def download(s3_client, destination_dir):
+    keys, dirs = s3_client.list_objects()
+    s3_client.download_files(keys, dirs, destination_dir=str(destination_dir))
+
+
+class TestS3Client:
+    def test_download_files(self, s3_client, fake_s3, tmp_path):
+        download(s3_client, tmp_path)
+
+        for key, content in fake_s3.objects.items():
+            assert (tmp_path / key.replace("models/llm/", "")).read_bytes() == content
+        assert 1 < fake_s3.max_running <= 4
+        assert s3_client.transfer_config.max_concurrency == 4
+
+    def test_downloaded_files_are_skipped(self, s3_client, fake_s3, tmp_path):
+        download(s3_client, tmp_path)
+        fake_s3.downloaded = []
+
+        download(s3_client, tmp_path)
+
+        assert fake_s3.downloaded == []
+
+    def test_changed_and_missing_files_are_downloaded_again(self, s3_client, fake_s3, tmp_path):
+        download(s3_client, tmp_path)
+        fake_s3.downloaded = []
+        fake_s3.objects["models/llm/config.json"] = b'{"a": 1}'
+        (tmp_path / "model-03.safetensors").unlink()
+
+        download(s3_client, tmp_path)
+
+        assert sorted(fake_s3.downloaded) == [
+            "models/llm/config.json",
+            "models/llm/model-03.safetensors",
+        ]
+
+    def test_download_error_is_raised(self, s3_client, fake_s3, tmp_path):
+        fake_s3.fail_keys = {"models/llm/config.json"}
+
+        with pytest.raises(ConnectionError):
+            download(s3_client, tmp_path)
+
+        # the downloaded files are recorded, the failed one is downloaded by the next attempt
+        fake_s3.fail_keys = set()
+        fake_s3.downloaded = []
+        download(s3_client, tmp_path)
+        assert fake_s3.downloaded == ["models/llm/config.json"]
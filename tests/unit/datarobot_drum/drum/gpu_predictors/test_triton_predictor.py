@@ -0,0 +1,284 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from datarobot_drum.drum.enum import (
+    GPU_PREDICTORS,
+    PredictionServerMimetypes,
+    RunLanguage,
+    TargetType,
+    UnstructuredDtoKeys,
+)
+from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.drum.gpu_predictors.triton_predictor import TritonPredictor
+from datarobot_drum.drum.root_predictors.prediction_server import PredictionServer
+from datarobot_drum.drum.gpu_predictors.triton_tensors import (
+    INFERENCE_HEADER,
+    decode_infer_response,
+    encode_infer_request,
+    tensors_from_npz,
+    tensors_to_npz,
+)
+
+
+def binary_response(outputs):
+    """Inference response of the binary tensor data extension, as Triton sends it."""
+    body, header_length = encode_infer_request(outputs)
+    header = json.loads(body[:header_length])
+    header = {"model_name": "model", "outputs": header["inputs"]}
+    header = json.dumps(header).encode("utf-8")
+    return header + body[header_length:], len(header)
+
+
+class TestTritonTensors:
+    @pytest.mark.parametrize(
+        "array",
+        [
+            np.arange(12, dtype=np.float32).reshape(3, 4),
+            np.arange(6, dtype=">i8").reshape(2, 3),
+            np.array([True, False]),
+            np.array([[b"a", b"bc"], [b"", b"def"]], dtype=np.object_),
+            np.array(["x", "yz"]),
+        ],
+    )
+    def test_round_trip(self, array):
+        body, header_length = binary_response({"t": array})
+
+        output = decode_infer_response(body, header_length)["t"]
+
+        expected = array.astype(np.bytes_) if array.dtype.kind == "U" else array
+        assert output.shape == array.shape
+        np.testing.assert_array_equal(output, expected)
+
+    def test_request(self):
+        body, header_length = encode_infer_request(
+            {"x": np.ones((2, 2), dtype=np.float16)}, output_names=["y"]
+        )
+
+        header = json.loads(body[:header_length])
+        assert header == {
+            "inputs": [
+                {
+                    "name": "x",
+                    "shape": [2, 2],
+                    "datatype": "FP16",
+                    "parameters": {"binary_data_size": 8},
+                }
+            ],
+            "outputs": [{"name": "y", "parameters": {"binary_data": True}}],
+        }
+        assert body[header_length:] == np.ones((2, 2), dtype="<f2").tobytes()
+
+    def test_binary_outputs_are_not_copied(self):
+        body, header_length = binary_response({"t": np.arange(4, dtype=np.int32)})
+        body = bytearray(body)
+
+        output = decode_infer_response(body, header_length)["t"]
+        body[-4:] = np.int32(7).tobytes()
+
+        assert output[-1] == 7
+
+    def test_json_response(self):
+        body = json.dumps(
+            {"outputs": [{"name": "t", "shape": [2], "datatype": "INT32", "data": [1, 2]}]}
+        ).encode("utf-8")
+
+        np.testing.assert_array_equal(decode_infer_response(body)["t"], [1, 2])
+
+    def test_error_response(self):
+        with pytest.raises(DrumCommonException, match="Triton inference failed: no model"):
+            decode_infer_response(b'{"error": "no model"}')
+
+    def test_unsupported_dtype(self):
+        with pytest.raises(DrumCommonException, match="Unsupported tensor dtype complex64"):
+            encode_infer_request({"t": np.zeros(2, dtype=np.complex64)})
+
+    def test_npz(self):
+        tensors = {"b": np.arange(3), "a": np.array([b"x", b"yz"], dtype=np.object_)}
+
+        read = tensors_from_npz(tensors_to_npz(tensors))
+
+        assert list(read) == ["b", "a"]
+        np.testing.assert_array_equal(read["a"], [b"x", b"yz"])
+
+    def test_invalid_npz(self):
+        with pytest.raises(DrumCommonException, match="Can't read the NPZ tensors payload"):
+            tensors_from_npz(b"not an npz")
+
+
+class FakeTritonHandler(BaseHTTPRequestHandler):
+    """Doubles every input tensor, answering with binary outputs when they are requested."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.server.client_ports.add(self.client_address[1])
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        header_length = int(self.headers.get(INFERENCE_HEADER, len(body)))
+        header = json.loads(body[:header_length])
+        request_header = dict(header, outputs=header["inputs"])
+        request_header = json.dumps(request_header).encode("utf-8")
+        inputs = decode_infer_response(request_header + body[header_length:], len(request_header))
+
+        outputs = {"{}_doubled".format(name): array * 2 for name, array in inputs.items()}
+        if header.get("parameters", {}).get("binary_data_output") or header.get("outputs"):
+            response, response_header_length = binary_response(outputs)
+            headers = {INFERENCE_HEADER: str(response_header_length)}
+        else:
+            response = json.dumps(
+                {
+                    "outputs": [
+                        {
+                            "name": name,
+                            "datatype": "FP32",
+                            "shape": list(a.shape),
+                            "data": a.ravel().tolist(),
+                        }
+                        for name, a in outputs.items()
+                    ]
+                }
+            ).encode("utf-8")
+            headers = {}
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(response)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def triton_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTritonHandler)
+    server.client_ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def triton_params(triton_server):
+    model_config = SimpleNamespace(name="model", platform="onnxruntime_onnx", backend="")
+    with patch(
+        "datarobot_drum.drum.gpu_predictors.triton_predictor.read_model_config",
+        return_value=model_config,
+    ):
+        yield {
+            "target_type": TargetType.UNSTRUCTURED,
+            "__custom_model_path__": "/non-existing-path-to-avoid-loading-unwanted-artifacts",
+            "triton_host": "http://127.0.0.1",
+            "triton_http_port": triton_server.server_port,
+        }
+
+
+@pytest.fixture
+def predictor(triton_params):
+    predictor = TritonPredictor()
+    predictor.configure(triton_params)
+    yield predictor
+    # lets the server threads serving the kept alive connections finish
+    predictor._session.close()
+
+
+@pytest.fixture
+def triton_prediction_server(test_flask_app, triton_params):
+    server = PredictionServer(
+        dict(
+            triton_params,
+            run_language=RunLanguage.OTHER,
+            gpu_predictor=GPU_PREDICTORS.TRITON,
+            deployment_config=None,
+        )
+    )
+    server.materialize()
+    yield test_flask_app.test_client()
+    server._resource_monitor.stop()
+    server._predictor._session.close()
+
+
+class TestTritonPredictor:
+    def test_infer(self, predictor, triton_server):
+        data = np.arange(6, dtype=np.float32).reshape(2, 3)
+
+        for _ in range(3):
+            outputs = predictor.infer({"x": data})
+
+        np.testing.assert_array_equal(outputs["x_doubled"], data * 2)
+        # requests reuse the kept alive connection
+        assert len(triton_server.client_ports) == 1
+
+    def test_predict_unstructured_npz(self, predictor):
+        data = np.arange(4, dtype=np.int64)
+
+        response, kwargs = predictor.predict_unstructured(
+            tensors_to_npz({"x": data}),
+            mimetype=PredictionServerMimetypes.APPLICATION_X_NPZ,
+        )
+
+        assert kwargs == {UnstructuredDtoKeys.MIMETYPE: PredictionServerMimetypes.APPLICATION_X_NPZ}
+        np.testing.assert_array_equal(tensors_from_npz(response)["x_doubled"], data * 2)
+
+    def test_predict_unstructured_binary_passthrough(self, predictor):
+        data = np.arange(3, dtype=np.float32)
+        body, header_length = encode_infer_request({"x": data})
+
+        response, kwargs = predictor.predict_unstructured(
+            body,
+            headers={INFERENCE_HEADER: str(header_length)},
+            mimetype=PredictionServerMimetypes.APPLICATION_OCTET_STREAM,
+        )
+
+        assert isinstance(response, bytes)
+        header, header_length = json.JSONDecoder().raw_decode(response.decode("latin-1"))
+        assert kwargs == {
+            UnstructuredDtoKeys.MIMETYPE: PredictionServerMimetypes.APPLICATION_OCTET_STREAM,
+            UnstructuredDtoKeys.HEADERS: {INFERENCE_HEADER: str(header_length)},
+        }
+        assert header["outputs"][0]["name"] == "x_doubled"
+        np.testing.assert_array_equal(
+            decode_infer_response(response, header_length)["x_doubled"], data * 2
+        )
+
+    def test_predict_unstructured_json(self, predictor):
+        request = {"inputs": [{"name": "x", "shape": [2], "datatype": "FP32", "data": [1.0, 2.0]}]}
+
+        response, kwargs = predictor.predict_unstructured(
+            json.dumps(request), headers={}, mimetype=PredictionServerMimetypes.APPLICATION_JSON
+        )
+
+        assert kwargs is None
+        assert json.loads(response)["outputs"][0]["data"] == [2.0, 4.0]
+
+
+def test_binary_response_through_prediction_server(triton_prediction_server):
+    data = np.arange(3, dtype=np.float32)
+    body, header_length = encode_infer_request({"x": data})
+
+    response = triton_prediction_server.post(
+        "/predictUnstructured/",
+        data=body,
+        headers={INFERENCE_HEADER: str(header_length)},
+        content_type=PredictionServerMimetypes.APPLICATION_OCTET_STREAM,
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == PredictionServerMimetypes.APPLICATION_OCTET_STREAM
+    outputs = decode_infer_response(response.data, int(response.headers[INFERENCE_HEADER]))
+    np.testing.assert_array_equal(outputs["x_doubled"], data * 2)
@@ -6,14 +6,20 @@
 #  Released under the terms of DataRobot Tool and Utility Agreement.
 #
 import copy
+import io
 import json
 import os
 from unittest.mock import patch
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from datarobot_drum.drum.adapters.model_adapters.python_model_adapter import PythonModelAdapter
-from datarobot_drum.drum.enum import TargetType
+from datarobot_drum.drum.adapters.model_adapters.python_model_adapter import (
+    PythonModelAdapter,
+    RawPredictResponse,
+)
+from datarobot_drum.drum.enum import PredictionServerMimetypes, StructuredDtoKeys, TargetType
 from datarobot_drum.drum.exceptions import (
     BaseCustomUserError,
     CustomHTTPError,
@@ -155,6 +161,104 @@ def test_supports_chat(base_configure_params, has_chat_hook):
         assert predictor.supports_chat() == has_chat_hook
 
 
+@pytest.mark.usefixtures("mock_load_model_from_artifact")
+class TestPythonPredictorDataFrame:
+    @pytest.fixture
+    def predictor(self, base_configure_params):
+        predictor = PythonPredictor()
+        predictor.configure(base_configure_params)
+        return predictor
+
+    @pytest.fixture
+    def input_df(self):
+        return pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+    def test_predict_dataframe_hands_over_frame(self, predictor, input_df):
+        raw_response = RawPredictResponse(np.array([1.0, 2.0]), np.array(["Predictions"]))
+        with patch.object(PythonModelAdapter, "predict", return_value=raw_response) as mock_predict:
+            result_df = predictor.predict_dataframe(input_df)
+
+        kwargs = mock_predict.call_args[1]
+        assert kwargs[StructuredDtoKeys.DATAFRAME] is input_df
+        assert StructuredDtoKeys.BINARY_DATA not in kwargs
+        assert list(result_df.columns) == ["Predictions"]
+        assert result_df["Predictions"].tolist() == [1.0, 2.0]
+
+    def test_predict_dataframe_with_read_input_data_hook(self, predictor, input_df):
+        raw_response = RawPredictResponse(np.array([1.0, 2.0]), np.array(["Predictions"]))
+        with patch.object(
+            PythonModelAdapter, "has_read_input_data_hook", return_value=True
+        ), patch.object(PythonModelAdapter, "predict", return_value=raw_response) as mock_predict:
+            predictor.predict_dataframe(input_df)
+
+        kwargs = mock_predict.call_args[1]
+        assert StructuredDtoKeys.DATAFRAME not in kwargs
+        assert kwargs[StructuredDtoKeys.BINARY_DATA] == b"a,b\n1,x\n2,y\n"
+        assert kwargs[StructuredDtoKeys.MIMETYPE] == PredictionServerMimetypes.TEXT_CSV
+
+    def test_transform_dataframe(self, predictor, input_df):
+        predictor.target_type = TargetType.TRANSFORM
+        with patch.object(
+            PythonModelAdapter, "transform", return_value=(input_df.assign(c=1), None)
+        ) as mock_transform:
+            result_df = predictor.transform_dataframe(input_df)
+
+        assert mock_transform.call_args[1][StructuredDtoKeys.DATAFRAME] is input_df
+        assert list(result_df.columns) == ["a", "b", "c"]
+
+
+@pytest.mark.usefixtures("mock_load_model_from_artifact")
+class TestPythonPredictorMemoryMappedInput:
+    @pytest.mark.parametrize("has_hook, expected", [(False, True), (True, False)])
+    def test_supports_memory_mapped_input(self, base_configure_params, has_hook, expected):
+        predictor = PythonPredictor()
+        predictor.configure(base_configure_params)
+        with patch.object(PythonModelAdapter, "has_read_input_data_hook", return_value=has_hook):
+            assert predictor.supports_memory_mapped_input() is expected
+
+
+@pytest.mark.usefixtures("mock_load_model_from_artifact")
+class TestPythonPredictorUnstructuredStream:
+    @pytest.fixture
+    def predictor(self, base_configure_params):
+        predictor = PythonPredictor()
+        predictor.configure(base_configure_params)
+        return predictor
+
+    def test_stream_is_handed_over(self, predictor):
+        stream = io.BytesIO(b"payload")
+        with patch.object(
+            PythonModelAdapter, "has_streaming_unstructured_hook", return_value=True
+        ), patch.object(
+            PythonModelAdapter, "predict_unstructured", return_value="ok"
+        ) as mock_predict:
+            ret = predictor.predict_unstructured_stream(stream, mimetype="text/plain", query={})
+
+        assert ret == ("ok", None)
+        kwargs = mock_predict.call_args[1]
+        assert kwargs["data"] is None
+        assert kwargs["stream"] is stream
+        assert kwargs["mimetype"] == "text/plain"
+        assert kwargs["charset"] == "utf-8"
+        # the body is left for the hook to read
+        assert stream.tell() == 0
+
+    @pytest.mark.parametrize(
+        "mimetype, expected_data", [(None, "payload"), ("application/octet-stream", b"payload")]
+    )
+    def test_stream_is_read_for_regular_hook(self, predictor, mimetype, expected_data):
+        with patch.object(
+            PythonModelAdapter, "has_streaming_unstructured_hook", return_value=False
+        ), patch.object(
+            PythonModelAdapter, "predict_unstructured", return_value="ok"
+        ) as mock_predict:
+            predictor.predict_unstructured_stream(io.BytesIO(b"payload"), mimetype=mimetype)
+
+        kwargs = mock_predict.call_args[1]
+        assert kwargs["data"] == expected_data
+        assert "stream" not in kwargs
+
+
 class TestPythonPredictorLazyLoading:
     @pytest.fixture
     def lazy_loading_env_vars(self):
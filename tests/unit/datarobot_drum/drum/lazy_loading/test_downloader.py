@@ -0,0 +1,243 @@
+#
+#  Copyright 2026 DataRobot, Inc. and its affiliates.
+#
+#  All rights reserved.
+#  This is proprietary source code of DataRobot, Inc. and its affiliates.
+#  Released under the terms of DataRobot Tool and Utility Agreement.
+import asyncio
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from datarobot_drum.drum.lazy_loading.downloader import LazyLoadingDownloader
+from datarobot_drum.drum.lazy_loading.downloader import RemoteObject
+from datarobot_drum.drum.lazy_loading.downloader import S3RemoteFiles
+from datarobot_drum.runtime_parameters.exceptions import InvalidRuntimeParam
+from tests.unit.datarobot_drum.drum.helpers import inject_runtime_parameter
+from tests.unit.datarobot_drum.drum.helpers import unset_runtime_parameter
+
+
+class FakeRemoteFiles:
+    """In-memory S3 repository, tracking the range requests and how many run at once."""
+
+    def __init__(self, objects):
+        self.objects = {}
+        for remote_path, content in objects.items():
+            self.put(remote_path, content)
+        self.ranges = []
+        self.fail_offsets = set()
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def put(self, remote_path, content):
+        self.objects[remote_path] = (content, f'"{hashlib.md5(content).hexdigest()}"')
+
+    def head(self, remote_path):
+        content, etag = self.objects[remote_path]
+        return RemoteObject(size=len(content), etag=etag)
+
+    def download_range(self, remote_path, etag, offset, size, local_path):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(0.01)
+            content, current_etag = self.objects[remote_path]
+            assert etag == current_etag
+            if offset in self.fail_offsets:
+                raise ConnectionError("connection reset")
+            self.ranges.append((remote_path, offset, size))
+            with open(local_path, "r+b") as f:
+                f.seek(offset)
+                f.write(content[offset : offset + size])
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def remote_files():
+    return FakeRemoteFiles({"weights.bin": os.urandom(1000), "config.json": b'{"a": 1}'})
+
+
+def download(remote_files, tmp_path, max_concurrency=8, part_size=100):
+    downloader = LazyLoadingDownloader(max_concurrency=max_concurrency, part_size=part_size)
+    files = [(remote_files, name, str(tmp_path / name)) for name in remote_files.objects]
+    return asyncio.run(downloader.download_all(files))
+
+
+def assert_downloaded(remote_files, tmp_path):
+    for name, (content, _) in remote_files.objects.items():
+        assert (tmp_path / name).read_bytes() == content
+    assert not list(tmp_path.glob("*.part"))
+
+
+class TestLazyLoadingDownloader:
+    def test_large_files_are_downloaded_in_ranges(self, remote_files, tmp_path):
+        progress = download(remote_files, tmp_path)
+
+        assert_downloaded(remote_files, tmp_path)
+        weights_ranges = sorted(r[1:] for r in remote_files.ranges if r[0] == "weights.bin")
+        assert weights_ranges == [(offset, 100) for offset in range(0, 1000, 100)]
+        assert (progress.downloaded_bytes, progress.total_bytes) == (1008, 1008)
+
+    def test_concurrency_is_bounded(self, remote_files, tmp_path):
+        download(remote_files, tmp_path, max_concurrency=3, part_size=10)
+
+        assert_downloaded(remote_files, tmp_path)
+        assert 1 < remote_files.max_running <= 3
+
+    def test_downloaded_files_are_skipped(self, remote_files, tmp_path):
+        download(remote_files, tmp_path)
+        remote_files.ranges = []
+
+        progress = download(remote_files, tmp_path)
+
+        assert remote_files.ranges == []
+        assert (progress.skipped_files, progress.downloaded_bytes) == (2, 0)
+
+    def test_changed_file_is_downloaded_again(self, remote_files, tmp_path):
+        download(remote_files, tmp_path)
+        remote_files.put("weights.bin", os.urandom(1000))
+        remote_files.ranges = []
+
+        download(remote_files, tmp_path)
+
+        assert_downloaded(remote_files, tmp_path)
+        assert {r[0] for r in remote_files.ranges} == {"weights.bin"}
+
+    def test_existing_file_is_verified(self, remote_files, tmp_path):
+        (tmp_path / "config.json").write_bytes(b'{"a": 1}')
+        (tmp_path / "weights.bin").write_bytes(b"x" * 1000)
+
+        download(remote_files, tmp_path)
+
+        assert_downloaded(remote_files, tmp_path)
+        assert {r[0] for r in remote_files.ranges} == {"weights.bin"}
+
+    def test_interrupted_download_is_resumed(self, remote_files, tmp_path):
+        remote_files.fail_offsets = {500}
+        with patch("asyncio.sleep"), pytest.raises(ConnectionError):
+            download(remote_files, tmp_path, max_concurrency=1)
+        assert not (tmp_path / "weights.bin").exists()
+        state = json.loads((tmp_path / ".weights.bin.lazy-loading.json").read_text())
+        assert sorted(state["completed_parts"]) == [0, 1, 2, 3, 4, 6, 7, 8, 9]
+
+        remote_files.fail_offsets = set()
+        remote_files.ranges = []
+        download(remote_files, tmp_path, max_concurrency=1)
+
+        assert_downloaded(remote_files, tmp_path)
+        assert [r[1] for r in remote_files.ranges if r[0] == "weights.bin"] == [500]
+
+    def test_failed_part_is_retried(self, remote_files, tmp_path):
+        original_download_range = remote_files.download_range
+        failures = []
+
+        def flaky_download_range(remote_path, etag, offset, size, local_path):
+            if offset == 300 and not failures:
+                failures.append(offset)
+                raise ConnectionError("connection reset")
+            return original_download_range(remote_path, etag, offset, size, local_path)
+
+        remote_files.download_range = flaky_download_range
+        with patch("asyncio.sleep"):
+            download(remote_files, tmp_path)
+
+        assert failures == [300]
+        assert_downloaded(remote_files, tmp_path)
+
+    def test_empty_file(self, tmp_path):
+        remote_files = FakeRemoteFiles({"empty": b""})
+
+        download(remote_files, tmp_path)
+
+        assert (tmp_path / "empty").read_bytes() == b""
+
+
+class TestFromRuntimeParameters:
+    @pytest.fixture
+    def runtime_parameters(self):
+        names = []
+
+        def inject(name, value):
+            names.append(name)
+            inject_runtime_parameter(name, value)
+
+        yield inject
+        for name in names:
+            unset_runtime_parameter(name)
+
+    def test_defaults(self):
+        downloader = LazyLoadingDownloader.from_runtime_parameters()
+
+        assert (downloader.max_concurrency, downloader.part_size) == (8, 64 * 1024 * 1024)
+
+    def test_configured(self, runtime_parameters):
+        runtime_parameters("DRUM_LAZY_LOADING_MAX_CONCURRENCY", "16")
+        runtime_parameters("DRUM_LAZY_LOADING_PART_SIZE_MB", "8")
+
+        downloader = LazyLoadingDownloader.from_runtime_parameters()
+
+        assert (downloader.max_concurrency, downloader.part_size) == (16, 8 * 1024 * 1024)
+
+    def test_invalid(self, runtime_parameters):
+        runtime_parameters("DRUM_LAZY_LOADING_MAX_CONCURRENCY", "0")
+
+        with pytest.raises(InvalidRuntimeParam, match="must be a positive integer"):
+            LazyLoadingDownloader.from_runtime_parameters()
+
+
+class TestS3RemoteFiles:
+    @pytest.fixture
+    def client(self):
+        client = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="key",
+            aws_secret_access_key="secret",
+        )
+        with Stubber(client) as stubber:
+            client.stubber = stubber
+            yield client
+            stubber.assert_no_pending_responses()
+
+    @pytest.fixture
+    def remote_files(self, client):
+        storage = SimpleNamespace(
+            client=client, bucket_name="bucket", get_key_name=lambda name: f"prefix/{name}"
+        )
+        return S3RemoteFiles(storage)
+
+    def test_head(self, client, remote_files):
+        client.stubber.add_response(
+            "head_object",
+            {"ContentLength": 10, "ETag": '"abc"'},
+            {"Bucket": "bucket", "Key": "prefix/model.bin"},
+        )
+
+        assert remote_files.head("model.bin") == RemoteObject(size=10, etag='"abc"')
+
+    def test_download_range(self, client, remote_files, tmp_path):
+        local_path = tmp_path / "model.bin"
+        local_path.write_bytes(b"0123456789")
+        client.stubber.add_response(
+            "get_object",
+            {"Body": StreamingBody(io.BytesIO(b"abc"), 3)},
+            {"Bucket": "bucket", "Key": "prefix/model.bin", "Range": "bytes=4-6", "IfMatch": '"e"'},
+        )
+
+        remote_files.download_range("model.bin", '"e"', 4, 3, str(local_path))
+
+        assert local_path.read_bytes() == b"0123abc789"
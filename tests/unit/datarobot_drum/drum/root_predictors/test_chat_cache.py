@@ -0,0 +1,241 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+from unittest.mock import patch
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from datarobot_drum.drum.root_predictors.chat_cache import ChatCompletionCache
+from datarobot_drum.runtime_parameters.exceptions import InvalidRuntimeParam
+from tests.unit.datarobot_drum.drum.chat_utils import create_completion, create_completion_chunks
+from tests.unit.datarobot_drum.drum.helpers import inject_runtime_parameter, unset_runtime_parameter
+
+
+def make_params(content="Hello!", **kwargs):
+    params = {"model": "any", "messages": [{"role": "user", "content": content}], "temperature": 0}
+    params.update(kwargs)
+    return params
+
+
+class CompletionFactory(object):
+    def __init__(self, response_factory=lambda: create_completion("How are you")):
+        self.response_factory = response_factory
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.response_factory()
+
+
+def streamed_content(chunks):
+    return "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+
+
+class TestChatCompletionCache:
+    def test_key_ignores_stream_and_association_id(self):
+        cache = ChatCompletionCache(10)
+
+        assert cache.key(make_params()) == cache.key(
+            make_params(stream=True, datarobot_association_id="a1")
+        )
+        assert cache.key(make_params()) != cache.key(make_params("Bye!"))
+        assert cache.key(make_params()) != ChatCompletionCache(10, namespace="other").key(
+            make_params()
+        )
+
+    def test_key_includes_key_headers(self):
+        cache = ChatCompletionCache(10, key_headers=["X-Caller"])
+
+        key = cache.key(make_params(), {"X-Caller": "a", "Authorization": "token 1"})
+
+        assert key == cache.key(make_params(), {"x-caller": "a", "Authorization": "token 2"})
+        assert key != cache.key(make_params(), {"X-Caller": "b"})
+        assert key != cache.key(make_params())
+        assert ChatCompletionCache(10).key(make_params(), {"X-Caller": "a"}) == (
+            ChatCompletionCache(10).key(make_params(), {"X-Caller": "b"})
+        )
+
+    def test_uncacheable_requests_are_bypassed(self):
+        cache = ChatCompletionCache(10)
+        factory = CompletionFactory()
+
+        cache.chat(make_params(), factory, cacheable=False)
+        cache.chat(make_params(), factory, cacheable=False)
+
+        assert factory.calls == 2
+        assert cache.stats() == {"hits": 0, "misses": 0, "bypassed": 2, "entries": 0}
+
+    @pytest.mark.parametrize("temperature", [None, 0.7, False])
+    def test_non_deterministic_requests_are_bypassed(self, temperature):
+        cache = ChatCompletionCache(10)
+        factory = CompletionFactory()
+        params = make_params(temperature=temperature)
+
+        cache.chat(params, factory)
+        cache.chat(params, factory)
+
+        assert factory.calls == 2
+        assert cache.stats() == {"hits": 0, "misses": 0, "bypassed": 2, "entries": 0}
+
+    def test_hit(self):
+        cache = ChatCompletionCache(10)
+        factory = CompletionFactory()
+
+        cache.chat(make_params(), factory)
+        response = cache.chat(make_params(), factory)
+
+        assert factory.calls == 1
+        assert isinstance(response, ChatCompletion)
+        assert response.choices[0].message.content == "How are you"
+        assert cache.stats() == {"hits": 1, "misses": 1, "bypassed": 0, "entries": 1}
+
+    def test_streamed_completion_is_replayed(self):
+        cache = ChatCompletionCache(10)
+        factory = CompletionFactory(lambda: create_completion_chunks(["How", " are"]))
+
+        assert streamed_content(cache.chat(make_params(stream=True), factory)) == "How are"
+        replayed = list(cache.chat(make_params(stream=True), factory))
+
+        assert factory.calls == 1
+        assert streamed_content(replayed) == "How are"
+        assert replayed[0].choices[0].delta.role == "assistant"
+        assert replayed[-1].choices[0].finish_reason == "stop"
+        response = cache.chat(make_params(), factory)
+        assert response.choices[0].message.content == "How are"
+
+    def test_usage_is_replayed_when_requested(self):
+        cache = ChatCompletionCache(10)
+        completion = create_completion("How are you")
+        completion.usage = {"prompt_tokens": 1, "completion_tokens": 3, "total_tokens": 4}
+        cache.chat(make_params(), CompletionFactory(lambda: completion))
+
+        chunks = list(
+            cache.chat(
+                make_params(stream=True, stream_options={"include_usage": True}),
+                CompletionFactory(),
+            )
+        )
+
+        assert chunks[-1].choices == []
+        assert chunks[-1].usage.total_tokens == 4
+
+    def test_custom_chunks_are_not_cached(self):
+        cache = ChatCompletionCache(10)
+        factory = CompletionFactory(
+            lambda: create_completion_chunks(["How"], use_custom_streaming_class=True)
+        )
+
+        list(cache.chat(make_params(stream=True), factory))
+        list(cache.chat(make_params(stream=True), factory))
+
+        assert factory.calls == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_tool_calls_are_not_replayed_as_a_stream(self):
+        cache = ChatCompletionCache(10)
+        completion = create_completion(None)
+        completion.choices[0].message.tool_calls = [
+            {"id": "1", "type": "function", "function": {"name": "f", "arguments": "{}"}}
+        ]
+        factory = CompletionFactory(lambda: completion)
+        cache.chat(make_params(), factory)
+
+        assert cache.chat(make_params(), factory).choices[0].message.tool_calls
+        cache.chat(make_params(stream=True), factory)
+
+        assert factory.calls == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ChatCompletionCache(2)
+        factory = CompletionFactory()
+
+        for content in ["a", "b", "a", "c"]:
+            cache.chat(make_params(content), factory)
+        cache.chat(make_params("a"), factory)
+        cache.chat(make_params("b"), factory)
+
+        assert factory.calls == 4
+        assert cache.stats() == {"hits": 2, "misses": 4, "bypassed": 0, "entries": 2}
+
+    def test_entries_expire(self):
+        cache = ChatCompletionCache(10, ttl=60)
+        factory = CompletionFactory()
+
+        with patch("time.time", return_value=1000):
+            cache.chat(make_params(), factory)
+        with patch("time.time", return_value=1059):
+            cache.chat(make_params(), factory)
+        with patch("time.time", return_value=1061):
+            cache.chat(make_params(), factory)
+
+        assert factory.calls == 2
+
+    def test_cache_dir(self, tmp_path):
+        factory = CompletionFactory()
+        cache = ChatCompletionCache(1, cache_dir=str(tmp_path))
+        cache.chat(make_params("a"), factory)
+        cache.chat(make_params("b"), factory)
+
+        assert len(list(tmp_path.glob("*.json"))) == 1
+        restarted = ChatCompletionCache(1, cache_dir=str(tmp_path))
+        response = restarted.chat(make_params("b"), factory)
+
+        assert factory.calls == 2
+        assert response.choices[0].message.content == "How are you"
+
+    def test_expired_entries_are_removed_from_the_cache_dir(self, tmp_path):
+        with patch("time.time", return_value=1000):
+            ChatCompletionCache(1, ttl=60, cache_dir=str(tmp_path)).chat(
+                make_params(), CompletionFactory()
+            )
+        with patch("time.time", return_value=2000):
+            cache = ChatCompletionCache(1, ttl=60, cache_dir=str(tmp_path))
+
+        assert cache.stats()["entries"] == 0
+        assert not list(tmp_path.iterdir())
+
+
+class TestFromRuntimeParameters:
+    @pytest.fixture
+    def runtime_parameters(self):
+        names = []
+
+        def inject(name, value):
+            names.append(name)
+            inject_runtime_parameter(name, value)
+
+        yield inject
+        for name in names:
+            unset_runtime_parameter(name)
+
+    def test_disabled_by_default(self):
+        assert ChatCompletionCache.from_runtime_parameters() is None
+
+    def test_configured(self, runtime_parameters, tmp_path):
+        runtime_parameters("DRUM_CHAT_CACHE_MAX_ENTRIES", "100")
+        runtime_parameters("DRUM_CHAT_CACHE_TTL_SECONDS", "30")
+        runtime_parameters("DRUM_CHAT_CACHE_DIR", str(tmp_path / "cache"))
+
+        cache = ChatCompletionCache.from_runtime_parameters()
+
+        assert (cache.max_entries, cache.ttl, cache.key_headers) == (100, 30, ())
+        assert (tmp_path / "cache").is_dir()
+
+    def test_key_headers(self, runtime_parameters):
+        runtime_parameters("DRUM_CHAT_CACHE_MAX_ENTRIES", "100")
+        runtime_parameters("DRUM_CHAT_CACHE_KEY_HEADERS", "X-Caller, Authorization,")
+
+        cache = ChatCompletionCache.from_runtime_parameters()
+
+        assert cache.key_headers == ("authorization", "x-caller")
+
+    @pytest.mark.parametrize("value", ["0", "many"])
+    def test_invalid(self, runtime_parameters, value):
+        runtime_parameters("DRUM_CHAT_CACHE_MAX_ENTRIES", value)
+
+        with pytest.raises(InvalidRuntimeParam, match="must be a positive integer"):
+            ChatCompletionCache.from_runtime_parameters()
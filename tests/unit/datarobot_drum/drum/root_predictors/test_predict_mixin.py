@@ -5,13 +5,25 @@
 #  This is proprietary source code of DataRobot, Inc. and its affiliates.
 #  Released under the terms of DataRobot Tool and Utility Agreement.
 #
-from unittest.mock import Mock, PropertyMock
+import io
+import mmap
+import types
+from unittest.mock import Mock, PropertyMock, patch
 
+import numpy as np
 import pandas as pd
+import pytest
+from flask import Flask
+from scipy import sparse
 
 from datarobot_drum.drum.common import SupportedPayloadFormats
-from datarobot_drum.drum.enum import PRED_COLUMN, PayloadFormat
+from datarobot_drum.drum.enum import PRED_COLUMN, PayloadFormat, TargetType
 from datarobot_drum.drum.root_predictors.predict_mixin import PredictMixin
+from datarobot_drum.drum.root_predictors.transform_helpers import read_x_data_from_response
+from tests.unit.datarobot_drum.drum.helpers import (
+    inject_runtime_parameter,
+    unset_runtime_parameter,
+)
 
 
 class TestPredictionResponse:
@@ -72,6 +84,229 @@ class TestPredictionResponse:
             == '{"predictions":[{"cat":0.1,"dog":0.7,"horse":0.2}],"extraModelOutput":{"columns":["extra1","extra2"],"index":[0,1],"data":[[2,"high"],[3,"low"]]}}'
         )
 
+    def test_float32_regression_prediction_response(self):
+        prediction_response = Mock(
+            predictions=pd.DataFrame({PRED_COLUMN: np.array([0.1, 0.2], dtype=np.float32)}),
+            extra_model_output=None,
+        )
+        response = PredictMixin._build_drum_response_json_str(prediction_response)
+        assert response == '{"predictions":[0.1,0.2]}'
+
+    def test_missing_regression_prediction_response(self):
+        prediction_response = Mock(
+            predictions=pd.DataFrame({PRED_COLUMN: [0.1, np.nan, np.inf]}),
+            extra_model_output=None,
+        )
+        response = PredictMixin._build_drum_response_json_str(prediction_response)
+        assert response == '{"predictions":[0.1,null,null]}'
+
+    def test_text_prediction_response(self):
+        prediction_response = Mock(
+            predictions=pd.DataFrame({PRED_COLUMN: ["a", "b"]}), extra_model_output=None
+        )
+        response = PredictMixin._build_drum_response_json_str(prediction_response)
+        assert response == '{"predictions":["a","b"]}'
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_float_predictions_are_not_copied(self, dtype):
+        predictions = pd.DataFrame({"0": np.array([0.1], dtype=dtype), "1": [0.9]})
+        assert PredictMixin._as_float_predictions(predictions) is predictions
+
+    def test_int_predictions_are_cast_to_float(self):
+        predictions = pd.DataFrame({PRED_COLUMN: [1, 2]})
+        prediction_response = Mock(
+            predictions=PredictMixin._as_float_predictions(predictions), extra_model_output=None
+        )
+        response = PredictMixin._build_drum_response_json_str(prediction_response)
+        assert response == '{"predictions":[1.0,2.0]}'
+
+
+class TestFetchDataFromRequest:
+    PAYLOAD = b"a,b\n" + b"1,2\n" * 1000
+
+    @pytest.fixture
+    def spool_threshold(self):
+        inject_runtime_parameter("DRUM_REQUEST_SPOOL_THRESHOLD_MB", "0.001")
+        yield
+        unset_runtime_parameter("DRUM_REQUEST_SPOOL_THRESHOLD_MB")
+
+    @pytest.fixture
+    def app(self):
+        return Flask(__name__)
+
+    def _fetch(self, app, memory_map, **request_kwargs):
+        with app.test_request_context("/predict/", method="POST", **request_kwargs):
+            binary_data, mimetype, charset = PredictMixin._fetch_data_from_request(
+                "X", memory_map=memory_map
+            )
+            payload = binary_data[:]
+            app.process_response(app.response_class())
+        return binary_data, payload, mimetype
+
+    def _raw_body(self):
+        return dict(data=self.PAYLOAD, content_type="text/csv; charset=utf-8")
+
+    def _multipart(self):
+        return dict(data={"X": (io.BytesIO(self.PAYLOAD), "X.csv")})
+
+    @pytest.mark.usefixtures("spool_threshold")
+    @pytest.mark.parametrize("request_kwargs", ["_raw_body", "_multipart"])
+    def test_large_payload_is_spooled(self, app, request_kwargs):
+        binary_data, payload, _ = self._fetch(
+            app, memory_map=True, **getattr(self, request_kwargs)()
+        )
+
+        assert isinstance(binary_data, mmap.mmap)
+        assert payload == self.PAYLOAD
+        # the map is closed once the response is processed
+        assert binary_data.closed
+
+    @pytest.mark.usefixtures("spool_threshold")
+    def test_small_payload_is_not_spooled(self, app):
+        binary_data, _, _ = self._fetch(
+            app, memory_map=True, data=b"a,b\n1,2\n", content_type="text/csv"
+        )
+
+        assert binary_data == b"a,b\n1,2\n"
+
+    @pytest.mark.usefixtures("spool_threshold")
+    def test_payload_is_not_spooled_without_memory_map_support(self, app):
+        binary_data, _, _ = self._fetch(app, memory_map=False, **self._raw_body())
+
+        assert binary_data == self.PAYLOAD
+
+    @pytest.mark.usefixtures("spool_threshold")
+    def test_multipart_without_payload(self, app):
+        with app.test_request_context(
+            "/predict/", method="POST", data={"Y": (io.BytesIO(self.PAYLOAD), "Y.csv")}
+        ):
+            with pytest.raises(ValueError, match="Samples should be provided as"):
+                PredictMixin._fetch_data_from_request("X", memory_map=True)
+
+    def test_payload_is_not_spooled_by_default(self, app):
+        binary_data, _, _ = self._fetch(app, memory_map=True, **self._multipart())
+
+        assert binary_data == self.PAYLOAD
+
+
+class TestPredictUnstructured:
+    @pytest.fixture
+    def mixin(self):
+        mixin = PredictMixin()
+        mixin._target_type = TargetType.UNSTRUCTURED
+        mixin._predictor = Mock()
+        return mixin
+
+    def test_streaming_hook_gets_request_stream(self, mixin):
+        def predict_unstructured_stream(stream, **kwargs):
+            return stream.read(3) + b"|" + stream.read(), kwargs
+
+        mixin._predictor.supports_streaming_unstructured_input.return_value = True
+        mixin._predictor.predict_unstructured_stream.side_effect = predict_unstructured_stream
+
+        app = Flask(__name__)
+        with app.test_request_context(
+            "/predictUnstructured/?a=1",
+            method="POST",
+            data=b"abcdef",
+            content_type="application/octet-stream",
+        ), patch("flask.Request.get_data") as mock_get_data:
+            response, status = mixin.do_predict_unstructured()
+
+            mock_get_data.assert_not_called()
+        assert response.get_data() == b"abc|def"
+        kwargs = mixin._predictor.predict_unstructured_stream.call_args[1]
+        assert kwargs["mimetype"] == "application/octet-stream"
+        assert kwargs["charset"] is None
+        assert kwargs["query"]["a"] == "1"
+        mixin._predictor.predict_unstructured.assert_not_called()
+
+    def test_regular_hook_gets_data(self, mixin):
+        mixin._predictor.supports_streaming_unstructured_input.return_value = False
+        mixin._predictor.predict_unstructured.return_value = ("ok", None)
+
+        app = Flask(__name__)
+        with app.test_request_context(
+            "/predictUnstructured/", method="POST", data=b"abc", content_type="text/plain"
+        ):
+            response, _ = mixin.do_predict_unstructured()
+
+        assert mixin._predictor.predict_unstructured.call_args[0][0] == "abc"
+        mixin._predictor.predict_unstructured_stream.assert_not_called()
+
+
+class TestTransform:
+    @pytest.fixture
+    def mixin(self):
+        mixin = PredictMixin()
+        mixin._target_type = TargetType.TRANSFORM
+        mixin._predictor = Mock()
+        mixin._predictor.supports_memory_mapped_input.return_value = False
+        return mixin
+
+    @pytest.fixture
+    def stream_response(self):
+        inject_runtime_parameter("DRUM_STREAM_TRANSFORM_RESPONSE", "true")
+        yield
+        unset_runtime_parameter("DRUM_STREAM_TRANSFORM_RESPONSE")
+
+    def _transform(self, mixin, out_data, filename="X.csv", query_string=None):
+        mixin._predictor.transform.return_value = (out_data, None)
+        app = Flask(__name__)
+        with app.test_request_context(
+            "/transform/",
+            method="POST",
+            data={"X": (io.BytesIO(b"a\n1\n"), filename)},
+            query_string=query_string,
+        ):
+            response, status = mixin.do_transform()
+            is_streamed = response.is_streamed
+            content = response.get_data()
+        return is_streamed, types.SimpleNamespace(content=content, headers=response.headers)
+
+    def test_buffered_response_by_default(self, mixin):
+        is_streamed, _ = self._transform(mixin, pd.DataFrame({"a": [1.5, 2.5]}))
+
+        assert not is_streamed
+
+    @pytest.mark.usefixtures("stream_response")
+    def test_streamed_csv_response(self, mixin):
+        out_data = pd.DataFrame({"a": [1.5, 2.5], "b": ["x", "y"]})
+
+        is_streamed, response = self._transform(mixin, out_data.copy())
+
+        assert is_streamed
+        pd.testing.assert_frame_equal(read_x_data_from_response(response), out_data)
+
+    @pytest.mark.usefixtures("stream_response")
+    def test_streamed_sparse_response(self, mixin):
+        matrix = np.array([[0.0, 1.5], [2.5, 0.0]])
+        out_data = pd.DataFrame.sparse.from_spmatrix(sparse.csr_matrix(matrix), columns=["a", "b"])
+
+        is_streamed, response = self._transform(mixin, out_data)
+
+        assert is_streamed
+        np.testing.assert_array_equal(
+            read_x_data_from_response(response).sparse.to_dense().to_numpy(), matrix
+        )
+
+    @pytest.mark.parametrize(
+        "filename, query_string",
+        [("X.npz", None), ("X.csv", {"sparse_format": "npz"})],
+    )
+    @pytest.mark.parametrize("streamed", [False, True])
+    def test_npz_sparse_response(self, mixin, filename, query_string, streamed):
+        matrix = np.array([[0.0, 1.5], [2.5, 0.0]])
+        out_data = pd.DataFrame.sparse.from_spmatrix(sparse.csr_matrix(matrix), columns=["a", "b"])
+
+        with patch.object(PredictMixin, "_is_transform_response_streamed", return_value=streamed):
+            _, response = self._transform(mixin, out_data, filename, query_string)
+
+        assert b'name="X.colnames"' not in response.content
+        result = read_x_data_from_response(response)
+        assert list(result.columns) == ["a", "b"]
+        np.testing.assert_array_equal(result.sparse.to_dense().to_numpy(), matrix)
+
 
 def test_make_capabilities():
     class TestPredictor:
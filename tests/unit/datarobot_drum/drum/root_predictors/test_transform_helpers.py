@@ -8,9 +8,20 @@ import pandas as pd
 import numpy as np
 import pytest
 import types
-from scipy.sparse import coo_matrix
+from io import BytesIO
+
+from requests_toolbelt import MultipartEncoder
+from scipy.io import mmread
+from scipy.sparse import coo_matrix, random as sparse_random
 
 from datarobot_drum.drum.root_predictors.transform_helpers import (
+    iter_csv_payload,
+    iter_mtx_payload,
+    iter_multipart_payload,
+    make_csv_payload,
+    make_mtx_payload,
+    make_npz_payload,
+    read_npz_payload,
     validate_and_convert_column_names_for_serialization,
     parse_multi_part_response,
 )
@@ -79,3 +90,71 @@ def test_parse_multi_part_response():
     assert result["X.format"] == "csv"
     assert result["key1"] == file_content1
     assert result["key2"] == file_content2
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3, 100])
+@pytest.mark.parametrize(
+    "df",
+    [
+        pd.DataFrame({"a": [1.5, np.nan, 3.0], "b": ["x", "y", None]}),
+        pd.DataFrame({"single": [1.0, np.nan, 3.0]}),
+        pd.DataFrame({"a": [], "b": []}),
+    ],
+    ids=["mixed", "single-column", "empty"],
+)
+def test_iter_csv_payload(df, chunk_rows):
+    streamed = list(iter_csv_payload(df.copy(), chunk_rows=chunk_rows))
+
+    assert b"".join(streamed) == make_csv_payload(df.copy())
+    assert len(streamed) == max(1, -(-len(df) // chunk_rows))
+
+
+def test_iter_csv_payload_validates_column_names_eagerly():
+    with pytest.raises(ValueError):
+        iter_csv_payload(pd.DataFrame({" ": [1]}))
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32, np.int64])
+def test_iter_mtx_payload(dtype):
+    df = pd.DataFrame.sparse.from_spmatrix(
+        sparse_random(20, 6, density=0.3, format="csr", random_state=1, dtype=np.float64)
+        .multiply(10)
+        .astype(dtype),
+        columns=list("abcdef"),
+    )
+
+    streamed, colnames = iter_mtx_payload(df.copy(), chunk_entries=7)
+    matrix = mmread(BytesIO(b"".join(streamed)))
+
+    np.testing.assert_array_equal(matrix.toarray(), df.sparse.to_coo().toarray())
+    assert colnames == make_mtx_payload(df.copy())[1]
+
+
+def test_npz_payload():
+    df = pd.DataFrame.sparse.from_spmatrix(
+        sparse_random(20, 3, density=0.3, format="csr", random_state=1),
+        columns=["a ", "b\nc", "d"],
+    )
+
+    result = read_npz_payload({"X.transform": make_npz_payload(df.copy())}, "X.transform")
+
+    assert list(result.columns) == ["a", "b\\nc", "d"]
+    np.testing.assert_array_equal(result.sparse.to_dense().to_numpy(), df.sparse.to_dense())
+
+
+def test_iter_multipart_payload_matches_multipart_encoder():
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    fields = {
+        "X.format": "csv",
+        "X.transform": ("X.transform", make_csv_payload(df.copy()), "application/octet-stream"),
+    }
+    streamed_fields = dict(fields)
+    streamed_fields["X.transform"] = (
+        "X.transform",
+        iter_csv_payload(df.copy(), chunk_rows=1),
+        "application/octet-stream",
+    )
+
+    payload = b"".join(iter_multipart_payload(streamed_fields, "boundary123"))
+
+    assert payload == MultipartEncoder(fields=fields, boundary="boundary123").to_string()
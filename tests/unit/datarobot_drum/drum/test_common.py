@@ -224,6 +224,58 @@ class TestStreamingChatHelpers:
             ],
         }
 
+    def test_reconstruct_chat_response_from_split_events(self):
+        event = 'data: {"model":"gpt-4o","choices":[{"index":0,"delta":{"role":"assistant","content":"h\u00e9llo"},"finish_reason":"stop"}]}\n\n'.encode(
+            "utf-8"
+        )
+        split = event.index("\u00e9".encode("utf-8")) + 1
+        chunks = [event[:10], event[10:split], event[split:], b"data: [DONE]"]
+
+        response = reconstruct_chat_response_from_sse(chunks)
+
+        assert response["model"] == "gpt-4o"
+        assert response["choices"][0]["message"]["content"] == "h\u00e9llo"
+        assert response["choices"][0]["finish_reason"] == "stop"
+
+    def test_reconstruct_chat_response_from_sse_max_content_size(self):
+        chunks = [
+            'data: {"choices":[{"index":0,"delta":{"content":"abc"}},{"index":1,"delta":{"content":"x"}}]}\n',
+            'data: {"choices":[{"index":0,"delta":{"content":"def"}},{"index":1,"delta":null}]}\n',
+            'data: {"choices":[{"index":0,"delta":{"content":"ghi"},"finish_reason":"length"}]}\n',
+        ]
+
+        response = reconstruct_chat_response_from_sse(chunks, max_content_size=5)
+
+        assert [c["message"]["content"] for c in response["choices"]] == ["abcde", "x"]
+        assert response["choices"][0]["finish_reason"] == "length"
+
+    def test_iter_stream_with_span_max_captured_content_size(self):
+        chunks = [
+            'data: {"choices":[{"index":0,"delta":{"role":"assistant","content":"Hello"}}]}\n\n',
+            'data: {"choices":[{"index":0,"delta":{"content":" world"}}]}\n\n',
+        ]
+        tracer = mock.MagicMock()
+        stream_span = tracer.start_as_current_span.return_value.__enter__.return_value
+        param_name = RuntimeParameters.namespaced_param_name("DRUM_OTEL_MAX_CAPTURED_CONTENT_SIZE")
+        param_value = json.dumps({"type": RuntimeParameterTypes.NUMERIC.value, "payload": 8})
+
+        with patch.dict(os.environ, {param_name: param_value}):
+            streamed = list(iter_stream_with_span(tracer, mock.Mock(), chunks))
+
+        assert streamed == chunks
+        response_attrs = stream_span.set_attributes.call_args[0][0]
+        assert response_attrs["gen_ai.completion.0.content"] == "Hello wo"
+
+    def test_iter_stream_with_span_keeps_streaming_on_parse_error(self):
+        chunks = ['data: {"choices":["not-a-dict"]}\n\n', "data: [DONE]\n\n"]
+        tracer = mock.MagicMock()
+        stream_span = tracer.start_as_current_span.return_value.__enter__.return_value
+
+        streamed = list(iter_stream_with_span(tracer, mock.Mock(), chunks))
+
+        assert streamed == chunks
+        stream_span.set_attributes.assert_not_called()
+
     def test_iter_stream_with_span_sets_attributes_and_closes_span(self):
         chunks = [
             'data: {"model":"gpt-4o","choices":[{"index":0,"delta":{"role":"assistant","content":"Hi"},"finish_reason":"stop"}]}\n\n',
@@ -20,6 +20,7 @@ import pytest
 import yaml
 from datarobot_drum.drum.adapters.cli.drum_fit_adapter import DrumFitAdapter
 from datarobot_drum.drum.adapters.model_adapters.python_model_adapter import PythonModelAdapter
+from datarobot_drum.drum.common import FIT_METADATA_FILENAME
 from datarobot_drum.drum.args_parser import CMRunnerArgsRegistry
 from datarobot_drum.drum.drum import (
     CMRunner,
@@ -32,6 +33,7 @@ from datarobot_drum.drum.enum import (
     ArgumentOptionsEnvVars,
     ArgumentsOptions,
 )
+from datarobot_drum.drum.exceptions import DrumCommonException
 from datarobot_drum.drum.language_predictors.python_predictor.python_predictor import (
     PythonPredictor,
 )
@@ -223,6 +225,53 @@ class TestCMRunnerRunTestPredict:
         assert cm_run_test_options.user_secrets_prefix == prefix
 
 
+@pytest.mark.usefixtures("mock_cm_run_test_class")
+class TestCMRunnerRunTestPredictInProcess:
+    @pytest.fixture
+    def mock_predictor_configure(self):
+        with patch.object(PythonPredictor, "configure") as mock_func:
+            yield mock_func
+
+    @pytest.fixture
+    def input_x(self):
+        return pd.DataFrame({"a": range(100), "b": range(100)})
+
+    def test_loads_fit_model(
+        self, runtime_factory, fit_args, mock_predictor_configure, output_dir, input_x
+    ):
+        runtime_factory(fit_args).run_test_predict_in_process(input_x)
+
+        params = mock_predictor_configure.call_args[0][0]
+        assert params["__custom_model_path__"] == output_dir
+        assert params["target_type"] == "regression"
+
+    @pytest.mark.usefixtures("mock_predictor_configure")
+    def test_checks_all_rows(self, runtime_factory, fit_args, mock_cm_run_test_class, input_x):
+        runtime_factory(fit_args).run_test_predict_in_process(input_x)
+
+        check = mock_cm_run_test_class.return_value.check_prediction_side_effects_in_process
+        predictor, actual_x = check.call_args[0]
+        assert isinstance(predictor, PythonPredictor)
+        pd.testing.assert_frame_equal(actual_x, input_x)
+
+    @pytest.mark.usefixtures("mock_predictor_configure")
+    def test_checks_sample_rows(self, runtime_factory, fit_args, mock_cm_run_test_class, input_x):
+        fit_args.extend(["--predict-sample-rows", "10"])
+        runtime_factory(fit_args).run_test_predict_in_process(input_x)
+
+        check = mock_cm_run_test_class.return_value.check_prediction_side_effects_in_process
+        _, actual_x = check.call_args[0]
+        assert len(actual_x) == 10
+        assert set(actual_x.index) <= set(input_x.index)
+
+    @pytest.mark.usefixtures("mock_predictor_configure")
+    def test_evicts_custom_module_imported_by_fit(self, runtime_factory, fit_args, input_x):
+        with patch.dict(sys.modules, {"custom": object()}):
+            runtime_factory(fit_args).run_test_predict_in_process(input_x)
+
+            assert "custom" not in sys.modules
+
+
 @pytest.fixture
 def mock_read_structured_input_file_as_df(target):
     with patch.object(StructuredInputReadUtils, "read_structured_input_file_as_df") as mock_func:
@@ -257,11 +306,18 @@ def mock_run_test_predict():
         yield mock_func
 
 
+@pytest.fixture
+def mock_run_test_predict_in_process():
+    with patch.object(CMRunner, "run_test_predict_in_process") as mock_func:
+        yield mock_func
+
+
 @pytest.mark.usefixtures(
     "mock_read_structured_input_file_as_df",
     "mock_check_artifacts_and_get_run_language",
     "mock_model_adapter_fit",
     "mock_run_test_predict",
+    "mock_run_test_predict_in_process",
 )
 class TestCMRunnerFit:
     def test_calls_model_adapter_fit_correctly(
@@ -309,9 +365,63 @@ class TestCMRunnerFit:
         assert called_kwargs["user_secrets_mount_path"] == mount_path
         assert called_kwargs["user_secrets_prefix"] == prefix
 
-    def test_calls_run_test_predict(self, runtime_factory, fit_args, mock_run_test_predict):
+    def test_calls_run_test_predict_in_process(
+        self,
+        runtime_factory,
+        fit_args,
+        mock_run_test_predict,
+        mock_run_test_predict_in_process,
+        target,
+    ):
+        runtime_factory(fit_args).run()
+
+        mock_run_test_predict.assert_not_called()
+        mock_run_test_predict_in_process.assert_called_once()
+        (actual_x,) = mock_run_test_predict_in_process.call_args[0]
+        assert list(actual_x.columns) == [target + "a", target + "b"]
+
+    def test_saves_fit_metadata_in_output_dir(
+        self, runtime_factory, fit_args, output_dir, temp_metadata
+    ):
+        fit_args.append("--enable-fit-metadata")
+
+        runtime_factory(fit_args).run()
+
+        assert os.path.exists(os.path.join(output_dir, FIT_METADATA_FILENAME))
+        assert not os.path.exists(os.path.join(temp_metadata, FIT_METADATA_FILENAME))
+
+    def test_calls_run_test_predict(
+        self, runtime_factory, fit_args, mock_run_test_predict, mock_run_test_predict_in_process
+    ):
+        fit_args.append("--predict-in-subprocess")
         runtime_factory(fit_args).run()
         mock_run_test_predict.assert_called_once_with()
+        mock_run_test_predict_in_process.assert_not_called()
+
+    def test_reports_memory_phases(
+        self,
+        runtime_factory,
+        fit_args,
+        mock_model_adapter_fit,
+        mock_run_test_predict_in_process,
+        capsys,
+    ):
+        fit_args.append("--verbose")
+        runtime_factory(fit_args).run()
+
+        output = capsys.readouterr().out
+        assert "Peak memory usage (" in output
+        assert "  load data: " in output
+        assert "  fit: " in output
+
+    def test_fails_when_max_memory_is_exceeded(
+        self, runtime_factory, fit_args, mock_model_adapter_fit
+    ):
+        fit_args.extend(["--max-memory", "1k"])
+
+        with pytest.raises(DrumCommonException, match="The 'load data' phase used .*--max-memory"):
+            runtime_factory(fit_args).run()
+        mock_model_adapter_fit.assert_not_called()
 
     def test_handles_missing_options(self, runtime_factory, fit_args, mock_model_adapter_fit):
         runtime = runtime_factory(fit_args)
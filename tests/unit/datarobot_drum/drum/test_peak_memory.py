@@ -0,0 +1,213 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.drum.peak_memory import (
+    PeakMemoryTracker,
+    _cgroup_peak_source,
+    _RusagePeak,
+    memory_phase,
+    parse_memory_size,
+)
+from datarobot_drum.drum.resource_monitor import ResourceMonitor
+
+MB = 1024 * 1024
+
+
+class FakePeakSource(object):
+    name = "fake"
+
+    def __init__(self, resettable=True):
+        self.resettable = resettable
+        self.current = 0
+        self.peak = 0
+
+    def allocate(self, size):
+        self.current += size
+        self.peak = max(self.peak, self.current)
+
+    def free(self, size):
+        self.current -= size
+
+    def reset(self):
+        if self.resettable:
+            self.peak = self.current
+        return self.resettable
+
+    def read(self):
+        return self.peak
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def source():
+    return FakePeakSource()
+
+
+@pytest.fixture
+def tracker(source):
+    tracker = PeakMemoryTracker()
+    tracker._source = source
+    return tracker
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("100", 100), ("100b", 100), ("2k", 2048), ("1.5m", 1536 * 1024), ("4GB", 4 * 1024**3)],
+)
+def test_parse_memory_size(value, expected):
+    assert parse_memory_size(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "m", "-1g", "4 gigabytes"])
+def test_parse_invalid_memory_size(value):
+    with pytest.raises(ValueError, match="Invalid memory size"):
+        parse_memory_size(value)
+
+
+class TestCgroupPeakSource:
+    @pytest.fixture
+    def cgroup_root(self, tmp_path):
+        return tmp_path / "cgroup"
+
+    @pytest.fixture(autouse=True)
+    def inside_docker(self):
+        with patch.object(ResourceMonitor, "_run_inside_docker", return_value=True) as inside:
+            yield inside
+
+    def _make_proc_cgroup(self, tmp_path, content):
+        proc_cgroup = tmp_path / "proc_cgroup"
+        proc_cgroup.write_text(content)
+        return str(proc_cgroup)
+
+    def _make_file(self, path, content):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def test_v2(self, tmp_path, cgroup_root):
+        self._make_file(cgroup_root / "a" / "b" / "memory.peak", "4096\n")
+        proc_cgroup = self._make_proc_cgroup(tmp_path, "0::/a/b\n")
+
+        source = _cgroup_peak_source(str(cgroup_root), proc_cgroup)
+
+        assert source.name == "cgroup v2"
+        assert source.read() == 4096
+
+    def test_v1(self, tmp_path, cgroup_root):
+        self._make_file(cgroup_root / "memory" / "a" / "memory.max_usage_in_bytes", "2048\n")
+        proc_cgroup = self._make_proc_cgroup(tmp_path, "5:cpu,cpuacct:/a\n4:memory:/a\n0::/\n")
+
+        source = _cgroup_peak_source(str(cgroup_root), proc_cgroup)
+
+        assert source.name == "cgroup v1"
+        assert source.read() == 2048
+
+    def test_container_cgroup_mounted_at_the_root(self, tmp_path, cgroup_root):
+        self._make_file(cgroup_root / "memory.peak", "4096\n")
+        proc_cgroup = self._make_proc_cgroup(tmp_path, "0::/docker/abc\n")
+
+        source = _cgroup_peak_source(str(cgroup_root), proc_cgroup)
+
+        assert source.read() == 4096
+
+    @pytest.mark.parametrize("path", ["/", "/user.slice/session-1.scope"])
+    def test_cgroup_is_only_used_in_a_container(self, tmp_path, cgroup_root, inside_docker, path):
+        inside_docker.return_value = False
+        self._make_file(cgroup_root / path.lstrip("/") / "memory.peak", "4096\n")
+        proc_cgroup = self._make_proc_cgroup(tmp_path, "0::{}\n".format(path))
+
+        assert _cgroup_peak_source(str(cgroup_root), proc_cgroup) is None
+
+    def test_no_cgroup(self, tmp_path, cgroup_root):
+        assert _cgroup_peak_source(str(cgroup_root), str(tmp_path / "missing")) is None
+
+
+def test_rusage_peak():
+    source = _RusagePeak()
+
+    assert not source.reset()
+    assert source.read() > 0
+
+
+class TestPeakMemoryTracker:
+    def test_phases(self, tracker, source):
+        with tracker.phase("load data"):
+            source.allocate(100 * MB)
+        with tracker.phase("fit"):
+            source.allocate(50 * MB)
+            source.free(50 * MB)
+
+        assert tracker.source == "fake"
+        assert tracker.phases["load data"].peak_bytes == 100 * MB
+        assert tracker.phases["fit"].peak_bytes == 150 * MB
+        assert tracker.phases["fit"].exact
+        assert tracker.peak_mbytes("load data", "fit", "serialize") == 150
+        assert tracker.peak_mbytes("predict") is None
+
+    def test_nested_phase_pauses_the_outer_one(self, tracker, source):
+        with tracker.phase("fit"):
+            source.allocate(10 * MB)
+            with memory_phase("serialize"):
+                source.allocate(100 * MB)
+                source.free(100 * MB)
+            source.allocate(10 * MB)
+
+        assert tracker.phases["serialize"].peak_bytes == 110 * MB
+        assert tracker.phases["fit"].peak_bytes == 20 * MB
+
+    def test_not_resettable_peak_is_the_peak_of_the_run(self, tracker, source):
+        source.resettable = False
+        with tracker.phase("load data"):
+            source.allocate(100 * MB)
+            source.free(100 * MB)
+        with tracker.phase("fit"):
+            source.allocate(10 * MB)
+
+        assert tracker.phases["fit"].peak_bytes == 100 * MB
+        assert not tracker.phases["fit"].exact
+        assert "fit: 100MB (peak of the run so far)" in tracker.format_report()
+
+    def test_fails_when_max_memory_is_exceeded(self, tracker, source):
+        tracker.max_memory = 100 * MB
+        with tracker.phase("load data"):
+            source.allocate(100 * MB)
+
+        with pytest.raises(
+            DrumCommonException,
+            match=r"The 'fit' phase used 101MB of memory \(fake\), which is more than the 100MB",
+        ):
+            with tracker.phase("fit"):
+                source.allocate(1 * MB)
+
+    def test_failed_phase_is_not_recorded(self, tracker):
+        with pytest.raises(ValueError):
+            with tracker.phase("fit"):
+                raise ValueError()
+
+        assert "fit" not in tracker.phases
+        assert not tracker._running
+
+    def test_trace_allocations(self, tracker):
+        tracker.trace_allocations = True
+        with tracker.phase("fit"):
+            data = bytearray(10 * MB)
+
+        phase = tracker.phases["fit"]
+        assert phase.traced_peak_bytes >= 10 * MB
+        assert "test_peak_memory.py" in phase.top_allocations[0]
+        assert tracker.report()["fit"]["traced_peak_mb"] >= 10
+        del data
+
+
+def test_memory_phase_without_tracker():
+    with memory_phase("serialize"):
+        pass
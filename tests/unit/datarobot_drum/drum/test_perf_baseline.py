@@ -0,0 +1,119 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import json
+
+import pytest
+
+from datarobot_drum.drum.perf_baseline import (
+    compare_to_baseline,
+    format_comparison,
+    make_baseline,
+    summarize_trials,
+)
+from datarobot_drum.drum.perf_testing import TestCaseResults
+from datarobot_drum.profiler.latency_histogram import LatencyHistogram
+
+
+def _result(name, latency, requests=10, rss_mb=100.0, ok=True):
+    histogram = LatencyHistogram()
+    for _ in range(requests):
+        histogram.record(latency)
+    res = TestCaseResults(name, requests, 1, histogram)
+    res.prediction_ok = ok
+    res.elapsed = latency * requests
+    res.server_rss_mb = rss_mb
+    return res
+
+
+class TestSummarizeTrials:
+    def test_single_trial(self):
+        assert summarize_trials([2.0]) == {"median": 2.0, "ci": [2.0, 2.0], "trials": [2.0]}
+
+    def test_confidence_interval_contains_median(self):
+        summary = summarize_trials([1.0, 1.1, 0.9, 1.05, 5.0])
+
+        assert summary["median"] == 1.05
+        assert summary["ci"][0] <= summary["median"] <= summary["ci"][1]
+        assert summary == summarize_trials([1.0, 1.1, 0.9, 1.05, 5.0])
+
+
+class TestMakeBaseline:
+    def test_metrics_per_test_case(self):
+        baseline = make_baseline(
+            [_result("1 KB", 0.01), _result("1 KB", 0.03), _result("10MB", 1.0)]
+        )
+
+        assert list(baseline["test_cases"]) == ["1 KB", "10MB"]
+        small = baseline["test_cases"]["1 KB"]
+        assert small["p50"]["median"] == pytest.approx(0.02, rel=1e-3)
+        assert small["throughput"]["trials"] == pytest.approx([100.0, 1 / 0.03])
+        assert small["memory_mb"]["median"] == 100.0
+        json.dumps(baseline)
+
+    def test_failed_results_are_skipped(self):
+        baseline = make_baseline([_result("1 KB", 0.01, ok=False)])
+
+        assert baseline["test_cases"] == {}
+
+    def test_memory_from_server_stats(self):
+        res = _result("1 KB", 0.01, rss_mb=None)
+        res.server_stats = json.dumps({"mem_info": {"drum_rss": 250.0}})
+
+        assert make_baseline([res])["test_cases"]["1 KB"]["memory_mb"]["median"] == 250.0
+
+
+class TestCompareToBaseline:
+    @pytest.fixture
+    def baseline(self):
+        return make_baseline([_result("1 KB", latency) for latency in (0.010, 0.011, 0.0105)])
+
+    def _regressions(self, baseline, results, tolerance=0.1):
+        rows = compare_to_baseline(baseline, make_baseline(results), tolerance)
+        return {(name, metric) for name, metric, *_, regressed in rows if regressed}
+
+    def test_no_regression(self, baseline):
+        results = [_result("1 KB", latency) for latency in (0.0104, 0.0108, 0.0102)]
+
+        assert self._regressions(baseline, results) == set()
+
+    def test_latency_regression(self, baseline):
+        results = [_result("1 KB", latency) for latency in (0.020, 0.021, 0.019)]
+
+        assert self._regressions(baseline, results) == {
+            ("1 KB", "p50"),
+            ("1 KB", "p99"),
+            ("1 KB", "throughput"),
+        }
+
+    def test_memory_regression(self, baseline):
+        results = [_result("1 KB", 0.0105, rss_mb=150.0) for _ in range(3)]
+
+        assert self._regressions(baseline, results) == {("1 KB", "memory_mb")}
+
+    def test_within_tolerance(self, baseline):
+        results = [_result("1 KB", latency) for latency in (0.020, 0.021, 0.019)]
+
+        assert self._regressions(baseline, results, tolerance=1.5) == set()
+
+    def test_overlapping_confidence_intervals(self):
+        baseline = make_baseline([_result("1 KB", latency) for latency in (0.01, 0.02, 0.03)])
+        results = [_result("1 KB", latency) for latency in (0.015, 0.025, 0.035)]
+
+        # the median is 25% slower, but within the noise of the trials
+        assert self._regressions(baseline, results) == set()
+
+    def test_new_test_case_is_not_compared(self, baseline):
+        rows = compare_to_baseline(baseline, make_baseline([_result("10MB", 1.0)]), 0.1)
+
+        assert rows == []
+
+    def test_format_comparison(self, baseline):
+        results = [_result("1 KB", 0.021) for _ in range(3)]
+        table = format_comparison(compare_to_baseline(baseline, make_baseline(results), 0.1))
+
+        assert "REGRESSION" in table
+        assert "+100.0%" in table
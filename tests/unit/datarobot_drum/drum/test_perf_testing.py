@@ -6,6 +6,8 @@
 #  Released under the terms of DataRobot Tool and Utility Agreement.
 #
 import json
+import os
+import re
 from argparse import Namespace
 from tempfile import NamedTemporaryFile
 from unittest.mock import patch, Mock
@@ -17,8 +19,8 @@ import responses
 import scipy
 
 from datarobot_drum.drum.enum import TargetType
-from datarobot_drum.drum.exceptions import DrumPredException
-from datarobot_drum.drum.perf_testing import CMRunTests
+from datarobot_drum.drum.exceptions import DrumCommonException, DrumPredException
+from datarobot_drum.drum.perf_testing import CMRunTests, PerfTestCase, PerfTestResultsFormatter
 from datarobot_drum.drum.utils.structured_input_read_utils import StructuredInputReadUtils
 
 
@@ -175,6 +177,46 @@ class TestTestPredictionSideEffects:
         )
 
 
+class TestPredictionSideEffectsInProcess:
+    @pytest.fixture
+    def input_df(self):
+        return pd.DataFrame({"a": np.arange(200.0), "b": np.arange(200.0) * 2})
+
+    @staticmethod
+    def _predict(df, with_extra_model_output=True):
+        return pd.DataFrame({"Predictions": df["a"] + df["b"]}).reset_index(drop=True)
+
+    def test_predicts_full_data_and_sample(self, cm_run_tests, input_df):
+        predictor = Mock()
+        predictor.predict_dataframe.side_effect = self._predict
+
+        cm_run_tests.check_prediction_side_effects_in_process(predictor, input_df)
+
+        full_call, sample_call = predictor.predict_dataframe.call_args_list
+        pd.testing.assert_frame_equal(full_call[0][0], input_df)
+        assert len(sample_call[0][0]) == 20
+        assert full_call[1] == sample_call[1] == {"with_extra_model_output": False}
+        cm_run_tests._schema_validator.validate_outputs.assert_called_once()
+
+    def test_raises_when_predictions_differ(self, cm_run_tests, input_df):
+        predictor = Mock()
+        predictor.predict_dataframe.side_effect = [
+            self._predict(input_df),
+            pd.DataFrame({"Predictions": np.zeros(20)}),
+        ]
+
+        with pytest.raises(DrumPredException, match="different when we tried to predict twice"):
+            cm_run_tests.check_prediction_side_effects_in_process(predictor, input_df)
+
+    def test_small_data(self, cm_run_tests, input_df):
+        predictor = Mock()
+        predictor.predict_dataframe.side_effect = self._predict
+
+        cm_run_tests.check_prediction_side_effects_in_process(predictor, input_df.head(5))
+
+        assert len(predictor.predict_dataframe.call_args_list[1][0][0]) == 5
+
+
 @pytest.fixture
 def mock_read_x_data_from_response(module_under_test):
     with patch(f"{module_under_test}.read_x_data_from_response") as mock_func:
@@ -275,3 +317,254 @@ class TestComparePredictions:
             CMRunTests.compare_predictions(
                 predictions_1, predictions_2, input_df, is_sparse=is_sparse
             )
+
+
+class TestRunTestCase:
+    @pytest.fixture
+    def load_options(self, mock_options):
+        mock_options.concurrency = 2
+        mock_options.rate = None
+        mock_options.warmup = 3
+        mock_options.json_output = None
+        mock_options.trials = 1
+        mock_options.baseline = None
+        mock_options.update_baseline = False
+        mock_options.baseline_tolerance = 10.0
+        mock_options.code_dir = "/tmp/model"
+        return mock_options
+
+    @pytest.fixture
+    def runner(self, load_options, mock_read_structured_input_file_as_df):
+        runner = CMRunTests(load_options, TargetType.REGRESSION)
+        runner._df_for_test = pd.DataFrame({"a": range(5)})
+        return runner
+
+    @pytest.fixture
+    def predict_calls(self):
+        calls = []
+
+        def _callback(request):
+            calls.append(request)
+            return 200, {}, json.dumps({"predictions": [0.5] * 5})
+
+        responses.add_callback(responses.POST, re.compile(r".*/predict/"), callback=_callback)
+        responses.add(
+            responses.GET,
+            re.compile(r".*/stats/"),
+            json={"mem_info": {"drum_rss": 10, "total": 100}},
+        )
+        yield calls
+
+    @responses.activate
+    def test_warmup_requests_are_not_recorded(self, runner, predict_calls):
+        results = []
+        runner._run_test_case(PerfTestCase("test", 5, 10), results)
+
+        (result,) = results
+        assert result.prediction_ok
+        assert len(predict_calls) == 13
+        assert result.histogram.count == 10
+        assert result.throughput > 0
+        assert result.server_stats is not None
+
+    @responses.activate
+    def test_constant_rate(self, runner, predict_calls):
+        runner.options.rate = 50.0
+        runner.options.warmup = 0
+        results = []
+        runner._run_test_case(PerfTestCase("test", 5, 5), results)
+
+        # requests are scheduled 20ms apart
+        assert results[0].elapsed >= 0.08
+        assert results[0].histogram.count == 5
+
+    @responses.activate
+    def test_failed_request(self, runner):
+        responses.add(responses.POST, re.compile(r".*/predict/"), status=500, body="boom")
+        responses.add(responses.GET, re.compile(r".*/stats/"), status=500)
+        results = []
+        runner._run_test_case(PerfTestCase("test", 5, 10), results)
+
+        assert not results[0].prediction_ok
+        assert results[0].prediction_error == "boom"
+
+    @responses.activate
+    def test_json_report(self, runner, predict_calls):
+        results = []
+        runner._run_test_case(PerfTestCase("test", 5, 4), results)
+
+        report = json.loads(json.dumps(runner._make_json_report(results)))
+        assert report["concurrency"] == 2
+        (test_case,) = report["test_cases"]
+        assert test_case["latency"]["count"] == 4
+        assert set(test_case["latency"]) >= {"p50", "p90", "p99", "p99.9"}
+        assert test_case["server"]["stats"]["mem_info"]["drum_rss"] == 10
+
+        table = PerfTestResultsFormatter(results, in_docker=False).get_tbl_str()
+        assert "p90" in table
+
+    @responses.activate
+    def test_baseline(self, runner, predict_calls, tmp_path):
+        runner.options.baseline = str(tmp_path / "baseline.json")
+        results = []
+        runner._run_test_case(PerfTestCase("test", 5, 4), results)
+
+        runner._check_baseline(results)
+        baseline = json.loads((tmp_path / "baseline.json").read_text())
+        assert set(baseline["test_cases"]["test"]) >= {"throughput", "p50", "p99"}
+
+        # a 10x slower run regresses
+        baseline["test_cases"]["test"]["p50"]["median"] /= 10
+        baseline["test_cases"]["test"]["p50"]["ci"] = [0, 0]
+        (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+        with pytest.raises(DrumCommonException, match="test p50"):
+            runner._check_baseline(results)
+
+    @responses.activate
+    def test_baseline_failed_test_case(self, runner, predict_calls, tmp_path):
+        runner.options.baseline = str(tmp_path / "baseline.json")
+        results = []
+        runner._run_test_case(PerfTestCase("test", 5, 4), results)
+        runner._check_baseline(results)
+
+        results[0].prediction_ok = False
+        with pytest.raises(DrumCommonException, match="test failed"):
+            runner._check_baseline(results)
+
+    @responses.activate
+    def test_trials(self, runner, predict_calls):
+        runner.options.trials = 2
+        runner.options.warmup = 0
+        runner._test_cases_to_run = [PerfTestCase("a", 5, 2), PerfTestCase("b", 5, 2)]
+
+        runner.options.timeout = 600
+        with patch("datarobot_drum.drum.perf_testing.signal.alarm") as alarm:
+            results = runner._run_all_test_cases()
+
+        assert alarm.call_count == 4
+
+        assert [(res.name, res.trial) for res in results] == [
+            ("a", 1),
+            ("b", 1),
+            ("a", 2),
+            ("b", 2),
+        ]
+
+
+class FakeComponent:
+    """Stands for a loaded model: fails on the data when column "b" is missing."""
+
+    def __init__(self):
+        self.predictor = Mock()
+        self.predictor.predict_dataframe.side_effect = self._predict
+        self.terminated = False
+
+    @staticmethod
+    def _predict(df):
+        if df["b"].isna().all():
+            raise ValueError("b is missing")
+        return pd.DataFrame({"Predictions": [1.0] * len(df)})
+
+    def terminate(self):
+        self.terminated = True
+
+
+class TestNullValueImputationCheck:
+    @pytest.fixture
+    def input_csv(self):
+        with NamedTemporaryFile(suffix=".csv") as temp_file:
+            pd.DataFrame({"a": [1, 2], "b": [3, 4], "c": ["x", "y"]}).to_csv(
+                temp_file.name, index=False
+            )
+            yield temp_file.name
+
+    @pytest.fixture
+    def validation_runner(self, mock_options, input_csv, mock_read_structured_input_file_as_df):
+        mock_options.input = input_csv
+        mock_options.validation_workers = 1
+        with patch("sys.argv", ["drum", "score", "--input", input_csv, "--output", "out"]):
+            yield CMRunTests(mock_options, TargetType.REGRESSION)
+
+    @pytest.fixture(autouse=True)
+    def datasets_dir(self, tmp_path):
+        datasets_dir = tmp_path / "null_datasets"
+        datasets_dir.mkdir()
+        with patch("datarobot_drum.drum.perf_testing.mkdtemp", return_value=str(datasets_dir)):
+            yield datasets_dir
+
+    @pytest.fixture
+    def component(self):
+        component = FakeComponent()
+        with patch(
+            "datarobot_drum.drum.perf_testing._load_score_predictor", return_value=component
+        ) as load:
+            yield component, load
+
+    def test_model_is_loaded_once(self, validation_runner, component):
+        component, load = component
+
+        with patch("datarobot_drum.drum.perf_testing.subprocess.Popen") as popen:
+            test_name, test_passed, message = validation_runner._null_value_imputation_check()
+
+        popen.assert_not_called()
+        load.assert_called_once_with(
+            ["score", "--input", validation_runner._input_csv, "--output", "out"]
+        )
+        assert component.predictor.predict_dataframe.call_count == 3
+        assert component.terminated
+        assert not test_passed
+        assert "Failed feature" in message
+        assert "ValueError: b is missing" in message
+
+    def test_saves_failed_datasets_only(self, validation_runner, component, datasets_dir):
+        validation_runner._null_value_imputation_check()
+
+        assert os.listdir(datasets_dir) == ["null_value_imputation_column1"]
+        dataset = pd.read_csv(datasets_dir / "null_value_imputation_column1")
+        assert dataset["b"].isna().all()
+
+    def test_passed(self, validation_runner, component, datasets_dir):
+        component[0].predictor.predict_dataframe.side_effect = None
+
+        assert validation_runner._null_value_imputation_check() == (
+            "Null value imputation",
+            True,
+            "",
+        )
+        assert not datasets_dir.exists()
+
+    def test_worker_pool(self, validation_runner, component):
+        validation_runner.options.validation_workers = 2
+
+        _, test_passed, message = validation_runner._null_value_imputation_check()
+
+        # the model is loaded by the forked workers, not by this process
+        assert component[0].predictor.predict_dataframe.call_count == 0
+        assert not test_passed
+        assert "ValueError: b is missing" in message
+
+    def test_worker_pool_terminates_predictors(self, validation_runner, component, tmp_path):
+        validation_runner.options.validation_workers = 2
+        terminated = tmp_path / "terminated"
+
+        def terminate(_):
+            with open(terminated, "a") as f:
+                f.write("{}\n".format(os.getpid()))
+
+        with patch.object(FakeComponent, "terminate", terminate):
+            validation_runner._null_value_imputation_check()
+
+        worker_pids = terminated.read_text().split()
+        assert len(set(worker_pids)) == 2
+        assert str(os.getpid()) not in worker_pids
+
+    def test_docker_uses_drum_score(self, validation_runner, component):
+        validation_runner.options.docker = "image"
+
+        with patch("datarobot_drum.drum.perf_testing.subprocess.Popen") as popen:
+            popen.return_value.wait.return_value = 0
+            _, test_passed, _ = validation_runner._null_value_imputation_check()
+
+        assert popen.call_count == 3
+        component[1].assert_not_called()
+        assert test_passed
@@ -24,7 +24,12 @@ from datarobot_drum.drum.root_predictors.prediction_server import (
 )
 from datarobot_drum.drum.server import HEADER_DRUM_USER_HTTP_ERROR, HEADER_REQUEST_ID
 from tests.unit.datarobot_drum.drum.chat_utils import create_completion, create_completion_chunks
-from tests.unit.datarobot_drum.drum.helpers import MODEL_ID_FROM_RUNTIME_PARAMETER
+from tests.unit.datarobot_drum.drum.conftest import ChatPythonModelAdapter
+from tests.unit.datarobot_drum.drum.helpers import (
+    MODEL_ID_FROM_RUNTIME_PARAMETER,
+    inject_runtime_parameter,
+    unset_runtime_parameter,
+)
 
 
 @pytest.fixture
@@ -330,3 +335,148 @@ def test_prediction_server_standard_error(test_flask_app):
         assert response.status_code == 500
         assert "ERROR: Internal Server Error" in response.json["message"]
         assert HEADER_DRUM_USER_HTTP_ERROR not in response.headers
+
+
+@pytest.fixture
+def max_request_body_size():
+    inject_runtime_parameter("DRUM_MAX_REQUEST_BODY_MB", "0.001")
+    yield
+    unset_runtime_parameter("DRUM_MAX_REQUEST_BODY_MB")
+
+
+@pytest.mark.usefixtures("max_request_body_size", "prediction_server")
+@pytest.mark.parametrize("endpoint", ["/predict/", "/predictUnstructured/"])
+def test_prediction_server_request_body_too_large(test_flask_app, endpoint):
+    client = test_flask_app.test_client()
+    response = client.post(endpoint, data=b"a" * 2048, content_type="text/csv")
+
+    assert response.status_code == 413
+    assert "maximum size of 1048 bytes" in response.json["message"]
+
+
+@pytest.mark.usefixtures("prediction_server")
+def test_prediction_server_stats(test_flask_app):
+    client = test_flask_app.test_client()
+
+    stats = [client.get(url).json for url in ("/stats/", "/stats/", "/stats/?refresh=1")]
+
+    # the usage is sampled by the first request, then in the background every 5 seconds
+    assert [s["recent"]["samples"] for s in stats] == [1, 1, 2]
+    assert stats[0]["mem_info"] == stats[1]["mem_info"]
+    assert stats[2]["mem_info"]["drum_rss"] > 0
+    assert stats[2]["recent"]["interval_sec"] == 5
+
+
+@pytest.fixture
+def chat_cache():
+    inject_runtime_parameter("DRUM_CHAT_CACHE_MAX_ENTRIES", "10")
+    yield
+    unset_runtime_parameter("DRUM_CHAT_CACHE_MAX_ENTRIES")
+
+
+@pytest.mark.usefixtures("chat_cache", "prediction_server")
+def test_prediction_server_chat_cache(test_flask_app, openai_client, chat_python_model_adapter):
+    calls = []
+
+    def chat_hook(completion_request, model):
+        calls.append(completion_request)
+        return create_completion_chunks(["How", " are", " you"])
+
+    chat_python_model_adapter.chat_hook = chat_hook
+    messages = [{"role": "user", "content": "Hello!"}]
+
+    contents = []
+    for _ in range(2):
+        completion = openai_client.chat.completions.create(
+            model="any", messages=messages, temperature=0, stream=True
+        )
+        contents.append("".join(chunk.choices[0].delta.content or "" for chunk in completion))
+    completion = openai_client.chat.completions.create(
+        model="any", messages=messages, temperature=0
+    )
+    contents.append(completion.choices[0].message.content)
+    openai_client.chat.completions.create(model="any", messages=messages)
+
+    assert contents == ["How are you"] * 3
+    assert len(calls) == 2
+    stats = test_flask_app.test_client().get("/stats/").json
+    assert stats["chat_cache"] == {"hits": 2, "misses": 1, "bypassed": 1, "entries": 1}
+
+
+@pytest.fixture
+def chat_hook_with_kwargs():
+    def call_chat_hook(self, model, completion_create_params, **kwargs):
+        return ChatPythonModelAdapter.chat_hook(model, completion_create_params, **kwargs)
+
+    with patch.object(ChatPythonModelAdapter, "_call_chat_hook", new=call_chat_hook):
+        yield
+
+
+@pytest.fixture
+def chat_cache_key_headers():
+    inject_runtime_parameter("DRUM_CHAT_CACHE_KEY_HEADERS", "X-Caller")
+    yield
+    unset_runtime_parameter("DRUM_CHAT_CACHE_KEY_HEADERS")
+
+
+def chat_as_callers(openai_client, chat_python_model_adapter, callers):
+    def chat_hook(completion_request, model, headers):
+        return create_completion("Hello " + headers["X-Caller"])
+
+    chat_python_model_adapter.chat_hook = chat_hook
+    contents = []
+    for caller in callers:
+        completion = openai_client.chat.completions.create(
+            model="any",
+            messages=[{"role": "user", "content": "Who am I?"}],
+            temperature=0,
+            extra_headers={"X-Caller": caller},
+        )
+        contents.append(completion.choices[0].message.content)
+    return contents
+
+
+@pytest.mark.usefixtures("chat_cache", "chat_hook_with_kwargs", "prediction_server")
+def test_prediction_server_chat_cache_bypasses_hooks_reading_headers(
+    test_flask_app, openai_client, chat_python_model_adapter
+):
+    contents = chat_as_callers(openai_client, chat_python_model_adapter, ["a", "b"])
+
+    assert contents == ["Hello a", "Hello b"]
+    stats = test_flask_app.test_client().get("/stats/").json
+    assert stats["chat_cache"] == {"hits": 0, "misses": 0, "bypassed": 2, "entries": 0}
+
+
+@pytest.mark.usefixtures(
+    "chat_cache", "chat_cache_key_headers", "chat_hook_with_kwargs", "prediction_server"
+)
+def test_prediction_server_chat_cache_key_headers(
+    test_flask_app, openai_client, chat_python_model_adapter
+):
+    contents = chat_as_callers(openai_client, chat_python_model_adapter, ["a", "b", "a"])
+
+    assert contents == ["Hello a", "Hello b", "Hello a"]
+    stats = test_flask_app.test_client().get("/stats/").json
+    assert stats["chat_cache"] == {"hits": 1, "misses": 2, "bypassed": 0, "entries": 2}
+
+
+@pytest.mark.usefixtures("chat_cache", "prediction_server")
+def test_prediction_server_chat_cache_bypasses_moderations(
+    test_flask_app, openai_client, chat_python_model_adapter
+):
+    calls = []
+
+    def chat_hook(completion_request, model):
+        calls.append(completion_request)
+        return create_completion("How are you")
+
+    chat_python_model_adapter.chat_hook = chat_hook
+    with patch.object(ChatPythonModelAdapter, "has_moderation_pipeline", return_value=True):
+        for _ in range(2):
+            openai_client.chat.completions.create(
+                model="any", messages=[{"role": "user", "content": "Hello!"}], temperature=0
+            )
+
+    assert len(calls) == 2
+    stats = test_flask_app.test_client().get("/stats/").json
+    assert stats["chat_cache"]["bypassed"] == 2
@@ -357,6 +357,10 @@ class TestSetupValidationOptions:
         assert run_mode == RunMode.FIT
         assert new_options.user_secrets_mount_path is None
         assert new_options.user_secrets_prefix is None
+        assert new_options.predict_in_subprocess is False
+        assert new_options.predict_sample_rows is None
+        assert new_options.max_memory is None
+        assert new_options.trace_memory is False
 
         assert command == [
             "drum",
@@ -161,9 +161,9 @@ def test_invocations_span_includes_consumer_headers(prediction_client, span_stor
     headers = {
         "X-DataRobot-Consumer-Id": "abc123",
         "X-DataRobot-Consumer-Type": "external",
-        "Content-Type": "application/json",
+        "Content-Type": "application/xml",
     }
-    resp = prediction_client.post("/invocations", data=json.dumps({}), headers=headers)
+    resp = prediction_client.post("/invocations", data="<X/>", headers=headers)
     assert resp.status_code == 422
     assert span_store, "No span captured"
     span = span_store[-1]
@@ -0,0 +1,208 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from datarobot_drum.drum.resource_monitor import DEFAULT_SAMPLES
+from datarobot_drum.drum.resource_monitor import DEFAULT_SAMPLING_INTERVAL_SEC
+from datarobot_drum.drum.resource_monitor import ResourceMonitor
+from datarobot_drum.drum.resource_monitor import _container_cgroup
+from datarobot_drum.runtime_parameters.exceptions import InvalidRuntimeParam
+from tests.unit.datarobot_drum.drum.helpers import inject_runtime_parameter
+from tests.unit.datarobot_drum.drum.helpers import unset_runtime_parameter
+
+MB = 1024 * 1024
+
+
+def write_cgroup_v2(path, current_mb, usage_sec, pressure=0.0, limit="max", peak_mb=None):
+    (path / "memory.current").write_text("{}\n".format(current_mb * MB))
+    (path / "memory.max").write_text("{}\n".format(limit))
+    if peak_mb is not None:
+        (path / "memory.peak").write_text("{}\n".format(peak_mb * MB))
+    (path / "cpu.stat").write_text(
+        "usage_usec {}\nuser_usec 0\nsystem_usec 0\n".format(int(usage_sec * 1e6))
+    )
+    (path / "memory.pressure").write_text(
+        "some avg10={:.2f} avg60=0.00 avg300=0.00 total=0\n"
+        "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n".format(pressure)
+    )
+
+
+@pytest.fixture
+def make_monitor(tmp_path):
+    monitors = []
+
+    def make(cgroup_root=None, **kwargs):
+        with patch.object(ResourceMonitor, "_run_inside_docker", return_value=False):
+            monitor = ResourceMonitor(monitor_current_process=True, **kwargs)
+        if cgroup_root is not None:
+            monitor._cgroup = _container_cgroup(str(cgroup_root))
+        monitors.append(monitor)
+        return monitor
+
+    yield make
+    for monitor in monitors:
+        monitor.stop()
+
+
+class TestContainerCgroup:
+    def test_cgroup_v2(self, tmp_path):
+        write_cgroup_v2(tmp_path, current_mb=100, usage_sec=2.5, pressure=1.5, peak_mb=150)
+
+        cgroup = _container_cgroup(str(tmp_path))
+
+        assert cgroup.name == "v2"
+        assert cgroup.memory() == (None, 150 * MB, 100 * MB)
+        assert cgroup.cpu_usage_sec() == 2.5
+        assert cgroup.memory_pressure() == 1.5
+
+    def test_cgroup_v2_limit_without_peak_and_pressure(self, tmp_path):
+        write_cgroup_v2(tmp_path, current_mb=100, usage_sec=0, limit=512 * MB)
+        (tmp_path / "memory.pressure").unlink()
+
+        cgroup = _container_cgroup(str(tmp_path))
+
+        assert cgroup.memory() == (512 * MB, None, 100 * MB)
+        assert cgroup.memory_pressure() is None
+
+    def test_cgroup_v1(self, tmp_path):
+        (tmp_path / "memory").mkdir()
+        (tmp_path / "memory" / "memory.limit_in_bytes").write_text("{}\n".format(512 * MB))
+        (tmp_path / "memory" / "memory.max_usage_in_bytes").write_text("{}\n".format(200 * MB))
+        (tmp_path / "memory" / "memory.usage_in_bytes").write_text("{}\n".format(100 * MB))
+        (tmp_path / "cpuacct").mkdir()
+        (tmp_path / "cpuacct" / "cpuacct.usage").write_text("3000000000\n")
+
+        cgroup = _container_cgroup(str(tmp_path))
+
+        assert cgroup.name == "v1"
+        assert cgroup.memory() == (512 * MB, 200 * MB, 100 * MB)
+        assert cgroup.cpu_usage_sec() == 3.0
+        assert cgroup.memory_pressure() is None
+
+    def test_no_cgroup(self, tmp_path):
+        assert _container_cgroup(str(tmp_path)) is None
+
+
+class TestResourceMonitor:
+    def test_container_usage(self, make_monitor, tmp_path):
+        write_cgroup_v2(tmp_path, current_mb=100, usage_sec=1, peak_mb=150, limit=1024 * MB)
+        monitor = make_monitor(tmp_path)
+        monitor.sample()
+        # the CPU usage is measured between samples
+        monitor._cpu_usage = (time.monotonic() - 2, 1.0)
+        write_cgroup_v2(
+            tmp_path, current_mb=300, usage_sec=3, pressure=4, peak_mb=350, limit=1024 * MB
+        )
+
+        with patch.object(monitor, "start"):
+            monitor.sample()
+            info = monitor.collect_resources_info()
+
+        assert info["mem_info"]["container_limit"] == 1024
+        assert info["mem_info"]["container_max_used"] == 350
+        assert info["mem_info"]["container_used"] == 300
+        assert info["mem_info"]["avail"] == 1024 - 300
+        recent = info["recent"]
+        assert (recent["cgroup"], recent["samples"]) == ("v2", 3)
+        assert recent["cpu_percent"]["max"] == pytest.approx(100, rel=0.1)
+        assert recent["memory_mb"] == {"min": 100, "avg": 700 / 3, "max": 300}
+        assert recent["memory_pressure"] == {"min": 0, "avg": 8 / 3, "max": 4}
+
+    @pytest.mark.parametrize("refresh", [False, True])
+    def test_memory_info_of_the_last_sample(self, make_monitor, tmp_path, refresh):
+        write_cgroup_v2(tmp_path, current_mb=100, usage_sec=1)
+        monitor = make_monitor(tmp_path, interval=3600)
+        monitor.collect_resources_info()
+        write_cgroup_v2(tmp_path, current_mb=300, usage_sec=2)
+
+        info = monitor.collect_resources_info(refresh=refresh)
+
+        # the background thread has not sampled the usage again
+        assert info["recent"]["samples"] == (2 if refresh else 1)
+        assert info["mem_info"]["container_used"] == (300 if refresh else 100)
+
+    def test_drum_processes_usage_outside_of_container(self, make_monitor):
+        monitor = make_monitor()
+        monitor.sample()
+        sum(i * i for i in range(10**6))
+
+        with patch.object(monitor, "start"):
+            info = monitor.collect_resources_info()
+
+        assert info["mem_info"]["container_used"] is None
+        assert info["drum_info"][0]["mem"] == info["mem_info"]["drum_rss"]
+        recent = info["recent"]
+        assert (recent["cgroup"], recent["samples"]) == (None, 2)
+        assert recent["cpu_percent"]["max"] > 0
+        assert recent["memory_mb"]["max"] > 0
+        assert recent["memory_pressure"] is None
+
+    def test_samples_are_collected_in_the_background(self, make_monitor):
+        monitor = make_monitor(interval=0.01, samples=3)
+
+        monitor.collect_resources_info()
+        deadline = time.time() + 5
+        while len(monitor._samples) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        sampling_threads = []
+        with patch.object(
+            monitor, "sample", side_effect=lambda: sampling_threads.append(threading.get_ident())
+        ):
+            info = monitor.collect_resources_info()
+        monitor.stop()
+
+        assert threading.get_ident() not in sampling_threads
+        assert info["recent"]["samples"] == 3
+
+    def test_usage_is_sampled_when_stopped(self, make_monitor):
+        monitor = make_monitor()
+        monitor.collect_resources_info()
+        monitor.stop()
+
+        info = monitor.collect_resources_info()
+
+        assert info["recent"]["samples"] == 2
+
+
+class TestFromRuntimeParameters:
+    @pytest.fixture
+    def runtime_parameters(self):
+        names = []
+
+        def inject(name, value):
+            names.append(name)
+            inject_runtime_parameter(name, value)
+
+        yield inject
+        for name in names:
+            unset_runtime_parameter(name)
+
+    def test_defaults(self):
+        monitor = ResourceMonitor.from_runtime_parameters()
+
+        assert (monitor.interval, monitor._samples.maxlen) == (
+            DEFAULT_SAMPLING_INTERVAL_SEC,
+            DEFAULT_SAMPLES,
+        )
+
+    def test_configured(self, runtime_parameters):
+        runtime_parameters("DRUM_RESOURCE_MONITOR_INTERVAL_SEC", "1")
+        runtime_parameters("DRUM_RESOURCE_MONITOR_SAMPLES", "60")
+
+        monitor = ResourceMonitor.from_runtime_parameters()
+
+        assert (monitor.interval, monitor._samples.maxlen) == (1, 60)
+
+    def test_invalid(self, runtime_parameters):
+        runtime_parameters("DRUM_RESOURCE_MONITOR_SAMPLES", "-1")
+
+        with pytest.raises(InvalidRuntimeParam, match="must be a positive integer"):
+            ResourceMonitor.from_runtime_parameters()
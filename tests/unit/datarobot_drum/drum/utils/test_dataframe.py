@@ -1,7 +1,8 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from datarobot_drum.drum.utils.dataframe import extract_additional_columns
+from datarobot_drum.drum.utils.dataframe import downcast_dataframe, extract_additional_columns
 
 
 class TestExtractAdditionalColumns:
@@ -66,3 +67,45 @@ class TestExtractAdditionalColumns:
         assert extra_model_output.equals(
             pd.DataFrame([["high", "fast", 55]], columns=additional_columns)
         )
+
+
+class TestDowncastDataframe:
+    def test_lossless_downcasts(self):
+        df = pd.DataFrame(
+            {
+                "int": [1, 2, 3, 4],
+                "float": [0.5, np.nan, 1.25, 2.0],
+                "category": ["a", "b", None, "a"],
+            }
+        )
+
+        downcast = downcast_dataframe(df)
+
+        assert downcast["int"].dtype == np.int32
+        assert downcast["float"].dtype == np.float32
+        assert downcast["category"].dtype == "category"
+        pd.testing.assert_frame_equal(downcast, df, check_dtype=False, check_categorical=False)
+        # the original frame is left as it is
+        assert df["int"].dtype == np.int64
+
+    def test_lossy_columns_are_kept(self):
+        df = pd.DataFrame(
+            {
+                "big_int": [2**40, 1, 2, 3],
+                "float": [0.1, 0.2, 0.3, 1e300],
+                "distinct": ["a", "b", "c", "d"],
+                "mixed": ["a", 1, "a", "a"],
+            }
+        )
+
+        downcast = downcast_dataframe(df)
+
+        pd.testing.assert_frame_equal(downcast, df)
+
+    def test_excluded_columns(self):
+        df = pd.DataFrame({"feature": [1, 2, 3], "target": [1, 2, 3]})
+
+        downcast = downcast_dataframe(df, exclude=["target", None])
+
+        assert downcast["feature"].dtype == np.int32
+        assert downcast["target"].dtype == np.int64
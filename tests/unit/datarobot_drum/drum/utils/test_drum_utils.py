@@ -101,3 +101,17 @@ def test_filename_exists_and_is_file(tmp_path, caplog):
         os.remove(f)
 
     caplog.clear()
+
+
+@pytest.mark.parametrize(
+    "cmd_list",
+    [
+        ["drum", "validation", "--validation-workers", "4", "--code-dir", "dir"],
+        ["drum", "validation", "--validation-workers=4", "--code-dir", "dir"],
+        ["drum", "validation", "--code-dir", "dir", "--validation-workers"],
+    ],
+)
+def test_delete_cmd_argument(cmd_list):
+    DrumUtils.delete_cmd_argument(cmd_list, "--validation-workers")
+
+    assert cmd_list == ["drum", "validation", "--code-dir", "dir"]
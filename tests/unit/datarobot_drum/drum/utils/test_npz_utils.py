@@ -0,0 +1,76 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import io
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from datarobot_drum.drum.utils.npz_utils import (
+    load_npz_arrays,
+    make_npz_payload,
+    read_npz_payload,
+)
+from datarobot_drum.drum.utils.spooled_payload import spool_to_memory_map
+
+MATRIX = sparse.random(30, 8, density=0.2, format="csr", random_state=1)
+COLUMNS = ["c{}".format(i) for i in range(8)]
+
+
+def test_roundtrip():
+    matrix, columns = read_npz_payload(make_npz_payload(MATRIX, columns=COLUMNS))
+
+    assert matrix.format == "csr"
+    np.testing.assert_array_equal(matrix.toarray(), MATRIX.toarray())
+    assert columns == COLUMNS
+
+
+def test_stored_arrays_are_not_copied():
+    payload = make_npz_payload(MATRIX)
+
+    arrays = load_npz_arrays(payload)
+
+    assert not arrays["data"].flags.owndata
+    assert not arrays["data"].flags.writeable
+    assert "columns" not in arrays
+
+
+def test_read_memory_map():
+    payload = spool_to_memory_map(io.BytesIO(make_npz_payload(MATRIX, columns=COLUMNS)))
+
+    matrix, columns = read_npz_payload(payload)
+    np.testing.assert_array_equal(matrix.toarray(), MATRIX.toarray())
+    assert columns == COLUMNS
+
+    del matrix
+    payload.close()
+
+
+def test_readable_by_scipy():
+    matrix = sparse.load_npz(io.BytesIO(make_npz_payload(MATRIX, columns=COLUMNS)))
+
+    np.testing.assert_array_equal(matrix.toarray(), MATRIX.toarray())
+
+
+@pytest.mark.parametrize("sparse_format", ["csr", "csc", "coo"])
+@pytest.mark.parametrize("compressed", [True, False])
+def test_read_scipy_payload(sparse_format, compressed):
+    sink = io.BytesIO()
+    sparse.save_npz(sink, MATRIX.asformat(sparse_format), compressed=compressed)
+
+    matrix, columns = read_npz_payload(sink.getvalue())
+
+    np.testing.assert_array_equal(matrix.toarray(), MATRIX.toarray())
+    assert columns is None
+
+
+def test_unsupported_sparse_format():
+    sink = io.BytesIO()
+    sparse.save_npz(sink, MATRIX.todia())
+
+    with pytest.raises(ValueError, match="Unsupported sparse NPZ format: dia"):
+        read_npz_payload(sink.getvalue())
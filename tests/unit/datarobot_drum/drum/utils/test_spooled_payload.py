@@ -0,0 +1,120 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import io
+import mmap
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.drum.utils.spooled_payload import (
+    MemoryMappedReader,
+    get_max_request_body_size,
+    get_request_spool_threshold,
+    open_payload,
+    spool_file_storage,
+    spool_to_memory_map,
+    stream_size,
+)
+from tests.unit.datarobot_drum.drum.helpers import (
+    inject_runtime_parameter,
+    unset_runtime_parameter,
+)
+
+PAYLOAD = b"a,b\n1,2\n3,4\n"
+
+
+@pytest.fixture
+def spool_threshold():
+    def _set(value):
+        inject_runtime_parameter("DRUM_REQUEST_SPOOL_THRESHOLD_MB", value)
+
+    yield _set
+    unset_runtime_parameter("DRUM_REQUEST_SPOOL_THRESHOLD_MB")
+
+
+class TestSizeParameters:
+    def test_disabled_by_default(self):
+        assert get_request_spool_threshold() is None
+        assert get_max_request_body_size() is None
+
+    @pytest.mark.parametrize(
+        "value, expected", [("64", 64 * 1024 * 1024), ("0.5", 512 * 1024), ("0", None)]
+    )
+    def test_size_in_megabytes(self, spool_threshold, value, expected):
+        spool_threshold(value)
+        assert get_request_spool_threshold() == expected
+
+    def test_invalid_size(self, spool_threshold):
+        spool_threshold("large")
+        with pytest.raises(DrumCommonException, match="must be a size in megabytes"):
+            get_request_spool_threshold()
+
+
+class TestSpooling:
+    def test_spool_stream(self):
+        payload = spool_to_memory_map(io.BytesIO(PAYLOAD))
+
+        assert isinstance(payload, mmap.mmap)
+        assert payload[:] == PAYLOAD
+        payload.close()
+
+    def test_spool_empty_stream(self):
+        with pytest.raises(DrumCommonException, match="empty payload"):
+            spool_to_memory_map(io.BytesIO(b""))
+
+    def test_spool_in_memory_upload(self):
+        stream = io.BytesIO(PAYLOAD)
+        stream.read()
+
+        payload = spool_file_storage(stream)
+        assert payload[:] == PAYLOAD
+        payload.close()
+
+    def test_map_on_disk_upload_in_place(self):
+        with tempfile.TemporaryFile() as stream:
+            stream.write(PAYLOAD)
+
+            with patch("datarobot_drum.drum.utils.spooled_payload.shutil.copyfileobj") as copy:
+                payload = spool_file_storage(stream)
+            copy.assert_not_called()
+            assert payload[:] == PAYLOAD
+            payload.close()
+
+    def test_stream_size_keeps_position(self):
+        stream = io.BytesIO(PAYLOAD)
+        stream.seek(2)
+
+        assert stream_size(stream) == len(PAYLOAD)
+        assert stream.tell() == 2
+
+
+class TestMemoryMappedReader:
+    def test_read_and_seek(self):
+        payload = spool_to_memory_map(io.BytesIO(PAYLOAD))
+        payload.seek(3)
+
+        with open_payload(payload) as stream:
+            assert stream.readline() == b"a,b\n"
+            assert stream.read() == b"1,2\n3,4\n"
+            stream.seek(-4, io.SEEK_END)
+            assert stream.read() == b"3,4\n"
+
+        # the map's own position is left alone and it can be closed once the reader is
+        assert payload.tell() == 3
+        payload.close()
+
+    def test_negative_seek(self):
+        reader = MemoryMappedReader(PAYLOAD)
+        with pytest.raises(ValueError, match="Negative seek position"):
+            reader.seek(-1)
+
+    def test_bytes_payload(self):
+        with open_payload(PAYLOAD) as stream:
+            assert isinstance(stream, io.BytesIO)
+            assert stream.read() == PAYLOAD
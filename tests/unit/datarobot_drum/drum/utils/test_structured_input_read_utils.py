@@ -4,13 +4,24 @@ All rights reserved.
 This is proprietary source code of DataRobot, Inc. and its affiliates.
 Released under the terms of DataRobot Tool and Utility Agreement.
 """
+import io
 import tempfile
+from unittest.mock import patch
 
 import numpy as np
+import pandas as pd
 import pytest
+from scipy import sparse
 
+from datarobot_drum.drum.enum import CsvParserEngine, PredictionServerMimetypes
 from datarobot_drum.drum.exceptions import DrumCommonException
+from datarobot_drum.drum.utils.npz_utils import make_npz_payload
+from datarobot_drum.drum.utils.spooled_payload import spool_to_memory_map
 from datarobot_drum.drum.utils.structured_input_read_utils import StructuredInputReadUtils
+from tests.unit.datarobot_drum.drum.helpers import (
+    inject_runtime_parameter,
+    unset_runtime_parameter,
+)
 
 
 class TestStructuredInputReadUtils(object):
@@ -41,3 +52,292 @@ class TestStructuredInputReadUtils(object):
         ):
             StructuredInputReadUtils.read_structured_input_file_as_df(tmp_file.name)
         tmp_file.close()
+
+    def test_single_column_payload_is_parsed_once(self):
+        single_col_csv_data = b"data\n0\n1\n\n3\n"
+        with patch.object(pd, "read_csv", wraps=pd.read_csv) as mock_read_csv:
+            X = StructuredInputReadUtils.read_structured_input_data_as_df(
+                single_col_csv_data, PredictionServerMimetypes.TEXT_CSV
+            )
+
+        mock_read_csv.assert_called_once()
+        assert mock_read_csv.call_args[1]["skip_blank_lines"] is False
+        assert X.shape == (4, 1)
+        assert np.isnan(X["data"][2])
+
+    def test_dtype_hints(self):
+        csv_data = b"a,b,c\n1,x,1.5\n2,y,2.5\n"
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            csv_data,
+            PredictionServerMimetypes.TEXT_CSV,
+            dtype={"a": "float32", "b": "category", "missing": "int64"},
+        )
+
+        assert X["a"].dtype == np.float32
+        assert X["b"].dtype == "category"
+        assert X["c"].dtype == np.float64
+
+    def test_invalid_dtype_hints_fall_back_to_inference(self):
+        csv_data = b"a,b\n1,x\n,y\n"
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            csv_data, PredictionServerMimetypes.TEXT_CSV, dtype={"b": "int64"}
+        )
+
+        assert X["b"].tolist() == ["x", "y"]
+        assert np.isnan(X["a"][1])
+
+
+class TestReadCsvFileSample:
+    @pytest.fixture
+    def csv_file(self, tmp_path):
+        filename = str(tmp_path / "data.csv")
+        pd.DataFrame(
+            {"row": np.arange(1000), "text": ["t{}".format(i) for i in range(1000)]}
+        ).to_csv(filename, index=False)
+        return filename
+
+    @pytest.mark.parametrize("chunksize", [7, 100, 5000])
+    def test_sample(self, csv_file, chunksize):
+        sample = StructuredInputReadUtils.read_csv_file_sample(
+            csv_file, 100, random_state=1, chunksize=chunksize
+        )
+
+        assert len(sample) == 100
+        assert sample.index.is_monotonic_increasing
+        assert sample.index.is_unique
+        # rows are indexed by their position in the file
+        np.testing.assert_array_equal(sample["row"], sample.index)
+
+    def test_sample_is_reproducible(self, csv_file):
+        first = StructuredInputReadUtils.read_csv_file_sample(csv_file, 100, random_state=1)
+        second = StructuredInputReadUtils.read_csv_file_sample(csv_file, 100, random_state=1)
+
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_sample_is_uniform(self, csv_file):
+        counts = np.zeros(1000)
+        for seed in range(100):
+            sample = StructuredInputReadUtils.read_csv_file_sample(
+                csv_file, 100, random_state=seed, chunksize=64
+            )
+            counts[sample.index] += 1
+
+        # every row is sampled with probability 0.1, early and late chunks alike
+        assert abs(counts[:500].mean() - 10) < 1
+        assert abs(counts[500:].mean() - 10) < 1
+
+    def test_sample_all_rows(self, csv_file):
+        sample = StructuredInputReadUtils.read_csv_file_sample(csv_file, 1000, chunksize=64)
+
+        pd.testing.assert_frame_equal(sample, pd.read_csv(csv_file))
+
+    def test_more_rows_than_data(self, csv_file):
+        with pytest.raises(
+            DrumCommonException,
+            match="Requested number of rows greater than data length 1001 > 1000",
+        ):
+            StructuredInputReadUtils.read_csv_file_sample(csv_file, 1001)
+
+    @pytest.mark.parametrize("num_rows", [0, -1])
+    def test_non_positive_rows(self, csv_file, num_rows):
+        with pytest.raises(DrumCommonException, match="must be positive, got {}".format(num_rows)):
+            StructuredInputReadUtils.read_csv_file_sample(csv_file, num_rows)
+
+    def test_single_column_blank_lines_are_nans(self, tmp_path):
+        filename = tmp_path / "data.csv"
+        filename.write_text("data\n0\n1\n2\n3\n4\n\n6\n")
+
+        sample = StructuredInputReadUtils.read_csv_file_sample(str(filename), 7)
+
+        assert len(sample) == 7
+        assert np.isnan(sample["data"][5])
+
+
+class TestJsonInput:
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            b'[{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]',
+            b'{"a": [1, 2], "b": ["x", "y"]}',
+            b'{"a": {"0": 1, "1": 2}, "b": {"0": "x", "1": "y"}}',
+        ],
+        ids=["records", "columns", "columns-indexed"],
+    )
+    def test_read_json_payload(self, payload):
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            payload, PredictionServerMimetypes.APPLICATION_JSON
+        )
+
+        pd.testing.assert_frame_equal(X, pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+
+    def test_read_json_records_with_missing_values(self):
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            b'[{"a": 1.5, "b": "x"}, {"a": null}]', PredictionServerMimetypes.APPLICATION_JSON
+        )
+
+        assert X.shape == (2, 2)
+        assert np.isnan(X["a"][1])
+
+    def test_read_json_payload_with_dtype_hints(self):
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            b'{"a": [1, 2], "b": ["x", "y"]}',
+            PredictionServerMimetypes.APPLICATION_JSON,
+            dtype={"a": "float32", "missing": "int64"},
+        )
+
+        assert X["a"].dtype == np.float32
+
+    def test_read_json_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".json") as tmp_file:
+            tmp_file.write(b'[{"a": 1}, {"a": 2}]')
+            tmp_file.flush()
+            X = StructuredInputReadUtils.read_structured_input_file_as_df(tmp_file.name)
+
+        assert X["a"].tolist() == [1, 2]
+
+    @pytest.mark.parametrize("payload", [b"a,b\n1,2\n", b"42", b'{"a": 1}'])
+    def test_read_invalid_json_payload(self, payload):
+        with pytest.raises(DrumCommonException, match="Failed to read JSON input data"):
+            StructuredInputReadUtils.read_structured_input_data_as_df(
+                payload, PredictionServerMimetypes.APPLICATION_JSON
+            )
+
+
+class TestMemoryMappedInput:
+    @pytest.fixture
+    def memory_map(self):
+        payloads = []
+
+        def _spool(binary_data):
+            payloads.append(spool_to_memory_map(io.BytesIO(binary_data)))
+            return payloads[-1]
+
+        yield _spool
+        # every reader released its view on the map, otherwise close() raises BufferError
+        for payload in payloads:
+            payload.close()
+
+    @pytest.mark.parametrize("engine", CsvParserEngine.ALL)
+    def test_read_csv(self, memory_map, engine):
+        if engine == CsvParserEngine.PYARROW:
+            pytest.importorskip("pyarrow")
+        with patch.object(StructuredInputReadUtils, "get_csv_engine", return_value=engine):
+            X = StructuredInputReadUtils.read_structured_input_data_as_df(
+                memory_map(b"a,b\n1,x\n2,y\n"),
+                PredictionServerMimetypes.TEXT_CSV,
+                dtype={"a": "float32"},
+            )
+
+        assert X["a"].dtype == np.float32
+        assert X["b"].tolist() == ["x", "y"]
+
+    def test_read_single_column_csv(self, memory_map):
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            memory_map(b"a\n1\n\n3\n"), PredictionServerMimetypes.TEXT_CSV
+        )
+
+        assert X.shape == (3, 1)
+
+    def test_read_json(self, memory_map):
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            memory_map(b'{"a": [1, 2]}'), PredictionServerMimetypes.APPLICATION_JSON
+        )
+
+        assert X["a"].tolist() == [1, 2]
+
+    def test_read_mtx(self, memory_map):
+        mtx = b"%%MatrixMarket matrix coordinate real general\n2 2 1\n1 2 3.0\n"
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            memory_map(mtx), PredictionServerMimetypes.TEXT_MTX, sparse_colnames=["a", "b"]
+        )
+
+        assert X.sparse.to_dense()["b"].tolist() == [3.0, 0.0]
+
+    def test_read_npz(self, memory_map):
+        npz = make_npz_payload(sparse.csr_matrix([[0.0, 3.0], [1.0, 0.0]]), columns=["a", "b"])
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            memory_map(npz), PredictionServerMimetypes.APPLICATION_X_NPZ
+        )
+
+        assert X.sparse.to_dense()["b"].tolist() == [3.0, 0.0]
+
+
+class TestNpzInput:
+    MATRIX = sparse.csr_matrix([[0.0, 3.0], [1.0, 0.0]])
+
+    def test_embedded_column_names(self):
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            make_npz_payload(self.MATRIX, columns=["a", "b"]),
+            PredictionServerMimetypes.APPLICATION_X_NPZ,
+            sparse_colnames=["x", "y"],
+        )
+
+        assert list(X.columns) == ["a", "b"]
+        assert X.sparse.to_dense().to_numpy().tolist() == [[0.0, 3.0], [1.0, 0.0]]
+
+    def test_sparse_column_names(self):
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            make_npz_payload(self.MATRIX),
+            PredictionServerMimetypes.APPLICATION_X_NPZ,
+            sparse_colnames=["x", "y"],
+        )
+
+        assert list(X.columns) == ["x", "y"]
+
+    def test_read_npz_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".npz") as f:
+            f.write(make_npz_payload(self.MATRIX, columns=["a", "b"]))
+            f.flush()
+            X = StructuredInputReadUtils.read_structured_input_file_as_df(f.name)
+
+        assert list(X.columns) == ["a", "b"]
+
+    def test_read_invalid_npz_payload(self):
+        with pytest.raises(DrumCommonException, match="Failed to read NPZ input data"):
+            StructuredInputReadUtils.read_structured_input_data_as_df(
+                b"not a zip", PredictionServerMimetypes.APPLICATION_X_NPZ
+            )
+
+
+class TestCsvEngine:
+    @pytest.fixture
+    def csv_engine(self):
+        def _set(engine):
+            inject_runtime_parameter("DRUM_CSV_ENGINE", engine)
+
+        yield _set
+        unset_runtime_parameter("DRUM_CSV_ENGINE")
+
+    def test_default_engine(self):
+        assert StructuredInputReadUtils.get_csv_engine() == CsvParserEngine.C
+
+    def test_invalid_engine(self, csv_engine):
+        csv_engine("fastest")
+        with pytest.raises(DrumCommonException, match="Unsupported CSV engine 'fastest'"):
+            StructuredInputReadUtils.get_csv_engine()
+
+    def test_pyarrow_fallback_when_not_installed(self, csv_engine):
+        csv_engine("pyarrow")
+        with patch(
+            "datarobot_drum.drum.utils.structured_input_read_utils._pyarrow_available",
+            return_value=False,
+        ):
+            assert StructuredInputReadUtils.get_csv_engine() == CsvParserEngine.C
+
+    @pytest.mark.parametrize("engine", [CsvParserEngine.PYTHON, CsvParserEngine.PYARROW])
+    def test_read_with_engine(self, csv_engine, engine):
+        if engine == CsvParserEngine.PYARROW:
+            pytest.importorskip("pyarrow")
+        csv_engine(engine)
+
+        X = StructuredInputReadUtils.read_structured_input_data_as_df(
+            b"a,b\n1,x\n2,y\n", PredictionServerMimetypes.TEXT_CSV, dtype={"a": "float32"}
+        )
+
+        assert X["a"].dtype == np.float32
+        assert X["b"].tolist() == ["x", "y"]
+
+        single_col = StructuredInputReadUtils.read_structured_input_data_as_df(
+            b"data\n0\n\n2\n", PredictionServerMimetypes.TEXT_CSV
+        )
+        assert single_col.shape == (3, 1)
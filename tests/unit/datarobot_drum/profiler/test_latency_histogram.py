@@ -0,0 +1,54 @@
+"""
+Copyright 2026 DataRobot, Inc. and its affiliates.
+All rights reserved.
+This is proprietary source code of DataRobot, Inc. and its affiliates.
+Released under the terms of DataRobot Tool and Utility Agreement.
+"""
+import numpy as np
+import pytest
+
+from datarobot_drum.profiler.latency_histogram import LatencyHistogram
+
+
+def test_empty_histogram():
+    report = LatencyHistogram().to_dict()
+
+    assert report["count"] == 0
+    assert report["p99"] is None
+    assert report["mean"] is None
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in [0.001, 0.002, 0.0005]:
+        histogram.record(value)
+
+    assert histogram.min == 0.0005
+    assert histogram.max == 0.002
+    assert histogram.percentile(50) == 0.001
+    assert histogram.mean == pytest.approx(0.0035 / 3)
+
+
+@pytest.mark.parametrize("percentile", [50, 90, 99, 99.9])
+def test_percentiles_within_precision(percentile):
+    latencies = np.random.RandomState(0).lognormal(mean=-3, sigma=1.5, size=20000)
+    histogram = LatencyHistogram()
+    for latency in latencies:
+        histogram.record(latency)
+
+    # nearest-rank percentile, the ranks are integers for 20000 values
+    expected = np.sort(latencies)[int(round(percentile * len(latencies) / 100)) - 1]
+    assert histogram.percentile(percentile) == pytest.approx(expected, rel=1e-3, abs=1e-6)
+
+
+def test_tail_percentiles():
+    histogram = LatencyHistogram()
+    for _ in range(999):
+        histogram.record(0.01)
+    histogram.record(2.5)
+
+    report = histogram.to_dict()
+    assert report["p99"] == pytest.approx(0.01, rel=1e-3)
+    assert report["p99.9"] == pytest.approx(0.01, rel=1e-3)
+    assert report["max"] == 2.5
+    assert histogram.percentile(100) == 2.5
@@ -120,6 +120,61 @@ class TestRuntimeParameters:
             ):
                 RuntimeParameters.get(runtime_param_name)
 
+    def test_value_is_parsed_once(self):
+        namespaced_runtime_param_name = RuntimeParameters.namespaced_param_name("AAA")
+        env_value = json.dumps({"type": RuntimeParameterTypes.NUMERIC.value, "payload": 10})
+        with patch.dict(os.environ, {namespaced_runtime_param_name: env_value}), patch(
+            "datarobot_drum.runtime_parameters.runtime_parameters.json.loads", wraps=json.loads
+        ) as loads:
+            for _ in range(3):
+                assert RuntimeParameters.get("AAA") == 10
+
+        assert loads.call_count == 1
+
+    def test_changed_value_is_parsed_again(self):
+        namespaced_runtime_param_name = RuntimeParameters.namespaced_param_name("AAA")
+        for payload in ["first", "second"]:
+            env_value = json.dumps({"type": RuntimeParameterTypes.STRING.value, "payload": payload})
+            with patch.dict(os.environ, {namespaced_runtime_param_name: env_value}):
+                assert RuntimeParameters.get("AAA") == payload
+
+        with pytest.raises(ValueError, match="Runtime parameter 'AAA' does not exist!"):
+            RuntimeParameters.get("AAA")
+
+    def test_returned_credential_is_a_copy(self):
+        namespaced_runtime_param_name = RuntimeParameters.namespaced_param_name("AAA")
+        payload = {"credentialType": "basic", "user": "user", "password": "secret"}
+        env_value = json.dumps({"type": RuntimeParameterTypes.CREDENTIAL.value, "payload": payload})
+        with patch.dict(os.environ, {namespaced_runtime_param_name: env_value}):
+            RuntimeParameters.get("AAA")["password"] = "changed"
+
+            assert RuntimeParameters.get("AAA") == payload
+
+    @pytest.mark.parametrize(
+        "runtime_param_type, payload",
+        [(RuntimeParameterTypes.STRING, "8"), (RuntimeParameterTypes.NUMERIC, 8)],
+    )
+    def test_positive_int(self, runtime_param_type, payload):
+        namespaced_runtime_param_name = RuntimeParameters.namespaced_param_name("AAA")
+        env_value = json.dumps({"type": runtime_param_type.value, "payload": payload})
+        with patch.dict(os.environ, {namespaced_runtime_param_name: env_value}):
+            assert RuntimeParameters.get_positive_int("AAA", 1) == 8
+
+    def test_positive_int_default(self):
+        assert RuntimeParameters.get_positive_int("ZZZZ", 4) == 4
+        assert RuntimeParameters.get_positive_int("ZZZZ") is None
+
+    @pytest.mark.parametrize("payload", ["0", "-1", "abc"])
+    def test_invalid_positive_int(self, payload):
+        namespaced_runtime_param_name = RuntimeParameters.namespaced_param_name("AAA")
+        env_value = json.dumps({"type": RuntimeParameterTypes.STRING.value, "payload": payload})
+        with patch.dict(os.environ, {namespaced_runtime_param_name: env_value}):
+            with pytest.raises(
+                InvalidRuntimeParam,
+                match=f"Runtime parameter AAA must be a positive integer, got: {payload}",
+            ):
+                RuntimeParameters.get_positive_int("AAA", 1)
+
 
 class TestRuntimeParametersLoader:
     @pytest.fixture